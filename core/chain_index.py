@@ -2,57 +2,115 @@
 """
 Chain Index - Maps job_id to chain metadata
 Zero-intrusion approach: metadata stored separately from Job model
+
+Stored in a SQLite table keyed by job_id (data/chain_index.db), so put/get/
+delete cost O(1) lookups instead of a whole-document read + rewrite.
+Legacy JSON indexes ({"jobs": {...}} at chain_index.json, or JSON content in
+chain_index.db) are imported on first open and kept as *.migrated.json.
 """
 
 import json
 import os
-import tempfile
-from typing import Any, Dict, Optional
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_MIGRATING = ".migrating.json"
+_MIGRATE_LOCK = threading.Lock()
 
 
 class ChainIndex:
-    """Atomic index mapping job_id -> chain routing info."""
-    
+    """Indexed store mapping job_id -> chain routing info."""
+
     def __init__(self, path: str):
-        self.path = path
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        if not os.path.exists(self.path):
-            self._atomic_write({"jobs": {}})
-    
-    def _read(self) -> Dict[str, Any]:
-        """Read index file."""
-        with open(self.path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    
-    def _atomic_write(self, data: Dict[str, Any]) -> None:
-        """Atomic write using temp file + replace."""
-        d = os.path.dirname(self.path)
-        fd, tmp = tempfile.mkstemp(prefix="chain_index_", suffix=".json", dir=d)
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            os.replace(tmp, self.path)
-        finally:
+        root, ext = os.path.splitext(path)
+        self.path = root + ".db"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with _MIGRATE_LOCK:
+            legacy, legacy_files = self._read_legacy_json(root, ext)
+            conn = self._conn()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chain_index (
+                    job_id TEXT PRIMARY KEY,
+                    info TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+            if legacy:
+                # INSERT OR IGNORE: rows written since (or by another index file) win
+                with conn:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO chain_index (job_id, info) VALUES (?, ?)",
+                        ((job_id, json.dumps(info, ensure_ascii=False)) for job_id, info in legacy.items()),
+                    )
+                print(f"[chain_index] Migrated {len(legacy)} entries from legacy JSON index")
+            # Only moved aside once the entries are committed
+            for legacy_file in legacy_files:
+                if legacy_file.endswith(_MIGRATING):
+                    os.replace(legacy_file, legacy_file[:-len(_MIGRATING)] + ".migrated.json")
+                else:
+                    os.replace(legacy_file, legacy_file + ".migrated.json")
+
+    def _read_legacy_json(self, root: str, ext: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Read legacy JSON index files (if any). JSON content at the SQLite path
+        is first moved to *.migrating.json so the database can be created; a
+        leftover from an interrupted migration is picked up again.
+        """
+        candidates = dict.fromkeys([self.path + _MIGRATING, self.path, root + ext, root + ".json"])
+        jobs: Dict[str, Any] = {}
+        files: List[str] = []
+        for candidate in candidates:
+            if not os.path.isfile(candidate) or os.path.getsize(candidate) == 0:
+                continue
+            with open(candidate, "rb") as f:
+                if f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC:
+                    continue
+            if candidate == self.path:
+                os.replace(candidate, self.path + _MIGRATING)
+                candidate = self.path + _MIGRATING
             try:
-                if os.path.exists(tmp):
-                    os.remove(tmp)
-            except Exception:
-                pass
-    
+                with open(candidate, "r", encoding="utf-8") as f:
+                    jobs.update(json.load(f).get("jobs", {}))
+            except Exception as e:
+                print(f"[chain_index] Warning: could not read legacy index {candidate}: {e}")
+            files.append(candidate)
+        return jobs, files
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
     def put(self, job_id: str, info: Dict[str, Any]) -> None:
         """Store chain info for job_id."""
-        data = self._read()
-        data.setdefault("jobs", {})[job_id] = info
-        self._atomic_write(data)
-    
+        self.put_many([(job_id, info)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store chain info for several jobs in one transaction."""
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chain_index (job_id, info) VALUES (?, ?)",
+                ((job_id, json.dumps(info, ensure_ascii=False)) for job_id, info in items),
+            )
+
     def get(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get chain info for job_id."""
-        data = self._read()
-        return data.get("jobs", {}).get(job_id)
-    
+        row = self._conn().execute(
+            "SELECT info FROM chain_index WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
     def delete(self, job_id: str) -> None:
         """Remove chain info for job_id."""
-        data = self._read()
-        if job_id in data.get("jobs", {}):
-            del data["jobs"][job_id]
-            self._atomic_write(data)
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM chain_index WHERE job_id = ?", (job_id,))
+
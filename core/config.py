@@ -66,3 +66,79 @@ class RobustnessConfig:
     RETRY_MAX_ATTEMPTS = _i("SHERATAN_RETRY_MAX_ATTEMPTS", 5)
     RETRY_BASE_DELAY_MS = _i("SHERATAN_RETRY_BASE_DELAY_MS", 500)
     BACKPRESSURE_MODE = os.getenv("SHERATAN_BACKPRESSURE_MODE", "defer").lower()
+    DISPATCH_BATCH_SIZE = _i("SHERATAN_DISPATCH_BATCH_SIZE", 100)
+    # Result sync: completion events drive sync; the full working-job sweep
+    # only runs as a reconciliation pass every SYNC_RECONCILE_SEC.
+    SYNC_RECONCILE_SEC = _f("SHERATAN_SYNC_RECONCILE_SEC", 60.0)
+    SYNC_WATCH_INTERVAL_SEC = _f("SHERATAN_SYNC_WATCH_INTERVAL_SEC", 0.5)
+    # Ticks a completion event for a still-'pending' job is retried before it
+    # is dropped and left to the reconciliation sweep
+    SYNC_REQUEUE_MAX = _i("SHERATAN_SYNC_REQUEUE_MAX", 20)
+
+class DatabaseConfig:
+    # Per-connection tuning, applied once when a pooled connection is opened
+    CACHE_SIZE_KB = _i("SHERATAN_DB_CACHE_SIZE_KB", 16384)
+    MMAP_SIZE = _i("SHERATAN_DB_MMAP_SIZE", 256 * 1024 * 1024)
+    BUSY_TIMEOUT_MS = _i("SHERATAN_DB_BUSY_TIMEOUT_MS", 5000)
+    STATEMENT_CACHE = _i("SHERATAN_DB_STATEMENT_CACHE", 256)
+
+class TraceConfig:
+    # Decision trace pipeline (core/decision_trace.py)
+    BUFFER_SIZE = _i("SHERATAN_TRACE_BUFFER_SIZE", 10000)
+    FLUSH_BATCH = _i("SHERATAN_TRACE_FLUSH_BATCH", 256)
+    FLUSH_INTERVAL_MS = _i("SHERATAN_TRACE_FLUSH_INTERVAL_MS", 200)
+    # drop: reject new nodes when full | block: wait for space (up to BLOCK_TIMEOUT_MS,
+    # then drop) | count: overwrite the oldest buffered node
+    BACKPRESSURE = os.getenv("SHERATAN_TRACE_BACKPRESSURE", "drop").lower()
+    BLOCK_TIMEOUT_MS = _i("SHERATAN_TRACE_BLOCK_TIMEOUT_MS", 1000)
+    # Seal decision_trace.jsonl into decision_trace.<stamp>.jsonl past this size (0 = never)
+    SEGMENT_MAX_BYTES = _i("SHERATAN_TRACE_SEGMENT_MAX_BYTES", 64 * 1024 * 1024)
+    # Per-intent sampling, e.g. "dispatch_job=0.1,job_status_change=0.25" (default 1.0)
+    SAMPLE_RATES = os.getenv("SHERATAN_TRACE_SAMPLE_RATES", "")
+
+    @classmethod
+    def sample_rates(cls) -> dict:
+        rates = {}
+        for part in cls.SAMPLE_RATES.split(","):
+            if "=" in part:
+                intent, rate = part.split("=", 1)
+                try:
+                    rates[intent.strip()] = max(0.0, min(1.0, float(rate)))
+                except ValueError:
+                    pass
+        return rates
+
+class PolicyConfig:
+    # MCTSLight priors write-behind: flush when this many updates are pending
+    # or this many seconds passed since the first unflushed update
+    PRIORS_FLUSH_EVERY = _i("SHERATAN_PRIORS_FLUSH_EVERY", 100)
+    PRIORS_FLUSH_INTERVAL_SEC = _f("SHERATAN_PRIORS_FLUSH_INTERVAL_SEC", 2.0)
+
+class RateLimitConfig:
+    # In-process token buckets (core/rate_limiter.py); defaults for sources
+    # without a rate_limit_config row
+    DEFAULT_JOBS_PER_MINUTE = _i("SHERATAN_RATE_LIMIT_JOBS_PER_MINUTE", 60)
+    DEFAULT_MAX_CONCURRENT = _i("SHERATAN_RATE_LIMIT_MAX_CONCURRENT", 10)
+    # Bucket state is written back to rate_limit_config at most this often
+    PERSIST_INTERVAL_SEC = _f("SHERATAN_RATE_LIMIT_PERSIST_INTERVAL_SEC", 5.0)
+
+class MetricsConfig:
+    # Module-call metrics emitter (core/metrics_client.py)
+    QUEUE_SIZE = _i("SHERATAN_METRICS_QUEUE_SIZE", 10000)
+    BATCH_SIZE = _i("SHERATAN_METRICS_BATCH_SIZE", 500)
+    FLUSH_INTERVAL_MS = _i("SHERATAN_METRICS_FLUSH_INTERVAL_MS", 1000)
+    TIMEOUT_SEC = _f("SHERATAN_METRICS_TIMEOUT_SEC", 2.0)
+    # 1: pre-aggregate calls without a correlation_id into one histogram
+    # per (source, target, status) per batch; 0: send every call as-is
+    AGGREGATE = os.getenv("SHERATAN_METRICS_AGGREGATE", "1") == "1"
+    HISTOGRAM_BUCKETS_MS = os.getenv("SHERATAN_METRICS_BUCKETS_MS", "1,5,10,25,50,100,250,500,1000,2500,5000")
+
+    @classmethod
+    def histogram_buckets(cls) -> list:
+        buckets = []
+        for part in cls.HISTOGRAM_BUCKETS_MS.split(","):
+            try:
+                buckets.append(float(part))
+            except ValueError:
+                pass
+        return sorted(buckets)
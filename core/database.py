@@ -1,7 +1,10 @@
 import sqlite3
 import json
+import threading
+import time
 from contextlib import contextmanager
-from core.config import DB_PATH
+from typing import Any, Dict
+from core.config import DB_PATH, DatabaseConfig
 
 def init_db():
     conn = sqlite3.connect(DB_PATH)
@@ -185,6 +188,15 @@ def init_db():
 
     # Track B3: Result Integrity (Hashing)
     migrate_jobs_result_integrity(cursor)
+
+    # Dispatcher Ready-Queue (Indexes + normalized dependencies)
+    migrate_jobs_ready_queue(cursor)
+
+    # Job statistics counters (maintained by triggers)
+    migrate_jobs_stats(cursor)
+
+    # Rate limiter token-bucket state
+    migrate_rate_limit_token_bucket(cursor)
     
     conn.commit()
     
@@ -240,20 +252,333 @@ def migrate_jobs_result_integrity(cursor: sqlite3.Cursor) -> None:
     _add_column_if_missing(cursor, "jobs", "result_hash_alg TEXT DEFAULT 'sha256'", "result_hash_alg")
     _add_column_if_missing(cursor, "jobs", "result_canonical TEXT", "result_canonical")
 
+def migrate_jobs_ready_queue(cursor: sqlite3.Cursor) -> None:
+    """
+    Idempotent migration for the dispatcher ready-queue.
+    Adds composite indexes on jobs and a normalized job_dependencies table
+    (backfilled once from the legacy depends_on JSON column).
+    """
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_ready
+        ON jobs(status, priority, next_retry_utc, created_at)
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_dependencies (
+            job_id TEXT NOT NULL,
+            depends_on_id TEXT NOT NULL,
+            PRIMARY KEY (job_id, depends_on_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_job_dependencies_parent
+        ON job_dependencies(depends_on_id)
+    """)
+
+    applied = cursor.execute(
+        "SELECT 1 FROM schema_migrations WHERE version = 'ready_queue_v1'"
+    ).fetchone()
+    if applied:
+        return
+
+    rows = cursor.execute(
+        "SELECT id, depends_on FROM jobs WHERE depends_on IS NOT NULL AND depends_on NOT IN ('', '[]')"
+    ).fetchall()
+    for job_id, raw in rows:
+        try:
+            deps = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        cursor.executemany(
+            "INSERT OR IGNORE INTO job_dependencies (job_id, depends_on_id) VALUES (?, ?)",
+            [(job_id, d) for d in deps if d],
+        )
+    cursor.execute("""
+        INSERT OR IGNORE INTO schema_migrations (version, applied_at, description)
+        VALUES ('ready_queue_v1', datetime('now'), 'Ready-queue indexes and job_dependencies table')
+    """)
+
+def migrate_rate_limit_token_bucket(cursor: sqlite3.Cursor) -> None:
+    """
+    Token-bucket state for core/rate_limiter.py (tokens left, time of last
+    refill), kept beside rate_limit_config so that table's shape is unchanged.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_state (
+            source TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            refilled_at REAL NOT NULL
+        )
+    """)
+
+# Upsert used inside the job_stats triggers: add delta to key when cond holds
+_JOB_STATS_BUMP = """
+    INSERT INTO job_stats (key, value, updated_utc)
+    SELECT {key}, {delta}, strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE {cond}
+    ON CONFLICT(key) DO UPDATE SET
+        value = value + excluded.value,
+        updated_utc = excluded.updated_utc;
+"""
+
+
+def _job_stats_bump(key_sql: str, delta: int, cond: str = "1") -> str:
+    return _JOB_STATS_BUMP.format(key=key_sql, delta=delta, cond=cond)
+
+
+def migrate_jobs_stats(cursor: sqlite3.Cursor) -> None:
+    """
+    Idempotent migration for the job_stats counters.
+
+    job_stats holds one row per key:
+      - 'status:<status>'  current number of jobs in that status
+      - 'created_total'    jobs ever inserted (monotonic)
+      - 'completed_total'  transitions into 'completed' (monotonic);
+                           its updated_utc is the last completion time
+    Triggers on jobs keep the rows in the same transaction as the status
+    change, whoever writes the row, so readers get counts in O(1).
+    Backfilled once from the existing jobs table.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0,
+            updated_utc TEXT
+        ) WITHOUT ROWID
+    """)
+
+    new_status = "'status:' || COALESCE(NEW.status, 'pending')"
+    old_status = "'status:' || COALESCE(OLD.status, 'pending')"
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_job_stats_insert AFTER INSERT ON jobs
+        BEGIN
+            {_job_stats_bump(new_status, 1)}
+            {_job_stats_bump("'created_total'", 1)}
+            {_job_stats_bump("'completed_total'", 1, "NEW.status = 'completed'")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_job_stats_status AFTER UPDATE OF status ON jobs
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            {_job_stats_bump(old_status, -1)}
+            {_job_stats_bump(new_status, 1)}
+            {_job_stats_bump("'completed_total'", 1, "NEW.status = 'completed'")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_job_stats_delete AFTER DELETE ON jobs
+        BEGIN
+            {_job_stats_bump(old_status, -1)}
+        END
+    """)
+
+    applied = cursor.execute(
+        "SELECT 1 FROM schema_migrations WHERE version = 'job_stats_v1'"
+    ).fetchone()
+    if applied:
+        return
+
+    cursor.execute("DELETE FROM job_stats")
+    cursor.execute("""
+        INSERT INTO job_stats (key, value, updated_utc)
+        SELECT 'status:' || COALESCE(status, 'pending'), COUNT(*), strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+        FROM jobs GROUP BY COALESCE(status, 'pending')
+    """)
+    cursor.execute("""
+        INSERT INTO job_stats (key, value, updated_utc)
+        SELECT 'created_total', COUNT(*), strftime('%Y-%m-%dT%H:%M:%fZ', 'now') FROM jobs
+    """)
+    cursor.execute("""
+        INSERT INTO job_stats (key, value, updated_utc)
+        SELECT 'completed_total', COUNT(*), MAX(updated_at) FROM jobs WHERE status = 'completed'
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO schema_migrations (version, applied_at, description)
+        VALUES ('job_stats_v1', datetime('now'), 'Trigger-maintained job_stats counters')
+    """)
+
+class _PooledConnection:
+    """Thread-owned connection slot (depth tracks nested get_db() usage)."""
+    __slots__ = ("conn", "thread", "generation", "depth")
+
+    def __init__(self, conn: sqlite3.Connection, thread: threading.Thread, generation: int):
+        self.conn = conn
+        self.thread = thread
+        self.generation = generation
+        self.depth = 0
+
+
+class _SavepointConnection:
+    """
+    Connection handed to a nested get_db() block. The block runs in a
+    SAVEPOINT: commit() releases it into the enclosing transaction (or
+    commits, if there is none) and rollback() undoes only this block.
+    Uncommitted work is discarded on exit, as at depth 0.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, name: str):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_name", name)
+        conn.execute(f"SAVEPOINT {name}")
+
+    def commit(self) -> None:
+        self._conn.execute(f"RELEASE SAVEPOINT {self._name}")
+        self._conn.execute(f"SAVEPOINT {self._name}")
+
+    def rollback(self) -> None:
+        self._conn.execute(f"ROLLBACK TO SAVEPOINT {self._name}")
+
+    def _close(self) -> None:
+        try:
+            self.rollback()
+            self._conn.execute(f"RELEASE SAVEPOINT {self._name}")
+        except sqlite3.OperationalError:
+            pass  # the whole transaction was already rolled back
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class ConnectionPool:
+    """
+    Long-lived, thread-local SQLite connections.
+
+    Each thread gets one read-write and (on demand) one read-only connection
+    per database path. PRAGMAs are applied once at open time and sqlite3's
+    per-connection statement cache stays warm across calls. Uncommitted work
+    is rolled back when the outermost get_db() block exits, matching the old
+    open/close-per-call semantics.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._slots: list = []
+        self._generation = 0
+        self._stats = {
+            "opened": 0,
+            "opened_readonly": 0,
+            "reused": 0,
+            "closed": 0,
+        }
+
+    def _open(self, path: str, readonly: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            path,
+            timeout=DatabaseConfig.BUSY_TIMEOUT_MS / 1000.0,
+            check_same_thread=False,  # owned by one thread; closable from close_all()
+            cached_statements=DatabaseConfig.STATEMENT_CACHE,
+        )
+        # PRAGMAs for performance and concurrency (once per connection)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(DatabaseConfig.BUSY_TIMEOUT_MS)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{int(DatabaseConfig.CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size={int(DatabaseConfig.MMAP_SIZE)}")
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _prune_dead(self) -> None:
+        """Close connections whose owning thread has exited (caller holds _lock)."""
+        alive = []
+        for slot in self._slots:
+            if slot.thread.is_alive():
+                alive.append(slot)
+            else:
+                try:
+                    slot.conn.close()
+                except sqlite3.Error:
+                    pass
+                self._stats["closed"] += 1
+        self._slots = alive
+
+    def _acquire(self, readonly: bool) -> _PooledConnection:
+        slots = getattr(self._local, "slots", None)
+        if slots is None:
+            slots = self._local.slots = {}
+        key = (str(DB_PATH), readonly)
+        slot = slots.get(key)
+
+        if slot is not None and slot.generation == self._generation:
+            with self._lock:
+                self._stats["reused"] += 1
+        else:
+            conn = self._open(key[0], readonly)
+            slot = _PooledConnection(conn, threading.current_thread(), self._generation)
+            slots[key] = slot
+            with self._lock:
+                self._prune_dead()
+                self._slots.append(slot)
+                self._stats["opened_readonly" if readonly else "opened"] += 1
+        return slot
+
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        slot = self._acquire(readonly)
+        slot.depth += 1
+        nested = _SavepointConnection(slot.conn, f"get_db_{slot.depth}") if slot.depth > 1 else None
+        try:
+            yield nested or slot.conn
+        finally:
+            slot.depth -= 1
+            if nested is not None:
+                nested._close()
+            elif slot.conn.in_transaction:
+                # Same outcome as the old conn.close(): discard uncommitted work
+                slot.conn.rollback()
+
+    def close_all(self) -> None:
+        """Close every pooled connection; threads transparently reopen on next use."""
+        with self._lock:
+            self._generation += 1
+            for slot in self._slots:
+                try:
+                    slot.conn.close()
+                except sqlite3.Error:
+                    pass
+                self._stats["closed"] += 1
+            self._slots = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune_dead()
+            out = dict(self._stats)
+            out["active"] = len(self._slots)
+        return out
+
+
+_pool = ConnectionPool()
+
 @contextmanager
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    # PRAGMAs for performance and concurrency (per connection)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA busy_timeout=5000")
-    conn.execute("PRAGMA temp_store=MEMORY")
-    
-    conn.row_factory = sqlite3.Row
-    try:
+def get_db(readonly: bool = False):
+    """
+    Pooled connection for the current thread.
+    readonly=True hands out a separate query_only connection for read paths.
+    """
+    with _pool.connection(readonly=readonly) as conn:
         yield conn
-    finally:
-        conn.close()
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool metrics (opened, reused, closed, active)."""
+    return _pool.stats()
+
+def close_all_connections() -> None:
+    _pool.close_all()
 
 if __name__ == "__main__":
     print(f"Initializing database at {DB_PATH}...")
@@ -1,11 +1,18 @@
 import json
+import os
+import threading
+import time
 import uuid
+import zlib
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import jsonschema
 
 from core import config
+from core.config import TraceConfig
+from core.why_index import rotated_segment_path
 
 class DecisionTraceLogger:
     """
@@ -15,15 +22,60 @@ class DecisionTraceLogger:
     - Valid events → logs/decision_trace.jsonl
     - Invalid events → logs/decision_trace_breaches.jsonl (separate)
     - No invalid events ever pollute the main stream
+
+    Pipeline (keeps log_node off the disk on the caller's thread):
+    - Draft7Validator compiled once at startup
+    - Per-intent sampling, decided per trace_id so a sampled trace stays whole
+    - Bounded ring buffer drained by a background writer in batches
+      (FLUSH_BATCH nodes or FLUSH_INTERVAL_MS, whichever comes first)
+    - Backpressure when the buffer is full: drop | block | count (see TraceConfig)
+    - Segment rotation past SEGMENT_MAX_BYTES (decision_trace.<stamp>.jsonl)
     """
     
-    def __init__(self, schema_path: str, log_path: str = "logs/decision_trace.jsonl"):
+    def __init__(
+        self,
+        schema_path: str,
+        log_path: str = "logs/decision_trace.jsonl",
+        buffer_size: int = TraceConfig.BUFFER_SIZE,
+        flush_batch: int = TraceConfig.FLUSH_BATCH,
+        flush_interval_ms: int = TraceConfig.FLUSH_INTERVAL_MS,
+        backpressure: str = TraceConfig.BACKPRESSURE,
+        block_timeout_ms: int = TraceConfig.BLOCK_TIMEOUT_MS,
+        sample_rates: Optional[Dict[str, float]] = None,
+        segment_max_bytes: int = TraceConfig.SEGMENT_MAX_BYTES,
+    ):
         self.log_path = Path(log_path)
         self.breach_path = self.log_path.parent / "decision_trace_breaches.jsonl"
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(schema_path, "r", encoding="utf-8") as f:
             self.schema = json.load(f)
+        validator_cls = jsonschema.validators.validator_for(self.schema, default=jsonschema.Draft7Validator)
+        validator_cls.check_schema(self.schema)
+        self._validator = validator_cls(self.schema)
+
+        if backpressure not in ("drop", "block", "count"):
+            print(f"[trace] Unknown backpressure policy '{backpressure}', using 'drop'")
+            backpressure = "drop"
+        self.buffer_size = max(1, buffer_size)
+        self.flush_batch = max(1, flush_batch)
+        self.flush_interval_sec = flush_interval_ms / 1000.0
+        self.backpressure = backpressure
+        self.block_timeout_sec = block_timeout_ms / 1000.0
+        self.segment_max_bytes = segment_max_bytes
+        self.sample_rates = TraceConfig.sample_rates() if sample_rates is None else dict(sample_rates)
+
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._writing = False
+        self._drain_requested = False
+        self._closed = False
+        self.stats = {
+            "accepted": 0, "written": 0, "sampled_out": 0, "breaches": 0,
+            "dropped": 0, "overwritten": 0, "blocked": 0, "blocked_ms": 0.0,
+            "flushes": 0, "write_errors": 0, "rotations": 0, "max_depth": 0,
+        }
             
     def _now_iso(self) -> str:
         return datetime.utcnow().isoformat() + "Z"
@@ -76,10 +128,14 @@ class DecisionTraceLogger:
         """
         Log a decision node. Returns node_id on success, raises on validation failure.
         
-        Valid events are written to main log.
+        Valid events are buffered for the main log (see flush()).
         Invalid events are written to breach log and raise ValueError.
+        Nodes of sampled-out traces are skipped but still get a node_id.
         """
         node_id = str(uuid.uuid4())
+        if not self._sampled(intent, trace_id):
+            self.stats["sampled_out"] += 1
+            return node_id
         
         entry = {
             "schema_version": "decision_trace_v1",
@@ -96,21 +152,127 @@ class DecisionTraceLogger:
             "result": result
         }
         
-        # Hard validation
-        try:
-            jsonschema.validate(instance=entry, schema=self.schema)
-        except jsonschema.ValidationError as e:
+        # Hard validation (compiled validator, no per-call schema checks)
+        error = jsonschema.exceptions.best_match(self._validator.iter_errors(entry))
+        if error is not None:
             # Log to breach file with structured error
-            self._log_breach(entry, e)
+            self.stats["breaches"] += 1
+            self._log_breach(entry, error)
             # Do NOT write to main log
-            raise ValueError(f"Schema breach: {e.message}")
+            raise ValueError(f"Schema breach: {error.message}")
         
         # Only valid events reach here
-        with open(self.log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
-            
+        self._enqueue(json.dumps(entry))
         return node_id
 
+    def _sampled(self, intent: str, trace_id: str) -> bool:
+        rate = self.sample_rates.get(intent, 1.0)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        # Deterministic per trace_id: every node of a kept trace is kept
+        return (zlib.crc32(trace_id.encode("utf-8")) & 0xFFFFFFFF) < rate * 0x100000000
+
+    def _enqueue(self, line: str) -> None:
+        with self._cond:
+            if self._closed:
+                self._write_lines([line])
+                return
+            if len(self._buffer) >= self.buffer_size:
+                if self.backpressure == "count":
+                    self._buffer.popleft()
+                    self.stats["overwritten"] += 1
+                elif self.backpressure == "block":
+                    self.stats["blocked"] += 1
+                    start = time.perf_counter()
+                    self._drain_requested = True
+                    self._cond.notify_all()
+                    self._cond.wait_for(lambda: len(self._buffer) < self.buffer_size, self.block_timeout_sec)
+                    self.stats["blocked_ms"] += (time.perf_counter() - start) * 1000.0
+                    if len(self._buffer) >= self.buffer_size:
+                        self.stats["dropped"] += 1
+                        return
+                else:
+                    self.stats["dropped"] += 1
+                    return
+            self._buffer.append(line)
+            self.stats["accepted"] += 1
+            depth = len(self._buffer)
+            if depth > self.stats["max_depth"]:
+                self.stats["max_depth"] = depth
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="decision-trace-writer", daemon=True)
+                self._writer.start()
+            if depth >= self.flush_batch:
+                self._cond.notify_all()
+
+    def _take_batch(self) -> List[str]:
+        batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.flush_batch))]
+        self._writing = bool(batch)
+        self._cond.notify_all()  # wake blocked producers
+        return batch
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._cond:
+                # Predicate wait: a drain request made before the writer got here is not lost
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.flush_batch or self._closed or self._drain_requested,
+                    self.flush_interval_sec,
+                )
+                self._drain_requested = False
+                if self._closed and not self._buffer:
+                    return
+                batch = self._take_batch()
+            if batch:
+                self._write_lines(batch)
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write_lines(self, lines: List[str]) -> None:
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                size = f.tell()
+            self.stats["written"] += len(lines)
+            self.stats["flushes"] += 1
+            if self.segment_max_bytes and size >= self.segment_max_bytes:
+                # Seal the segment; the why-index re-labels it without re-reading
+                os.replace(self.log_path, rotated_segment_path(self.log_path))
+                self.stats["rotations"] += 1
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            print(f"[trace] Failed to write {len(lines)} trace nodes: {e}", file=sys.stderr)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything buffered so far is on disk. Returns False on timeout."""
+        with self._cond:
+            if self._buffer:
+                self._drain_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._buffer and not self._writing, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush and stop the writer; later log_node calls write synchronously."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["buffer_depth"] = len(self._buffer)
+        stats["blocked_ms"] = round(stats["blocked_ms"], 3)
+        stats["buffer_size"] = self.buffer_size
+        stats["backpressure"] = self.backpressure
+        stats["sample_rates"] = dict(self.sample_rates)
+        return stats
+
 # Instantiate global logger
 import sys
 
@@ -125,9 +287,15 @@ if not SCHEMA_FILE.exists():
 
 if SCHEMA_FILE.exists():
     trace_logger = DecisionTraceLogger(str(SCHEMA_FILE))
+    # Drain the buffer on interpreter exit (writer thread is a daemon)
+    import atexit
+    atexit.register(trace_logger.close)
 else:
     # Minimal fallback logger if schema is entirely missing – prevents total system crash
     print(f"[trace] WARNING: Schema file not found at {SCHEMA_FILE}. Decision tracing will be limited.")
     class DummyLogger:
         def log_node(self, *args, **kwargs): return "missing-schema-node"
+        def flush(self, timeout: float = 5.0): return True
+        def close(self, timeout: float = 5.0): pass
+        def get_stats(self): return {"enabled": False}
     trace_logger = DummyLogger()
@@ -94,6 +94,7 @@ class HealthManager:
     @staticmethod
     def get_system_metrics() -> Dict[str, Any]:
         """Gather system-level metrics."""
+        job_stats = storage.get_job_stats()
         return {
             "uptime_sec": int(time.time() - CORE_START_TIME),
             "cpu_pct": psutil.cpu_percent(),
@@ -103,9 +104,13 @@ class HealthManager:
                 "memory_rss": psutil.Process().memory_info().rss
             },
             "storage": {
-                "queue_depth": storage.count_pending_jobs(),
-                "inflight": storage.count_inflight_jobs(),
-                "ready_to_dispatch": storage.count_ready_jobs(datetime.utcnow().isoformat() + "Z")
+                "queue_depth": job_stats["pending"],
+                "inflight": job_stats["inflight"],
+                "ready_to_dispatch": storage.count_ready_jobs(datetime.utcnow().isoformat() + "Z"),
+                "jobs_by_status": job_stats["by_status"],
+                "jobs_created_total": job_stats["created_total"],
+                "jobs_completed_total": job_stats["completed_total"],
+                "last_completed_utc": job_stats["last_completed_utc"],
             }
         }
 
@@ -231,6 +231,8 @@ class JobChainManager:
             return {"ok": False, "reason": reason, "dispatched": 0, "child_job_ids": []}
 
         child_job_ids: List[str] = []
+        child_jobs = []
+        index_entries = []
 
         next_depth = int(chain["depth"]) + 1
         chain["depth"] = next_depth
@@ -279,19 +281,23 @@ class JobChainManager:
                 updated_at=created,
             )
 
-            # Persist job (dispatcher loop will pick it up)
-            self.storage.create_job(job)
-
-            # Chain index routing
-            self.chain_index.put(job_id, {
+            child_jobs.append(job)
+            index_entries.append((job_id, {
                 "chain_id": chain_id,
                 "role": "child",
                 "root_job_id": root_job_id,
                 "parent_llm_job_id": parent_llm_job_id,
                 "depth": next_depth,
-            })
+            }))
 
-            child_job_ids.append(job_id)
+        # Chain index routing: one transaction for the whole batch, written
+        # before the jobs exist so a fast result always finds its routing info
+        self.chain_index.put_many(index_entries)
+
+        for job in child_jobs:
+            # Persist job (dispatcher loop will pick it up)
+            self.storage.create_job(job)
+            child_job_ids.append(job.id)
 
         chain["jobs_total"] = int(chain["jobs_total"]) + len(child_job_ids)
         chain["pending_child_job_ids"] = list(set(chain.get("pending_child_job_ids", [])) | set(child_job_ids))
@@ -0,0 +1,347 @@
+# core/job_transport.py
+"""
+Job Transport Layer (Core <-> Worker handoff).
+
+Pluggable transport behind WebRelayBridge and worker_loop:
+  - FileDropTransport:    legacy webrelay_out/*.job.json + webrelay_in/*.result.json
+  - SQLiteQueueTransport: shared SQLite queue with batch dequeue, leases/acks
+                          and change notification (in-process Condition +
+                          PRAGMA data_version watch across processes)
+
+Selection: SHERATAN_JOB_TRANSPORT=file|sqlite (default: file).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class JobDelivery:
+    """A job handed to a worker; ack() it once the result has been sent."""
+    job_id: str
+    unified: Dict[str, Any]
+    receipt: Any = None
+
+
+class JobTransport:
+    """Transport contract shared by the Core (producer) and workers (consumer)."""
+    name = "base"
+
+    # --- Core side ---
+    def send_job(self, unified: Dict[str, Any]) -> Optional[Path]:
+        raise NotImplementedError
+
+    def fetch_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the raw result for job_id, or None if not available yet."""
+        raise NotImplementedError
+
+    def ack_result(self, job_id: str) -> None:
+        raise NotImplementedError
+
+    def list_result_ids(self, limit: int = 1000) -> List[str]:
+        """Job ids with a result waiting (one listing, no per-job lookups)."""
+        raise NotImplementedError
+
+    # --- Worker side ---
+    def receive_jobs(self, worker_id: str, max_items: int = 8, timeout: float = 5.0) -> List[JobDelivery]:
+        raise NotImplementedError
+
+    def ack_job(self, delivery: JobDelivery) -> None:
+        raise NotImplementedError
+
+    def send_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class InvalidResult(Exception):
+    """Result exists but cannot be decoded."""
+
+
+# ------------------------------------------------------------------------------
+# FILE DROP (legacy / fallback)
+# ------------------------------------------------------------------------------
+
+class FileDropTransport(JobTransport):
+    """webrelay_out/webrelay_in file handoff (previous behaviour, kept as fallback)."""
+    name = "file"
+
+    def __init__(self, out_dir: Path, in_dir: Path, poll_interval: float = 0.2):
+        self.out_dir = Path(out_dir)
+        self.in_dir = Path(in_dir)
+        self.poll_interval = poll_interval
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.in_dir.mkdir(parents=True, exist_ok=True)
+
+    def job_path(self, job_id: str) -> Path:
+        return self.out_dir / f"{job_id}.job.json"
+
+    def result_path(self, job_id: str) -> Path:
+        return self.in_dir / f"{job_id}.result.json"
+
+    def send_job(self, unified: Dict[str, Any]) -> Optional[Path]:
+        job_file = self.job_path(unified["job_id"])
+        with open(job_file, "w", encoding="utf-8") as f:
+            json.dump(unified, f, indent=2)
+        return job_file
+
+    def fetch_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        result_file = self.result_path(job_id)
+        if not result_file.exists():
+            return None
+        raw = result_file.read_text()
+        try:
+            return json.loads(raw)
+        except Exception as e:
+            raise InvalidResult(str(e))
+
+    def ack_result(self, job_id: str) -> None:
+        self.result_path(job_id).unlink(missing_ok=True)
+
+    def list_result_ids(self, limit: int = 1000) -> List[str]:
+        out: List[str] = []
+        suffix = ".result.json"
+        with os.scandir(self.in_dir) as it:
+            for entry in it:
+                if entry.name.endswith(suffix):
+                    out.append(entry.name[:-len(suffix)])
+                    if len(out) >= limit:
+                        break
+        return out
+
+    def receive_jobs(self, worker_id: str, max_items: int = 8, timeout: float = 5.0) -> List[JobDelivery]:
+        deadline = time.time() + timeout
+        while True:
+            out: List[JobDelivery] = []
+            for path in sorted(self.out_dir.glob("*.job.json")):
+                try:
+                    unified = json.loads(path.read_text(encoding="utf-8"))
+                except Exception:
+                    continue  # partially written; picked up next scan
+                target = unified.get("worker_id")
+                if target and target != worker_id:
+                    continue
+                out.append(JobDelivery(unified.get("job_id") or path.stem.split(".")[0], unified, path))
+                if len(out) >= max_items:
+                    break
+            if out or time.time() >= deadline:
+                return out
+            time.sleep(self.poll_interval)
+
+    def ack_job(self, delivery: JobDelivery) -> None:
+        Path(delivery.receipt).unlink(missing_ok=True)
+
+    def send_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        # tmp + replace so the Core never reads a half-written result as invalid_json
+        path = self.result_path(job_id)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+# ------------------------------------------------------------------------------
+# SQLITE QUEUE
+# ------------------------------------------------------------------------------
+
+class SQLiteQueueTransport(JobTransport):
+    """
+    SQLite-backed job/result queue shared by Core and workers.
+
+    - Batch dequeue: one UPDATE ... RETURNING leases up to N jobs
+    - Acks: a leased job is deleted on ack; expired leases are redelivered
+      (at-least-once; workers dedupe via their job_cache)
+    - Notification: writers signal an in-process Condition; other processes
+      are woken by PRAGMA data_version changes (no row scans while idle)
+    """
+    name = "sqlite"
+
+    def __init__(self, db_path: Path, lease_sec: int = 300, notify_interval: float = 0.005):
+        self.db_path = Path(db_path)
+        self.lease_sec = lease_sec
+        self.notify_interval = notify_interval
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transport_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    worker_id TEXT,
+                    body TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    leased_by TEXT,
+                    leased_until REAL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transport_jobs_ready
+                ON transport_jobs(leased_until, enqueued_at)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transport_results (
+                    job_id TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _notify(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def _data_version(self) -> int:
+        return self._conn().execute("PRAGMA data_version").fetchone()[0]
+
+    def _wait_for_change(self, last_version: int, deadline: float) -> int:
+        """Block until another connection commits (or deadline). Returns new data_version."""
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return last_version
+            with self._cond:
+                self._cond.wait(min(self.notify_interval, remaining))
+            version = self._data_version()
+            if version != last_version:
+                return version
+
+    # --- Core side ---
+    def send_job(self, unified: Dict[str, Any]) -> Optional[Path]:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO transport_jobs (job_id, worker_id, body, enqueued_at, leased_by, leased_until) "
+            "VALUES (?, ?, ?, ?, NULL, NULL)",
+            (unified["job_id"], unified.get("worker_id"), json.dumps(unified), time.time()),
+        )
+        conn.commit()
+        self._notify()
+        return None
+
+    def fetch_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT body FROM transport_results WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except Exception as e:
+            raise InvalidResult(str(e))
+
+    def fetch_results(self, limit: int = 100) -> Dict[str, Dict[str, Any]]:
+        """Batch variant for reconciliation sweeps: {job_id: result}."""
+        rows = self._conn().execute(
+            "SELECT job_id, body FROM transport_results ORDER BY created_at ASC LIMIT ?", (limit,)
+        ).fetchall()
+        out = {}
+        for job_id, body in rows:
+            try:
+                out[job_id] = json.loads(body)
+            except Exception:
+                out[job_id] = None
+        return out
+
+    def ack_result(self, job_id: str) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM transport_results WHERE job_id = ?", (job_id,))
+        conn.commit()
+
+    def list_result_ids(self, limit: int = 1000) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT job_id FROM transport_results ORDER BY created_at ASC LIMIT ?", (limit,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Block until the queue changes or timeout; True if something changed."""
+        version = self._data_version()
+        return self._wait_for_change(version, time.time() + timeout) != version
+
+    def wait_for_result(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.time() + timeout
+        version = self._data_version()
+        while True:
+            result = self.fetch_result(job_id)
+            if result is not None or time.time() >= deadline:
+                return result
+            version = self._wait_for_change(version, deadline)
+
+    # --- Worker side ---
+    def receive_jobs(self, worker_id: str, max_items: int = 8, timeout: float = 5.0) -> List[JobDelivery]:
+        deadline = time.time() + timeout
+        version = self._data_version()
+        conn = self._conn()
+        while True:
+            now = time.time()
+            rows = conn.execute("""
+                UPDATE transport_jobs
+                SET leased_by = ?, leased_until = ?
+                WHERE job_id IN (
+                    SELECT job_id FROM transport_jobs
+                    WHERE (leased_until IS NULL OR leased_until < ?)
+                      AND (worker_id IS NULL OR worker_id = ?)
+                    ORDER BY enqueued_at ASC
+                    LIMIT ?
+                )
+                RETURNING job_id, body, enqueued_at
+            """, (worker_id, now + self.lease_sec, now, worker_id, max_items)).fetchall()
+            conn.commit()
+            if rows:
+                rows.sort(key=lambda r: r[2])
+                return [JobDelivery(r[0], json.loads(r[1]), worker_id) for r in rows]
+            if now >= deadline:
+                return []
+            version = self._wait_for_change(version, deadline)
+
+    def ack_job(self, delivery: JobDelivery) -> None:
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM transport_jobs WHERE job_id = ? AND leased_by = ?",
+            (delivery.job_id, delivery.receipt),
+        )
+        conn.commit()
+
+    def send_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO transport_results (job_id, body, created_at) VALUES (?, ?, ?)",
+            (job_id, json.dumps(result), time.time()),
+        )
+        conn.commit()
+        self._notify()
+
+
+# ------------------------------------------------------------------------------
+# FACTORY
+# ------------------------------------------------------------------------------
+
+def create_transport(
+    out_dir: Path,
+    in_dir: Path,
+    queue_path: Optional[Path] = None,
+    kind: Optional[str] = None,
+) -> JobTransport:
+    """Build the configured transport; unknown kinds fall back to file drop."""
+    kind = (kind or os.getenv("SHERATAN_JOB_TRANSPORT", "file")).lower()
+    if kind == "sqlite":
+        queue_path = queue_path or Path(out_dir).parent / "job_transport.db"
+        return SQLiteQueueTransport(queue_path)
+    if kind != "file":
+        print(f"[transport] Unknown transport '{kind}', falling back to file drop")
+    return FileDropTransport(out_dir, in_dir)
@@ -1,12 +1,18 @@
 # core/ledger_journal.py
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import hmac
 import json
 import os
+import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Any, Dict, Generator, Iterable, Optional, Tuple
+from typing import Any, Deque, Dict, Generator, Iterable, List, Optional, Set, Tuple
 
 from core.utils.atomic_io import atomic_append_jsonl, canonical_json_bytes, sha256_hex, json_lock
 
@@ -55,9 +61,10 @@ def _compute_hash(prev_hash: str, ev_no_hash: Dict[str, Any]) -> str:
     return sha256_hex(payload)
 
 
-def _read_last_hash_fast(journal_path: str) -> str:
+def _read_last_hash_fast(journal_path: str, end: Optional[int] = None) -> str:
     """
-    Best-effort: read last non-empty line and return its "hash".
+    Best-effort: read last non-empty line (before byte offset `end`, if given)
+    and return its "hash".
     Returns "GENESIS" if file missing/empty/no-hash.
     """
     if not os.path.exists(journal_path):
@@ -66,13 +73,13 @@ def _read_last_hash_fast(journal_path: str) -> str:
     try:
         with open(journal_path, "rb") as f:
             f.seek(0, os.SEEK_END)
-            size = f.tell()
+            size = f.tell() if end is None else min(end, f.tell())
             if size == 0:
                 return "GENESIS"
 
             # Read tail chunk
             chunk_size = min(8192, size)
-            f.seek(-chunk_size, os.SEEK_END)
+            f.seek(size - chunk_size)
             tail = f.read(chunk_size)
 
         # Split lines, find last non-empty
@@ -115,6 +122,22 @@ class LedgerEvent:
         return str(self.raw.get("prev_hash", ""))
 
 
+def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of `event` with the required fields completed (schema, event_id, ts,
+    currency, decimal-string amount). Hash fields are added when appended.
+    """
+    ev: Dict[str, Any] = dict(event)
+    ev.setdefault("schema", "ledger_event.v1")
+    ev.setdefault("event_id", _new_event_id())
+    ev.setdefault("ts", _now_ts())
+    ev.setdefault("currency", DEFAULT_CURRENCY)
+
+    if "amount" in ev:
+        ev["amount"] = _require_decimal_string(ev["amount"])
+    return ev
+
+
 def append_event(
     event: Dict[str, Any],
     *,
@@ -128,15 +151,7 @@ def append_event(
     os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
     os.makedirs(os.path.dirname(domain_lock) or ".", exist_ok=True)
 
-    # Normalize/complete required fields
-    ev: Dict[str, Any] = dict(event)
-    ev.setdefault("schema", "ledger_event.v1")
-    ev.setdefault("event_id", _new_event_id())
-    ev.setdefault("ts", _now_ts())
-    ev.setdefault("currency", DEFAULT_CURRENCY)
-
-    if "amount" in ev:
-        ev["amount"] = _require_decimal_string(ev["amount"])
+    ev = normalize_event(event)
 
     def _do_append():
         prev_hash = "GENESIS"
@@ -165,6 +180,186 @@ def append_event(
     return ev
 
 
+class JournalWriterError(RuntimeError):
+    """Raised for events submitted to a JournalWriter that failed or was closed."""
+
+
+class JournalWriter:
+    """
+    Group-commit writer for one journal.
+
+    Events are submitted from any thread and queued. A writer thread
+    hash-chains each batch in submission order from the head hash it keeps
+    in memory, then writes the batch with one write + fsync. submit()
+    returns a Future resolved with the stored event once it is durable.
+
+    Each batch holds domain_lock, the lock append_event takes before it
+    reads the head hash, so appenders in other processes cannot interleave
+    with a batch. The batch also checks the journal size against the end
+    of its own last write: if another appender wrote in between, the head
+    is re-read from disk, so the chain stays valid. With domain_lock=None
+    the writer must own the journal exclusively.
+    After a write error the writer fails every pending and later event
+    (fail-stop), so no event is chained after a lost one.
+
+    max_latency_ms is how long the writer lingers after the first queued
+    event to fill a batch. At 0, batches form only from events that queue
+    up during the previous write.
+    """
+
+    def __init__(
+        self,
+        journal_path: str = DEFAULT_JOURNAL_PATH,
+        *,
+        max_batch: int = 512,
+        max_latency_ms: float = 0.0,
+        domain_lock: Optional[str] = DEFAULT_DOMAIN_LOCK,
+    ):
+        self.journal_path = journal_path
+        self.domain_lock = domain_lock
+        if domain_lock:
+            os.makedirs(os.path.dirname(domain_lock) or ".", exist_ok=True)
+        self.max_batch = max(1, max_batch)
+        self.max_latency_sec = max(0.0, max_latency_ms) / 1000.0
+        os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+
+        self._queue: Deque[Tuple[Dict[str, Any], Future]] = deque()
+        self._cond = threading.Condition()
+        self._head_hash = "GENESIS"
+        self._end: Optional[int] = None  # journal size after our last write
+        self._submitted = 0
+        self._completed = 0
+        self._failed: Optional[BaseException] = None
+        self._closed = False
+        self.stats = {"events": 0, "batches": 0, "max_batch": 0, "head_reloads": 0}
+        self._thread = threading.Thread(target=self._run, name="ledger-journal-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def head_hash(self) -> str:
+        """Hash of the last event this writer made durable."""
+        with self._cond:
+            return self._head_hash
+
+    @property
+    def offset(self) -> Optional[int]:
+        """Journal size after this writer's last durable batch (None before the first)."""
+        with self._cond:
+            return self._end
+
+    @property
+    def failed(self) -> Optional[BaseException]:
+        """The write error that stopped this writer, if any."""
+        with self._cond:
+            return self._failed
+
+    def submit(self, event: Dict[str, Any]) -> Future:
+        """Queue an event; the Future resolves to the stored event once fsynced."""
+        ev = normalize_event(event)
+        future: Future = Future()
+        with self._cond:
+            if self._failed is not None or self._closed:
+                reason = f"failed: {self._failed}" if self._failed is not None else "closed"
+                future.set_exception(JournalWriterError(f"Journal writer for {self.journal_path} {reason}"))
+                return future
+            self._queue.append((ev, future))
+            self._submitted += 1
+            self._cond.notify_all()
+        return future
+
+    def append(self, event: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Submit an event and wait until it is durable."""
+        return self.submit(event).result(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written (or failed)."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._completed >= target, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write what is queued, then stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                if self.max_latency_sec > 0 and not self._closed:
+                    deadline = time.monotonic() + self.max_latency_sec
+                    while len(self._queue) < self.max_batch and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        stored: List[Dict[str, Any]] = []
+        try:
+            with contextlib.ExitStack() as locks:
+                # Same order as append_event: domain lock, then journal lock
+                if self.domain_lock:
+                    locks.enter_context(json_lock(self.domain_lock, timeout=10.0))
+                locks.enter_context(json_lock(self.journal_path, timeout=10.0))
+                size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+                head = self._head_hash
+                if size != self._end:
+                    # First batch, or someone else appended since our last write
+                    head = _read_last_hash_fast(self.journal_path) if HASH_CHAIN_ENABLED else "GENESIS"
+                    self.stats["head_reloads"] += 1
+
+                lines = []
+                for ev, _ in batch:
+                    out = dict(ev)
+                    if HASH_CHAIN_ENABLED:
+                        ev_no_hash = _strip_hash_fields(out)
+                        out["prev_hash"] = head
+                        out["hash"] = head = _compute_hash(head, ev_no_hash)
+                    else:
+                        out.pop("prev_hash", None)
+                        out.pop("hash", None)
+                    stored.append(out)
+                    lines.append(json.dumps(out, ensure_ascii=False, separators=(",", ":")) + "\n")
+                data = "".join(lines).encode("utf-8")
+
+                with open(self.journal_path, "ab", buffering=0) as f:
+                    f.write(data)
+                    f.flush()
+                    try:
+                        os.fsync(f.fileno())
+                    except OSError:
+                        pass
+        except BaseException as e:
+            with self._cond:
+                self._failed = e
+                failed = batch + list(self._queue)
+                self._queue.clear()
+                self._completed += len(failed)
+                self._cond.notify_all()
+            print(f"[ledger_journal] Group commit failed, writer stopped: {e}")
+            for _, future in failed:
+                future.set_exception(JournalWriterError(f"Journal write failed: {e}"))
+            return
+
+        with self._cond:
+            self._head_hash = head
+            self._end = size + len(data)
+            self._completed += len(batch)
+            self.stats["events"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            self._cond.notify_all()
+        for (_, future), out in zip(batch, stored):
+            future.set_result(out)
+
+
 def read_events(journal_path: str = DEFAULT_JOURNAL_PATH) -> Generator[LedgerEvent, None, None]:
     """
     Stream events from journal in file order. Skips empty lines.
@@ -181,21 +376,45 @@ def read_events(journal_path: str = DEFAULT_JOURNAL_PATH) -> Generator[LedgerEve
             yield LedgerEvent(raw=raw)
 
 
-def verify_chain(journal_path: str = DEFAULT_JOURNAL_PATH) -> Tuple[bool, Dict[str, Any]]:
+def read_events_from(
+    journal_path: str = DEFAULT_JOURNAL_PATH, offset: int = 0
+) -> Generator[Tuple[LedgerEvent, int], None, None]:
     """
-    Verify hash-chain integrity of ledger_events.jsonl.
+    Stream events starting at byte `offset`, yielding (event, offset after its line).
+    A trailing line without newline (append still in flight) is not yielded.
     """
     if not os.path.exists(journal_path):
-        return True, {"status": "ok", "reason": "journal_missing_or_empty"}
+        return
 
-    if os.path.getsize(journal_path) == 0:
-        return True, {"status": "ok", "reason": "journal_missing_or_empty"}
+    with open(journal_path, "rb") as f:
+        f.seek(offset)
+        pos = offset
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            pos += len(line)
+            if not line.strip():
+                continue
+            yield LedgerEvent(raw=json.loads(line)), pos
 
-    prev = "GENESIS"
-    idx = 0
+
+def verify_lines(
+    lines: Iterable[bytes],
+    prev_hash: str = "GENESIS",
+    first_line: int = 1,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Verify that journal lines continue the chain from prev_hash (e.g. a
+    segment received from another node). Line numbers start at first_line.
+    """
+    prev = prev_hash
+    idx = first_line - 1
     try:
-        for idx, ev in enumerate(read_events(journal_path), start=1):
-            raw = ev.raw
+        for line in lines:
+            if not line.strip():
+                continue
+            idx += 1
+            raw = json.loads(line)
             if "hash" not in raw or "prev_hash" not in raw:
                 return False, {
                     "status": "error",
@@ -231,75 +450,347 @@ def verify_chain(journal_path: str = DEFAULT_JOURNAL_PATH) -> Tuple[bool, Dict[s
         return False, {"status": "error", "reason": "unexpected_error", "at_line": idx, "error": str(e)}
 
 
+def _verify_segment(
+    journal_path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    prev_hash: str = "GENESIS",
+    first_line: int = 1,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Verify the chain over bytes [start, end) (to EOF if end is None), starting
+    from prev_hash. Line numbers continue from first_line.
+    """
+    def segment(f):
+        pos = start
+        for line in f:
+            if end is not None and pos >= end:
+                break
+            pos += len(line)
+            yield line
+
+    try:
+        with open(journal_path, "rb") as f:
+            f.seek(start)
+            return verify_lines(segment(f), prev_hash, first_line)
+    except Exception as e:
+        return False, {"status": "error", "reason": "unexpected_error", "at_line": first_line - 1, "error": str(e)}
+
+
+def verify_chain(
+    journal_path: str = DEFAULT_JOURNAL_PATH,
+    *,
+    resume: bool = True,
+    full: bool = False,
+    workers: int = 1,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Verify hash-chain integrity of ledger_events.jsonl.
+
+    By default only events after the latest trusted checkpoint are verified
+    (everything, if there is no checkpoint sidecar). full=True verifies from
+    GENESIS: each segment between checkpoints is checked on its own, in
+    `workers` processes, and must end on its checkpoint's hash.
+    """
+    if not os.path.exists(journal_path):
+        return True, {"status": "ok", "reason": "journal_missing_or_empty"}
+
+    if os.path.getsize(journal_path) == 0:
+        return True, {"status": "ok", "reason": "journal_missing_or_empty"}
+
+    checkpoints = load_checkpoints(journal_path) if (resume or full) else []
+
+    if not full:
+        if not checkpoints:
+            return _verify_segment(journal_path)
+        cp = checkpoints[-1]
+        ok, details = _verify_segment(journal_path, cp["offset"], None, cp["hash"], cp["events"] + 1)
+        if ok:
+            details["resumed_from"] = cp["offset"]
+        return ok, details
+
+    starts = [(0, "GENESIS", 1)] + [(cp["offset"], cp["hash"], cp["events"] + 1) for cp in checkpoints]
+    ends = [cp["offset"] for cp in checkpoints] + [None]
+    args = (
+        [journal_path] * len(starts),
+        [s[0] for s in starts],
+        ends,
+        [s[1] for s in starts],
+        [s[2] for s in starts],
+    )
+    if workers > 1 and len(starts) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+            results = list(pool.map(_verify_segment, *args))
+    else:
+        results = list(map(_verify_segment, *args))
+
+    for i, (ok, details) in enumerate(results):
+        if not ok:
+            return False, details
+        if i < len(checkpoints) and (
+            details["last_hash"] != checkpoints[i]["hash"] or details["events"] != checkpoints[i]["events"]
+        ):
+            return False, {
+                "status": "error",
+                "reason": "checkpoint_mismatch",
+                "at_line": details["events"],
+                "checkpoint_offset": checkpoints[i]["offset"],
+            }
+    details = dict(results[-1][1])
+    details["segments"] = len(results)
+    return True, details
+
+
+def _replay_event(balances: Dict[str, float], raw: Dict[str, Any]) -> None:
+    def _add(account: str, delta: float) -> None:
+        balances[account] = float(balances.get(account, 0.0)) + float(delta)
+
+    et = str(raw.get("type", ""))
+    account = str(raw.get("account", ""))
+    to_account = str(raw.get("to_account", ""))
+    amount_str = raw.get("amount", "0")
+    try:
+        amount = float(amount_str)
+    except Exception:
+        amount = float(str(amount_str))
+
+    if to_account:
+        # Double-entry move
+        _add(account, -amount)
+        _add(to_account, +amount)
+    elif et == "credit":
+        _add(account, +amount)
+    elif et == "debit":
+        _add(account, -amount)
+    elif et == "charge":
+        _add(account, -amount)
+    elif et == "adjust":
+        _add(account, amount)
+    elif et == "reconcile":
+        pass
+    elif et == "transfer" and not to_account:
+        # Transfer without to_account is treated as a debit
+        _add(account, -amount)
+    else:
+        # Keep unknown types for extensibility but log or warn if needed
+        pass
+
+
 def replay(
     journal_path: str = DEFAULT_JOURNAL_PATH,
     *,
     initial_state: Optional[Dict[str, Any]] = None,
+    resume: bool = True,
 ) -> Dict[str, Any]:
     """
     Deterministically reconstruct ledger state from journal events.
+
+    Without initial_state, replay starts from the balances of the latest
+    trusted checkpoint (resume=False replays from GENESIS).
     """
     state = dict(initial_state) if initial_state else {}
     balances = state.setdefault("balances", {})
     state["total_events"] = 0
     state["last_event_ts"] = 0.0
 
-    def _add(account: str, delta: float) -> None:
-        balances[account] = float(balances.get(account, 0.0)) + float(delta)
+    offset = 0
+    checkpoints = load_checkpoints(journal_path) if resume and not initial_state else []
+    if checkpoints:
+        cp = checkpoints[-1]
+        balances.update(cp["balances"])
+        state["total_events"] = cp["events"]
+        state["last_event_ts"] = cp["ts"]
+        offset = cp["offset"]
 
-    for ev in read_events(journal_path):
+    for ev, _ in read_events_from(journal_path, offset):
         raw = ev.raw
-        et = str(raw.get("type", ""))
-        account = str(raw.get("account", ""))
-        to_account = str(raw.get("to_account", ""))
-        amount_str = raw.get("amount", "0")
-        try:
-            amount = float(amount_str)
-        except Exception:
-            amount = float(str(amount_str))
-
-        if to_account:
-            # Double-entry move
-            _add(account, -amount)
-            _add(to_account, +amount)
-        elif et == "credit":
-            _add(account, +amount)
-        elif et == "debit":
-            _add(account, -amount)
-        elif et == "charge":
-            _add(account, -amount)
-        elif et == "adjust":
-            _add(account, amount)
-        elif et == "reconcile":
-            pass
-        elif et == "transfer" and not to_account:
-            # Transfer without to_account is treated as a debit
-            _add(account, -amount)
-        else:
-            # Keep unknown types for extensibility but log or warn if needed
-            pass
-
+        _replay_event(balances, raw)
         state["total_events"] += 1
         state["last_event_ts"] = float(raw.get("ts", state["last_event_ts"]))
 
     return state
 
+
+# -----------------------
+# Checkpoints
+# -----------------------
+# Sidecar <journal>.checkpoints.jsonl. Each record holds the byte offset,
+# event count, chain hash and replayed balances (plus their digest) at that
+# point, and the job ids seen since the previous record. Records are
+# hash-chained like the journal, HMAC-signed if LEDGER_CHECKPOINT_KEY is set.
+CHECKPOINT_EVERY = int(os.getenv("LEDGER_CHECKPOINT_EVERY", "10000"))
+CHECKPOINT_KEY = os.getenv("LEDGER_CHECKPOINT_KEY", "")
+
+
+def checkpoint_path(journal_path: str = DEFAULT_JOURNAL_PATH) -> str:
+    return str(journal_path) + ".checkpoints.jsonl"
+
+
+def _record_hash(prev_record_hash: str, record_no_hash: Dict[str, Any]) -> str:
+    payload = canonical_json_bytes(record_no_hash) + prev_record_hash.encode("utf-8")
+    if CHECKPOINT_KEY:
+        return hmac.new(CHECKPOINT_KEY.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return sha256_hex(payload)
+
+
+def _balances_digest(balances: Dict[str, float]) -> str:
+    return sha256_hex(canonical_json_bytes(balances))
+
+
+def _read_checkpoints(journal_path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """(trusted records, total records in the sidecar)."""
+    path = checkpoint_path(journal_path)
+    if not os.path.exists(path) or not os.path.exists(journal_path):
+        return [], 0
+
+    size = os.path.getsize(journal_path)
+    trusted: List[Dict[str, Any]] = []
+    total = 0
+    prev = "GENESIS"
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            total += 1
+            if len(trusted) < total - 1:
+                continue  # only a contiguous prefix is trusted
+            try:
+                record = json.loads(line)
+                body = dict(record)
+                found = body.pop("record_hash", None)
+                if body.get("prev_record_hash") != prev or found != _record_hash(prev, body):
+                    continue
+                if body["balances_digest"] != _balances_digest(body["balances"]):
+                    continue
+                # The journal must still end on the recorded hash at the recorded offset
+                if body["offset"] > size or _read_last_hash_fast(journal_path, body["offset"]) != body["hash"]:
+                    continue
+            except (ValueError, KeyError, TypeError):
+                continue
+            trusted.append(record)
+            prev = found
+    return trusted, total
+
+
+def load_checkpoints(journal_path: str = DEFAULT_JOURNAL_PATH) -> List[Dict[str, Any]]:
+    """
+    Trusted checkpoints, oldest first: the prefix of the sidecar whose record
+    chain (or signature) and balances digest verify and whose chain hash
+    matches the journal at the recorded offset.
+    """
+    return _read_checkpoints(journal_path)[0]
+
+
+def write_checkpoints(journal_path: str = DEFAULT_JOURNAL_PATH, *, every: int = CHECKPOINT_EVERY) -> int:
+    """
+    Extend the sidecar: resume after the latest trusted checkpoint, verify and
+    replay the new events, and append a record every `every` events.
+    Untrusted records are dropped first. Nothing is checkpointed past a chain
+    break. Returns the number of records written.
+    """
+    every = max(1, every)
+    path = checkpoint_path(journal_path)
+    # One checkpoint writer at a time (the sidecar's own lock is taken per append)
+    with json_lock(str(journal_path) + ".checkpoints", timeout=10.0):
+        checkpoints, total = _read_checkpoints(journal_path)
+        if total > len(checkpoints):
+            print(f"[ledger_journal] Dropping {total - len(checkpoints)} untrusted checkpoint(s) from {path}")
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for record in checkpoints:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            os.replace(tmp, path)
+
+        last = checkpoints[-1] if checkpoints else None
+        offset = last["offset"] if last else 0
+        events = last["events"] if last else 0
+        head = last["hash"] if last else "GENESIS"
+        balances: Dict[str, float] = dict(last["balances"]) if last else {}
+        ts = last["ts"] if last else 0.0
+        prev_record = last["record_hash"] if last else "GENESIS"
+
+        job_ids: Set[str] = set()
+        since = 0
+        written = 0
+        for ev, end in read_events_from(journal_path, offset):
+            raw = ev.raw
+            if HASH_CHAIN_ENABLED and (
+                raw.get("prev_hash") != head or raw.get("hash") != _compute_hash(head, _strip_hash_fields(raw))
+            ):
+                print(f"[ledger_journal] Chain break after event {events}; not checkpointing past it")
+                break
+            head = raw.get("hash", head)
+            _replay_event(balances, raw)
+            events += 1
+            since += 1
+            ts = float(raw.get("ts", ts))
+            if raw.get("job_id"):
+                job_ids.add(str(raw["job_id"]))
+
+            if since >= every:
+                record: Dict[str, Any] = {
+                    "schema": "ledger_checkpoint.v1",
+                    "offset": end,
+                    "events": events,
+                    "hash": head,
+                    "ts": ts,
+                    "balances": balances,
+                    "balances_digest": _balances_digest(balances),
+                    "job_ids": sorted(job_ids),
+                    "created_at": _now_ts(),
+                    "prev_record_hash": prev_record,
+                }
+                record["record_hash"] = prev_record = _record_hash(prev_record, record)
+                atomic_append_jsonl(path, record, timeout=10.0)
+                job_ids = set()
+                since = 0
+                written += 1
+        return written
+
+
+def journal_job_ids(journal_path: str = DEFAULT_JOURNAL_PATH) -> Tuple[Set[str], int]:
+    """
+    (job ids of all events, event count), from the trusted checkpoints plus a
+    scan of the journal tail after the latest one.
+    """
+    job_ids: Set[str] = set()
+    offset = events = 0
+    for cp in load_checkpoints(journal_path):
+        job_ids.update(cp.get("job_ids", []))
+        offset, events = cp["offset"], cp["events"]
+    for ev, _ in read_events_from(journal_path, offset):
+        events += 1
+        jid = ev.raw.get("job_id")
+        if jid:
+            job_ids.add(str(jid))
+    return job_ids, events
+
+
 if __name__ == "__main__":
     import argparse
 
     p = argparse.ArgumentParser(description="Ledger Journal Tools (v1)")
-    p.add_argument("cmd", choices=["verify", "replay"])
+    p.add_argument("cmd", choices=["verify", "replay", "checkpoint"])
     p.add_argument("--journal", default=DEFAULT_JOURNAL_PATH)
     p.add_argument("--out", default="runtime/replayed_ledger.json")
+    p.add_argument("--full", action="store_true", help="verify from GENESIS instead of the latest checkpoint")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for --full")
+    p.add_argument("--every", type=int, default=CHECKPOINT_EVERY, help="events between checkpoints")
     args = p.parse_args()
 
     if args.cmd == "verify":
-        ok, details = verify_chain(args.journal)
+        ok, details = verify_chain(args.journal, full=args.full, workers=args.workers)
         # Use simple print for CLI
         print(json.dumps({"ok": ok, **details}, indent=2, ensure_ascii=False))
         import sys
         sys.exit(0 if ok else 2)
 
+    if args.cmd == "checkpoint":
+        written = write_checkpoints(args.journal, every=args.every)
+        print(f"Wrote {written} checkpoint(s) to {checkpoint_path(args.journal)}")
+
     if args.cmd == "replay":
         st = replay(args.journal)
         os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
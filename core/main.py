@@ -40,12 +40,12 @@ def normalize_trace_result(result):
     return r
 import asyncio
 from datetime import datetime, timezone
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Body, FastAPI, HTTPException, Request
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 import sys
 import os
 from pathlib import Path
@@ -65,14 +65,15 @@ if sys.stdout.encoding != 'utf-8':
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from core.database import get_db, init_db
+from core.database import get_db, init_db, get_pool_stats, close_all_connections
 from core import models
 from core import storage
 from core.webrelay_bridge import WebRelayBridge, WebRelaySettings
+from core.result_sync import ResultSyncQueue, ResultWatcher
 from core.lcp_actions import LCPActionInterpreter
 from core.job_chain_manager import JobChainManager
 from core.chain_runner import ChainRunner
-from core.metrics_client import record_module_call, measured_call
+from core.metrics_client import record_module_call, measured_call, get_emitter as get_metrics_emitter
 from core.rate_limiter import RateLimiter
 from core.performance_baseline import PerformanceBaselineTracker
 from core.self_diagnostics import SelfDiagnosticEngine, DiagnosticConfig
@@ -178,9 +179,9 @@ class SLOManager:
         self._running = True
         # Initialize baselines to avoid alert storm at startup
         self._last_integrity_failures = INTEGRITY_FAILURES_COUNTER
-        all_jobs = storage.list_jobs()
-        self._last_completed_count = len([j for j in all_jobs if j.status == "completed"])
-        self._last_job_count = len(all_jobs)
+        stats = storage.get_job_stats()
+        self._last_completed_count = stats["completed_total"]
+        self._last_job_count = stats["created_total"]
         self._last_completed_ts = time.time()
         
         print(f"[slo] Monitoring loop started (interval={self.check_interval_sec}s)")
@@ -192,8 +193,11 @@ class SLOManager:
             await asyncio.sleep(self.check_interval_sec)
 
     async def evaluate_slos(self):
+        # Counters from job_stats (trigger-maintained, O(1)) instead of scanning jobs
+        stats = storage.get_job_stats()
+
         # 1. Queue Depth
-        pending = storage.count_pending_jobs()
+        pending = stats["pending"]
         max_q = RobustnessConfig.MAX_QUEUE_DEPTH
         if pending >= max_q:
             _alert_log("SLO_QUEUE_CRITICAL", {"pending": pending, "max": max_q, "status": "SATURATED"})
@@ -201,7 +205,7 @@ class SLOManager:
             _alert_log("SLO_QUEUE_WARNING", {"pending": pending, "max": max_q, "status": "HIGH_LOAD"})
 
         # 2. Inflight Saturation
-        inflight = storage.count_inflight_jobs()
+        inflight = stats["inflight"]
         max_i = RobustnessConfig.MAX_INFLIGHT
         if inflight >= max_i:
             _alert_log("SLO_INFLIGHT_CRITICAL", {"inflight": inflight, "max": max_i})
@@ -216,8 +220,7 @@ class SLOManager:
             self._last_integrity_failures = INTEGRITY_FAILURES_COUNTER
 
         # 4. Stall Detection
-        all_jobs = storage.list_jobs()
-        completed_count = len([j for j in all_jobs if j.status == "completed"])
+        completed_count = stats["completed_total"]
         has_pending = pending > 0
         now = time.time()
         
@@ -233,10 +236,10 @@ class SLOManager:
             })
 
         # 5. Burst Detection
-        new_jobs = len(all_jobs) - self._last_job_count
+        new_jobs = stats["created_total"] - self._last_job_count
         if new_jobs > 50: # Scale based on your needs
              _alert_log("SLO_BURST_DETECTED", {"count": new_jobs, "interval_sec": self.check_interval_sec})
-        self._last_job_count = len(all_jobs)
+        self._last_job_count = stats["created_total"]
 
         # 6. Update Health Summary (Internal)
         self.active_violations = []
@@ -255,12 +258,28 @@ class Dispatcher:
         self.bridge = bridge
         self.lcp = lcp
         self._running = False
+        # Result sync: completion notifications + periodic reconciliation sweep
+        self.sync_queue = ResultSyncQueue()
+        self.result_watcher = ResultWatcher(
+            bridge.transport, self.sync_queue, interval_sec=RobustnessConfig.SYNC_WATCH_INTERVAL_SEC
+        )
+        self._last_reconcile_ts = 0.0  # first tick sweeps (results left from a previous run)
+        self._requeue_attempts: Dict[str, int] = {}  # job_id -> ticks retried while 'pending'
+        self.sync_stats = {
+            "ticks": 0, "events": 0, "synced": 0, "requeued": 0, "requeue_dropped": 0,
+            "reconcile_sweeps": 0, "reconcile_checked": 0, "reconcile_synced": 0,
+            "last_tick_cpu_ms": 0.0, "max_tick_cpu_ms": 0.0, "total_cpu_ms": 0.0,
+        }
 
     def start(self):
         if getattr(self, "_running", False):
             print("[dispatcher] start() called but already running")
             return
         self._running = True
+        try:
+            self.result_watcher.start()
+        except Exception as e:
+            print(f"[dispatcher] Result watcher unavailable, relying on reconciliation sweep: {e}")
         import threading
         self._thread = threading.Thread(target=self._run_loop, name="dispatcher", daemon=True)
         self._thread.start()
@@ -296,6 +315,7 @@ class Dispatcher:
             traceback.print_exc()
     def stop(self):
         self._running = False
+        self.result_watcher.stop()
         print("[dispatcher] stop signal sent")
     
     def is_running(self) -> bool:
@@ -314,14 +334,14 @@ class Dispatcher:
         if reaped > 0:
              print(f"[dispatcher] [REAP] Reaped {reaped} expired leases before dispatch.")
 
-        # 1. Get Pending Jobs
-        all_jobs = storage.list_jobs()
-        pending = [j for j in all_jobs if j.status == "pending"]
-        if not pending:
+        # 1. Get Pending Jobs (job_stats counters, no table scan)
+        job_stats = storage.get_job_stats()
+        pending_count = job_stats["pending"]
+        if pending_count == 0:
             return
 
         # 1.5 Backpressure Gate (Inflight)
-        inflight_count = storage.count_inflight_jobs()
+        inflight_count = job_stats["inflight"]
         if inflight_count >= RobustnessConfig.MAX_INFLIGHT:
             print(f"[dispatcher] [WARN] Inflight saturated ({inflight_count}/{RobustnessConfig.MAX_INFLIGHT}). Deferring dispatch.")
             # Rate limit audit events to avoid spam
@@ -331,44 +351,37 @@ class Dispatcher:
                 self._last_saturated_audit = now
             return
         
-        print(f"[dispatcher] _dispatch_step: {len(pending)} pending jobs found")
+        print(f"[dispatcher] _dispatch_step: {pending_count} pending jobs found")
 
-        # 2. Get completed job IDs for dependency checking
-        completed_ids = {j.id for j in all_jobs if j.status == "completed"}
-
-        # 3. Filter Dependencies
-        ready = []
-        for j in pending:
-            # Dependencies
-            if not j.depends_on or all(dep_id in completed_ids for dep_id in j.depends_on):
-                ready.append(j)
-        
+        # 2. Ready-Queue: dependency filter, retry eligibility and priority order
+        #    (critical=0, high=1, normal=2, then created_at) are resolved in SQL.
+        ready = storage.list_ready_jobs(limit=RobustnessConfig.DISPATCH_BATCH_SIZE)
         if not ready:
-            print(f"[dispatcher] No jobs ready after dependency filter (all {len(pending)} have unmet dependencies)")
+            print(f"[dispatcher] No jobs ready after dependency filter (all {pending_count} have unmet dependencies or pending retries)")
             return
-
-        # 4. Sort by Priority
-        # priority_map: critical=0, high=1, normal=2
-        priority_map = {"critical": 0, "high": 1, "normal": 2}
-        ready.sort(key=lambda j: (priority_map.get(j.priority, 2), j.created_at))
         
         print(f"[dispatcher] {len(ready)} jobs ready for dispatch")
 
-        # 4. Filter Rate Limits
+        # 4. Filter Rate Limits: one atomic token-bucket decision for the whole batch
         # For now, we use a single 'system' source or per-mission-owner
+        source = "default_user" # TODO: Get from mission/task
+        admitted = rate_limiter.try_acquire(source, len(ready), partial=True)
         dispatched_count = 0
-        for job in ready:
-            source = "default_user" # TODO: Get from mission/task
-            if rate_limiter.check_limit(source):
+        for position, job in enumerate(ready):
+            if position < admitted:
                 try:
                     # Phase 1: Try to write the job file/mesh-select
                     self.bridge.enqueue_job(job.id)
                     
-                    # Phase 2: Only if successful, move status to working
-                    print(f"[dispatcher] [DISPATCH] Dispatched job {job.id[:8]} (priority={job.priority})")
+                    # Phase 2: Only if successful, move status to working.
+                    # Status-only compare-and-set: enqueue_job already persisted the
+                    # payload (mesh/mcts_trace); a full update_job here would overwrite it.
                     job.status = "working"
                     job.updated_at = datetime.utcnow().isoformat() + "Z"
-                    storage.update_job(job)
+                    if not storage.update_job_fields(job.id, expected_status="pending", status="working", updated_at=job.updated_at):
+                        print(f"[dispatcher] [SKIP] Job {job.id[:8]} left 'pending' concurrently, not marking working")
+                        continue
+                    print(f"[dispatcher] [DISPATCH] Dispatched job {job.id[:8]} (priority={job.priority})")
                     dispatched_count += 1
                     
                     # Phase 3: Log general decision trace (always, not just MCTS)
@@ -404,10 +417,13 @@ class Dispatcher:
                 except ValueError as ve:
                     # Orphaned job (missing task/mission) - mark as failed
                     print(f"[dispatcher] [WARN] Orphaned job {job.id[:8]}: {ve}")
-                    job.status = "failed"
-                    job.result = {"ok": False, "error": f"Orphaned job: {str(ve)}"}
-                    job.updated_at = datetime.utcnow().isoformat() + "Z"
-                    storage.update_job(job)
+                    storage.update_job_fields(
+                        job.id,
+                        expected_status="pending",
+                        status="failed",
+                        result={"ok": False, "error": f"Orphaned job: {str(ve)}"},
+                        updated_at=datetime.utcnow().isoformat() + "Z",
+                    )
                 except Exception as e:
                     print(f"[dispatcher] [FAIL] FAILED to dispatch job {job.id[:8]}: {e}")
                     # Job remains in 'pending', will be retried next loop unless fixed
@@ -415,60 +431,126 @@ class Dispatcher:
                 # Stop dispatching this batch if source is limited
                 print(f"[dispatcher] Rate limit hit for {source}, stopping dispatch")
                 break
+
+        # Tokens only count jobs that actually went out
+        rate_limiter.release(source, admitted - dispatched_count)
         
         if dispatched_count == 0:
             print(f"[dispatcher] No jobs dispatched (rate limited or other issue)")
 
     def _sync_step(self):
-        # Check all 'working' jobs for results
-        working = [j for j in storage.list_jobs() if j.status in ["working", "running"]]
-        for job in working:
-            synced = self.bridge.try_sync_result(job.id)
-            if synced:
-                if synced.status == "failed":
-                    # --- STANDARDIZED RETRY POLICY (B1) ---
-                    max_retries = RobustnessConfig.RETRY_MAX_ATTEMPTS
-                    if synced.retry_count < max_retries:
-                        synced.retry_count += 1
-                        synced.status = "pending"
-                        
-                        # Exponential Backoff: base * (2 ^ (attempts-1))
-                        # e.g. 500ms, 1000ms, 2000ms, 4000ms, 8000ms
-                        delay_ms = RobustnessConfig.RETRY_BASE_DELAY_MS * (2 ** (synced.retry_count - 1))
-                        from datetime import timedelta
-                        next_retry = datetime.utcnow() + timedelta(milliseconds=delay_ms)
-                        synced.next_retry_utc = next_retry.isoformat() + "Z"
-                        
-                        synced.updated_at = datetime.utcnow().isoformat() + "Z"
-                        storage.update_job(synced)
-                        
-                        _audit_log("RETRY_SCHEDULED", {"job_id": synced.id, "attempts": synced.retry_count, "next_retry": synced.next_retry_utc})
-                        print(f"[dispatcher] [RETRY] Job {job.id[:8]} failed. Scheduled for retry {synced.retry_count}/{max_retries} at {synced.next_retry_utc}")
-                        continue
-                    else:
-                        _audit_log("RETRY_EXHAUSTED", {"job_id": synced.id, "attempts": synced.retry_count})
-                        print(f"[dispatcher] [FAIL] Job {job.id[:8]} failed after {max_retries} attempts.")
-                
-                # Final result (success or max failure)
-                print(f"[dispatcher] ✓ Job {job.id[:8]} finished with status: {synced.status}")
-                
-                # --- IDEMPOTENCY COMPLETION HOOK (B2) ---
-                if synced.status == "completed" and synced.idempotency_key:
-                    # Track B3: Compute Hash
-                    result_obj = {
-                        "ok": True,
-                        "status": "completed",
-                        "result_id": synced.id # or specific result identifier if available
-                    }
-                    res_hash = compute_result_hash(result_obj)
-                    storage.cache_completed_result(synced.id, result_obj, result_hash=res_hash, result_hash_alg="sha256")
+        """
+        Event-driven result sync: drain completion notifications (sync endpoint,
+        result watcher) and only sweep all working jobs every SYNC_RECONCILE_SEC.
+        """
+        cpu_start = time.thread_time()
+        stats = self.sync_stats
+        event_ids = self.sync_queue.drain()
+        synced_count = 0
+        for job_id in event_ids:
+            job = storage.get_job(job_id)
+            if job is not None and job.status == "pending":
+                # Result arrived before the dispatch committed 'working': retry
+                # next tick, a bounded number of times (a job blocked on
+                # dependencies or rate limits is left to the reconciliation sweep)
+                attempts = self._requeue_attempts.pop(job_id, 0) + 1
+                if attempts > RobustnessConfig.SYNC_REQUEUE_MAX:
+                    stats["requeue_dropped"] += 1
+                elif self.sync_queue.notify(job_id, source="requeue"):
+                    self._requeue_attempts[job_id] = attempts
+                    stats["requeued"] += 1
+                continue
+            self._requeue_attempts.pop(job_id, None)
+            if job is None or job.status not in ("working", "running"):
+                continue
+            synced_count += self._sync_job(job)
+
+        now = time.time()
+        if now - self._last_reconcile_ts >= RobustnessConfig.SYNC_RECONCILE_SEC:
+            self._last_reconcile_ts = now
+            # Reconciliation: catches results whose notification was lost
+            working = storage.list_jobs_by_status(["working", "running"])
+            reconciled = sum(self._sync_job(job) for job in working)
+            stats["reconcile_sweeps"] += 1
+            stats["reconcile_checked"] += len(working)
+            stats["reconcile_synced"] += reconciled
+            if reconciled:
+                print(f"[dispatcher] [SYNC] Reconciliation picked up {reconciled} result(s) without a notification")
+            synced_count += reconciled
+
+        cpu_ms = (time.thread_time() - cpu_start) * 1000.0
+        stats["ticks"] += 1
+        stats["events"] += len(event_ids)
+        stats["synced"] += synced_count
+        stats["last_tick_cpu_ms"] = round(cpu_ms, 3)
+        stats["max_tick_cpu_ms"] = round(max(stats["max_tick_cpu_ms"], cpu_ms), 3)
+        stats["total_cpu_ms"] += cpu_ms
+
+    def get_sync_metrics(self) -> dict:
+        stats = dict(self.sync_stats)
+        stats["avg_tick_cpu_ms"] = round(stats["total_cpu_ms"] / stats["ticks"], 3) if stats["ticks"] else 0.0
+        stats["total_cpu_ms"] = round(stats["total_cpu_ms"], 3)
+        stats["queue"] = self.sync_queue.snapshot()
+        stats["watcher_mode"] = self.result_watcher.mode
+        return stats
+
+    def _sync_job(self, job: models.Job) -> int:
+        """Pick up and apply one job's result; returns 1 if a result was synced."""
+        synced = self.bridge.try_sync_result(job.id)
+        if synced:
+            if synced.status == "failed":
+                # --- STANDARDIZED RETRY POLICY (B1) ---
+                max_retries = RobustnessConfig.RETRY_MAX_ATTEMPTS
+                if synced.retry_count < max_retries:
+                    synced.retry_count += 1
+                    synced.status = "pending"
+                    
+                    # Exponential Backoff: base * (2 ^ (attempts-1))
+                    # e.g. 500ms, 1000ms, 2000ms, 4000ms, 8000ms
+                    delay_ms = RobustnessConfig.RETRY_BASE_DELAY_MS * (2 ** (synced.retry_count - 1))
+                    from datetime import timedelta
+                    next_retry = datetime.utcnow() + timedelta(milliseconds=delay_ms)
+                    synced.next_retry_utc = next_retry.isoformat() + "Z"
                     
-                    # Update audit/metrics (B3)
-                    global HASH_WRITES_COUNTER
-                    HASH_WRITES_COUNTER += 1
-                    _audit_log("RESULT_HASH_COMPUTED", {"job_id": synced.id, "hash_prefix": res_hash[:12]})
+                    synced.updated_at = datetime.utcnow().isoformat() + "Z"
+                    storage.update_job_fields(
+                        synced.id,
+                        expected_status="failed",
+                        status="pending",
+                        retry_count=synced.retry_count,
+                        next_retry_utc=synced.next_retry_utc,
+                        updated_at=synced.updated_at,
+                    )
+                    
+                    _audit_log("RETRY_SCHEDULED", {"job_id": synced.id, "attempts": synced.retry_count, "next_retry": synced.next_retry_utc})
+                    print(f"[dispatcher] [RETRY] Job {job.id[:8]} failed. Scheduled for retry {synced.retry_count}/{max_retries} at {synced.next_retry_utc}")
+                    return 1
+                else:
+                    _audit_log("RETRY_EXHAUSTED", {"job_id": synced.id, "attempts": synced.retry_count})
+                    print(f"[dispatcher] [FAIL] Job {job.id[:8]} failed after {max_retries} attempts.")
+            
+            # Final result (success or max failure)
+            print(f"[dispatcher] ✓ Job {job.id[:8]} finished with status: {synced.status}")
+            
+            # --- IDEMPOTENCY COMPLETION HOOK (B2) ---
+            if synced.status == "completed" and synced.idempotency_key:
+                # Track B3: Compute Hash
+                result_obj = {
+                    "ok": True,
+                    "status": "completed",
+                    "result_id": synced.id # or specific result identifier if available
+                }
+                res_hash = compute_result_hash(result_obj)
+                storage.cache_completed_result(synced.id, result_obj, result_hash=res_hash, result_hash_alg="sha256")
                 
-                _handle_lcp_followup(synced)
+                # Update audit/metrics (B3)
+                global HASH_WRITES_COUNTER
+                HASH_WRITES_COUNTER += 1
+                _audit_log("RESULT_HASH_COMPUTED", {"job_id": synced.id, "hash_prefix": res_hash[:12]})
+            
+            _handle_lcp_followup(synced)
+            return 1
+        return 0
 
 
 # --- PHASE A: State Machine ---
@@ -620,6 +702,12 @@ async def lifespan(app: FastAPI):
         actor="system"
     )
 
+    from core.decision_trace import trace_logger
+    trace_logger.close()
+    get_metrics_emitter().flush(timeout=2.0)
+    rate_limiter.flush()
+    close_all_connections()
+
 # ------------------------------------------------------------------------------
 # APP INITIALISIERUNG
 # ------------------------------------------------------------------------------
@@ -721,7 +809,7 @@ lcp = LCPActionInterpreter(bridge=bridge)
 
 # Phase 9: Initialize JobChainManager for LCP Job Chaining
 from core.chain_index import ChainIndex
-chain_index_path = storage.DATA_DIR / "chain_index.json"
+chain_index_path = storage.DATA_DIR / "chain_index.db"  # legacy chain_index.json is migrated on open
 chain_dir = storage.DATA_DIR / "chains"
 chain_index = ChainIndex(str(chain_index_path))
 chain_manager = JobChainManager(
@@ -1053,8 +1141,9 @@ async def sync_job(job_id: str, request: Request):
         # No valid JSON body, ignore
         pass
 
-    # 1) Try bridge first
+    # 1) Try bridge first (persists status/result itself)
     job = bridge.try_sync_result(job_id)
+    needs_persist = False
     
     # 2) Fallback to payload if bridge has no result
     if job is None and payload:
@@ -1063,10 +1152,13 @@ async def sync_job(job_id: str, request: Request):
             if "status" in payload: job.status = payload["status"]
             if "result" in payload: job.result = payload["result"]
             job.updated_at = datetime.utcnow().isoformat() + "Z"
-            # We don't call storage.update_job yet, because the main logic below does it
+            # We don't call storage.update_job_fields yet, because the main logic below does it
+            needs_persist = True
     
     if job is None:
-        # Worker hat noch nichts geliefert - return current job status instead of 404
+        # Worker hat noch nichts geliefert - queue the id so the dispatcher picks
+        # the result up as soon as it lands (no need to wait for a sweep)
+        dispatcher.sync_queue.notify(job_id, source="sync_endpoint")
         current_job = storage.get_job(job_id)
         if current_job is None:
             # Job not in storage
@@ -1091,6 +1183,8 @@ async def sync_job(job_id: str, request: Request):
         created = datetime.fromisoformat(job.created_at.replace("Z", ""))
         now = datetime.utcnow()
         worker_latency_ms = (now - created).total_seconds() * 1000.0
+        # Per-job samples: percentiles of the tick averages would understate the tail
+        baseline_tracker.update("job_latency_ms", worker_latency_ms)
     except Exception:
         # Wenn irgendwas schiefgeht, ist das nur Monitoring – Core läuft weiter
         pass
@@ -1148,14 +1242,21 @@ async def sync_job(job_id: str, request: Request):
             cost = metrics.get("cost", job.payload.get("mesh", {}).get("cost", 0))
             tokens = metrics.get("tokens", 0)
             risk = metrics.get("risk", 0.0)
-            
+
+            # Rolling latency baseline once there is enough history; fixed defaults until then
+            latency_baseline = {}
+            latency_pct = baseline_tracker.get_percentiles("job_latency_ms", "24h", min_count=20)
+            if latency_pct:
+                latency_baseline = {"latency_p50": latency_pct[0], "latency_p95": latency_pct[1]}
+
             score_bd = compute_score_v1(
                 success=success,
                 quality=quality,
                 reliability=reliability,
                 latency_ms=latency_ms,
                 cost=cost,
-                risk=risk
+                risk=risk,
+                **latency_baseline,
             )
             
             # 2. Update Policy
@@ -1220,7 +1321,10 @@ async def sync_job(job_id: str, request: Request):
         job.result_hash = res_hash
         job.result_hash_alg = "sha256"
         
-    storage.update_job(job)
+    # Partial write: a full update_job here would clobber completed_result
+    # written by cache_completed_result above.
+    if needs_persist:
+        storage.update_job_fields(job.id, status=job.status, result=job.result, updated_at=job.updated_at)
         
     _handle_lcp_followup(job)
 
@@ -1571,11 +1675,15 @@ def list_project_files(project_id: str):
 
 
 @app.post("/metrics/module-calls")
-def post_module_metrics(payload: dict):
-    """Telemetry endpoint for internal module calls (fire-and-forget)."""
-    # For now just log to terminal if needed, or just return 200
-    # print(f"[metrics] {payload.get('source')} -> {payload.get('target')} ({payload.get('duration_ms')}ms)")
-    return {"ok": True}
+def post_module_metrics(payload: Union[List[Dict[str, Any]], Dict[str, Any]] = Body(...)):
+    """
+    Telemetry endpoint for internal module calls (fire-and-forget).
+    Accepts one event or a batch (list) from metrics_client.MetricsEmitter;
+    batch entries are raw events or {"type": "histogram", ...} aggregates.
+    """
+    events = payload if isinstance(payload, list) else [payload]
+    calls = sum(int(e.get("count", 1)) if e.get("type") == "histogram" else 1 for e in events)
+    return {"ok": True, "received": len(events), "calls": calls}
 
 @app.get("/api/system/baselines")
 def get_performance_baselines():
@@ -1790,6 +1898,7 @@ async def get_system_metrics():
     metrics = health_manager.get_system_metrics()
     
     from core.gateway_middleware import get_gateway_stats
+    from core.decision_trace import trace_logger
     gw = get_gateway_stats()
     
     # Calculate error rate (internal legacy measure)
@@ -1818,6 +1927,12 @@ async def get_system_metrics():
             "max": RobustnessConfig.MAX_QUEUE_DEPTH,
             "max_inflight": RobustnessConfig.MAX_INFLIGHT
         },
+        "jobs": {
+            "by_status": metrics["storage"]["jobs_by_status"],
+            "created_total": metrics["storage"]["jobs_created_total"],
+            "completed_total": metrics["storage"]["jobs_completed_total"],
+            "last_completed_utc": metrics["storage"]["last_completed_utc"]
+        },
         "idempotency": {
             "hits": IDEMPOTENT_HITS_COUNTER,
             "collisions": IDEMPOTENCY_COLLISIONS_COUNTER
@@ -1828,6 +1943,11 @@ async def get_system_metrics():
             "migrations": HASH_MIGRATIONS_COUNTER
         },
         "gateway": gw.get("stats", {}),
+        "db_pool": get_pool_stats(),
+        "result_sync": dispatcher.get_sync_metrics(),
+        "decision_trace": trace_logger.get_stats(),
+        "metrics_emitter": get_metrics_emitter().get_stats(),
+        "rate_limiter": rate_limiter.get_stats(),
         "config": {
             "backpressure_mode": RobustnessConfig.BACKPRESSURE_MODE
         }
@@ -1,8 +1,14 @@
+import atexit
 import json
 import math
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
+from core.config import PolicyConfig
+from core.utils.atomic_io import atomic_write_json
+
 def ucb_light_select_score(
     *,
     mean_score: float,
@@ -21,25 +27,117 @@ def ucb_light_select_score(
     return float(mean_score) + explore - float(risk_penalty)
 
 class MCTSLight:
-    def __init__(self, priors_path: str = "policies/priors.json", c: float = 0.5):
+    """
+    UCB-Light policy over priors kept in memory.
+
+    - Parent visits per intent are maintained incrementally (O(1) lookup)
+    - update_policy only mutates memory; a write-behind flusher persists
+      priors via atomic_write_json once flush_every updates are pending or
+      flush_interval_sec after the first unflushed update
+    - A crash loses at most the updates of one flush window
+    """
+
+    def __init__(
+        self,
+        priors_path: str = "policies/priors.json",
+        c: float = 0.5,
+        flush_every: int = PolicyConfig.PRIORS_FLUSH_EVERY,
+        flush_interval_sec: float = PolicyConfig.PRIORS_FLUSH_INTERVAL_SEC,
+    ):
         self.priors_path = Path(priors_path)
         self.c = c
+        self.flush_every = max(1, flush_every)
+        self.flush_interval_sec = flush_interval_sec
+        self._lock = threading.Condition(threading.RLock())
+        self._write_lock = threading.Lock()
         self.data = self._load()
+        self._parent_visits: Dict[str, int] = {
+            intent: sum(a.get("visits", 0) for a in actions.values())
+            for intent, actions in self.data.items()
+            if isinstance(actions, dict)
+        }
+        self._pending = 0
+        self._first_pending_ts = 0.0
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"updates": 0, "flushes": 0, "flush_errors": 0, "last_flush_ms": 0.0}
 
     def _load(self) -> Dict[str, Any]:
-        if not self.priors_path.exists():
-            return {"schema_version": "priors_v1"}
-        with open(self.priors_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # .bak is the previous good copy written by atomic_write_json
+        for path in (self.priors_path, Path(str(self.priors_path) + ".bak")):
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"[mcts] Warning: could not load priors from {path}: {e}")
+        return {"schema_version": "priors_v1"}
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Copy of the priors safe to serialize outside the lock."""
+        out: Dict[str, Any] = {}
+        for intent, actions in self.data.items():
+            if isinstance(actions, dict):
+                out[intent] = {
+                    key: {**prior, "last_scores": list(prior.get("last_scores", []))}
+                    for key, prior in actions.items()
+                }
+            else:
+                out[intent] = actions
+        return out
 
     def _save(self):
-        self.priors_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.priors_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        # _write_lock keeps snapshots landing on disk in the order they were taken
+        with self._write_lock:
+            with self._lock:
+                snapshot = self._snapshot()
+                self._pending = 0
+            start = time.perf_counter()
+            atomic_write_json(str(self.priors_path), snapshot)
+            self.stats["flushes"] += 1
+            self.stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+
+    def flush(self) -> None:
+        """Persist pending updates now (no-op when nothing is pending)."""
+        with self._lock:
+            if not self._pending:
+                return
+        self._save()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join(timeout=5)
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._pending >= self.flush_every:
+                        break
+                    if self._pending:
+                        remaining = self._first_pending_ts + self.flush_interval_sec - time.time()
+                        if remaining <= 0:
+                            break
+                        self._lock.wait(remaining)
+                    else:
+                        self._lock.wait()
+                if self._closed:
+                    return
+            try:
+                self._save()
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                print(f"[mcts] Warning: priors flush failed: {e}")
+                time.sleep(self.flush_interval_sec)
 
     def get_parent_visits(self, intent: str) -> int:
-        intent_data = self.data.get(intent, {})
-        return sum(a.get("visits", 0) for a in intent_data.values())
+        return self._parent_visits.get(intent, 0)
 
     def select_action(self, intent: str, candidates: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
@@ -92,33 +190,51 @@ class MCTSLight:
         return chosen, scored_candidates
 
     def update_policy(self, intent: str, action_key: str, score: float):
-        if intent not in self.data:
-            self.data[intent] = {}
-        
-        prior = self.data[intent].get(action_key, {
-            "visits": 0,
-            "mean_score": 0.0,
-            "last_scores": [],
-            "risk_gate": True
-        })
-        
-        n = prior["visits"]
-        old_mean = prior["mean_score"]
-        
-        new_n = n + 1
-        new_mean = (old_mean * n + score) / new_n
-        
-        prior["visits"] = new_n
-        prior["mean_score"] = round(new_mean, 4)
-        
-        if "last_scores" not in prior:
-            prior["last_scores"] = []
-        prior["last_scores"].append(round(score, 4))
-        if len(prior["last_scores"]) > 20:
-            prior["last_scores"].pop(0)
+        with self._lock:
+            if intent not in self.data:
+                self.data[intent] = {}
             
-        self.data[intent][action_key] = prior
-        self._save()
+            prior = self.data[intent].get(action_key, {
+                "visits": 0,
+                "mean_score": 0.0,
+                "last_scores": [],
+                "risk_gate": True
+            })
+            
+            n = prior["visits"]
+            old_mean = prior["mean_score"]
+            
+            new_n = n + 1
+            new_mean = (old_mean * n + score) / new_n
+            
+            prior["visits"] = new_n
+            prior["mean_score"] = round(new_mean, 4)
+            
+            if "last_scores" not in prior:
+                prior["last_scores"] = []
+            prior["last_scores"].append(round(score, 4))
+            if len(prior["last_scores"]) > 20:
+                prior["last_scores"].pop(0)
+                
+            self.data[intent][action_key] = prior
+            self._parent_visits[intent] = self._parent_visits.get(intent, 0) + 1
+            self.stats["updates"] += 1
+
+            # Write-behind: the flusher thread persists coalesced updates
+            if not self._pending:
+                self._first_pending_ts = time.time()
+            self._pending += 1
+            save_now = self._closed
+            if not save_now:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="mcts-priors-flusher", daemon=True)
+                    self._flusher.start()
+                if self._pending == 1 or self._pending >= self.flush_every:
+                    self._lock.notify_all()
+        if save_now:
+            # After close(): no flusher left, persist synchronously
+            self._save()
 
 # Global mcts instance
 mcts = MCTSLight()
+atexit.register(mcts.close)
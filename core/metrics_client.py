@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 import time
+from bisect import bisect_left
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+from core.config import MetricsConfig
+
 # Kannst du in deiner docker-compose / .env setzen:
 # SHERATAN_METRICS_URL=http://backend:8000/metrics/module-calls
 METRICS_URL = os.getenv(
@@ -15,7 +21,175 @@ METRICS_URL = os.getenv(
 )
 
 
-import threading
+def _resolve_url(url: str) -> str:
+    # Use 127.0.0.1 instead of backend to avoid DNS issues if not configured
+    if "backend:8000" in url:
+        url = url.replace("backend:8000", "127.0.0.1:8001")
+    return url
+
+
+class MetricsEmitter:
+    """
+    In-process metrics pipeline for module-call events.
+
+    - Bounded queue: emit() never blocks; events arriving while it is full
+      are dropped and counted
+    - One background sender with a keep-alive requests.Session
+    - Batched POSTs: one JSON list per BATCH_SIZE events or FLUSH_INTERVAL_MS
+    - Optional pre-aggregation: calls without a correlation_id are folded into
+      one histogram record per (source, target, status) per batch
+    """
+
+    def __init__(
+        self,
+        url: str = METRICS_URL,
+        queue_size: int = MetricsConfig.QUEUE_SIZE,
+        batch_size: int = MetricsConfig.BATCH_SIZE,
+        flush_interval_ms: int = MetricsConfig.FLUSH_INTERVAL_MS,
+        timeout_sec: float = MetricsConfig.TIMEOUT_SEC,
+        aggregate: bool = MetricsConfig.AGGREGATE,
+        buckets_ms: Optional[List[float]] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        self.url = _resolve_url(url)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_sec = flush_interval_ms / 1000.0
+        self.timeout_sec = timeout_sec
+        self.aggregate = aggregate
+        self.buckets_ms = MetricsConfig.histogram_buckets() if buckets_ms is None else sorted(buckets_ms)
+        self.session = session or requests.Session()
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._sender: Optional[threading.Thread] = None
+        self._sending = False
+        self._closed = False
+        self.stats = {
+            "accepted": 0, "dropped": 0, "sent_events": 0, "sent_records": 0,
+            "batches": 0, "failed_batches": 0, "failed_events": 0, "max_depth": 0,
+        }
+
+    def emit(self, event: Dict[str, Any]) -> bool:
+        """Queue one event; False if it was dropped (queue full or emitter closed)."""
+        with self._cond:
+            if self._closed or len(self._queue) >= self.queue_size:
+                self.stats["dropped"] += 1
+                return False
+            self._queue.append(event)
+            self.stats["accepted"] += 1
+            depth = len(self._queue)
+            if depth > self.stats["max_depth"]:
+                self.stats["max_depth"] = depth
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._sender_loop, name="metrics-sender", daemon=True)
+                self._sender.start()
+            if depth >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def _sender_loop(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._queue) < self.batch_size and not self._closed:
+                    self._cond.wait(self.flush_interval_sec)
+                if self._closed and not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                self._sending = bool(batch)
+            if batch:
+                self._send(batch)
+                with self._cond:
+                    self._sending = False
+                    self._cond.notify_all()
+
+    def build_payload(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Raw events, or histograms per (source, target, status) plus correlated raw events."""
+        if not self.aggregate:
+            return batch
+        records: List[Dict[str, Any]] = []
+        histograms: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for event in batch:
+            if event.get("correlation_id"):
+                records.append(event)
+                continue
+            key = (event["source"], event["target"], event["status"])
+            duration = event["duration_ms"]
+            hist = histograms.get(key)
+            if hist is None:
+                hist = histograms[key] = {
+                    "type": "histogram", "source": key[0], "target": key[1], "status": key[2],
+                    "count": 0, "sum_ms": 0.0, "min_ms": duration, "max_ms": duration,
+                    "buckets_ms": self.buckets_ms,
+                    # bucket_counts[i]: duration <= buckets_ms[i]; last entry is the overflow
+                    "bucket_counts": [0] * (len(self.buckets_ms) + 1),
+                }
+                records.append(hist)
+            hist["count"] += 1
+            hist["sum_ms"] += duration
+            hist["min_ms"] = min(hist["min_ms"], duration)
+            hist["max_ms"] = max(hist["max_ms"], duration)
+            hist["bucket_counts"][bisect_left(self.buckets_ms, duration)] += 1
+        return records
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        payload = self.build_payload(batch)
+        try:
+            # Fire-and-forget, Monitoring darf niemals den Core blockieren
+            resp = self.session.post(self.url, json=payload, timeout=self.timeout_sec)
+            resp.raise_for_status()
+            ok = True
+        except Exception:
+            ok = False
+        with self._cond:
+            if ok:
+                self.stats["batches"] += 1
+                self.stats["sent_events"] += len(batch)
+                self.stats["sent_records"] += len(payload)
+            else:
+                self.stats["failed_batches"] += 1
+                self.stats["failed_events"] += len(batch)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been sent (or failed). False on timeout."""
+        with self._cond:
+            if self._sender is None:
+                return not self._queue
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._queue and not self._sending, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Send what is queued and stop the sender; later events are dropped."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            sender = self._sender
+        if sender is not None:
+            sender.join(timeout)
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["queue_depth"] = len(self._queue)
+        stats["aggregate"] = self.aggregate
+        return stats
+
+
+_emitter: Optional[MetricsEmitter] = None
+_emitter_lock = threading.Lock()
+
+
+def get_emitter() -> MetricsEmitter:
+    """Process-wide emitter, created (and registered for shutdown) on first use."""
+    global _emitter
+    if _emitter is None:
+        with _emitter_lock:
+            if _emitter is None:
+                _emitter = MetricsEmitter()
+                atexit.register(_emitter.close)
+    return _emitter
+
 
 def record_module_call(
     source: str,
@@ -26,7 +200,7 @@ def record_module_call(
 ) -> None:
     """
     Sendet ein Modulaufruf-Event an das Metrics-Backend.
-    Fire-and-forget, blockiert niemals den Core.
+    Fire-and-forget, blockiert niemals den Core (Queue + Batch-Sender).
     """
     payload = {
         "source": source,
@@ -37,21 +211,7 @@ def record_module_call(
     if correlation_id:
         payload["correlation_id"] = correlation_id
 
-    def _send():
-        try:
-            # Fire-and-forget, Monitoring darf niemals den Core blockieren
-            # Use 127.0.0.1 instead of backend to avoid DNS issues if not configured
-            url = METRICS_URL
-            if "backend:8000" in url:
-                url = url.replace("backend:8000", "127.0.0.1:8001")
-            
-            requests.post(url, json=payload, timeout=0.5)
-        except Exception:
-            pass
-
-    # Truly fire-and-forget by using a thread
-    thread = threading.Thread(target=_send, daemon=True)
-    thread.start()
+    get_emitter().emit(payload)
 
 
 @contextmanager
@@ -63,7 +223,7 @@ def measured_call(
     """
     Kontext-Manager, der Dauer und Status eines Modulaufrufs misst
     und automatisch an das Metrics-Backend schickt.
-    
+
     Usage:
         with measured_call("core_v2.api", "lcp_actions"):
             # your code here
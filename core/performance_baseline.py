@@ -6,7 +6,7 @@ import math
 import os
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -27,19 +27,139 @@ DEFAULT_WINDOWS: List[WindowSpec] = [
 DEFAULT_METRICS: List[str] = [
     "job_success_rate",        # 0..1
     "avg_job_latency_ms",      # >=0
+    "job_latency_ms",          # >=0, one sample per synced job
     "state_transition_rate",   # events/hour or events/min (define later)
     "llm_call_success_rate",   # 0..1
     "worker_availability",     # 0..1
 ]
 
 
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch-style).
+
+    Values are counted in logarithmic bins of ratio gamma = (1+a)/(1-a), so
+    any quantile estimate is within a relative error `a` of the exact sample
+    at that rank. Two sketches with the same accuracy merge by adding counts.
+    """
+
+    MIN_INDEXABLE = 1e-9
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "_pos", "_neg", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = float(relative_accuracy)
+        self._log_gamma = math.log((1 + self.relative_accuracy) / (1 - self.relative_accuracy))
+        self._pos: Dict[int, int] = {}
+        self._neg: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        if value > self.MIN_INDEXABLE:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._pos[key] = self._pos.get(key, 0) + 1
+        elif value < -self.MIN_INDEXABLE:
+            key = math.ceil(math.log(-value) / self._log_gamma)
+            self._neg[key] = self._neg.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        for mine, theirs in ((self._pos, other._pos), (self._neg, other._neg)):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, key: int) -> float:
+        # Midpoint of bin (gamma^(key-1), gamma^key] in the relative-error sense
+        return 2.0 * math.exp(key * self._log_gamma) / (1.0 + math.exp(self._log_gamma))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the sample at rank floor(q * (count - 1)); None when empty."""
+        if self.count == 0:
+            return None
+        rank = int(min(max(q, 0.0), 1.0) * (self.count - 1))
+        seen = 0
+        for key in sorted(self._neg, reverse=True):
+            seen += self._neg[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._pos):
+            seen += self._pos[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self._pos))
+
+    def to_json(self) -> dict:
+        return {
+            "z": self.zero_count,
+            "p": sorted(self._pos.items()),
+            "n": sorted(self._neg.items()),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, relative_accuracy: float) -> "QuantileSketch":
+        sketch = cls(relative_accuracy)
+        sketch.zero_count = int(data.get("z", 0))
+        sketch._pos = {int(k): int(n) for k, n in data.get("p", [])}
+        sketch._neg = {int(k): int(n) for k, n in data.get("n", [])}
+        sketch.count = sketch.zero_count + sum(sketch._pos.values()) + sum(sketch._neg.values())
+        return sketch
+
+
+@dataclass
+class _Bucket:
+    """Aggregate of the samples of one time bucket (Welford mean/M2, min/max, sketch)."""
+    no: int
+    sketch: QuantileSketch
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+
+@dataclass
+class _Ring:
+    """Fixed ring of buckets covering one window; slot = bucket_no % len(slots)."""
+    bucket_seconds: int
+    slots: List[Optional[_Bucket]] = field(default_factory=list)
+
+
 class PerformanceBaselineTracker:
     """
     Tracks time-series samples per metric and computes rolling-window baselines
-    (mean/stddev) for standard windows (1h, 24h, 7d).
+    (mean/stddev/min/max, p50/p95) for standard windows (1h, 24h, 7d).
+
+    Streaming:
+      - Each window keeps a ring of time buckets per metric (1h: one per
+        minute; longer windows use wider buckets so a ring holds at most
+        `buckets_per_window` of them). update() touches one bucket per window.
+      - Window stats merge the ring's live buckets: O(buckets), not O(samples).
+        The window edge is resolved to one bucket width.
+      - Percentiles come from mergeable QuantileSketch bins (relative error
+        `sketch_accuracy`).
 
     Persistence:
-      - JSON file written atomically to runtime/performance_baselines.json
+      - JSON file written atomically to runtime/performance_baselines.json,
+        holding the baselines snapshot plus the compact bucket rings
 
     Important:
       - This tracker does NOT decide what values mean.
@@ -54,17 +174,27 @@ class PerformanceBaselineTracker:
         windows: Optional[List[WindowSpec]] = None,
         metrics: Optional[List[str]] = None,
         max_samples_per_metric: int = 20000,
+        min_bucket_seconds: int = 60,
+        buckets_per_window: int = 120,
+        sketch_accuracy: float = 0.01,
     ) -> None:
         self._lock = threading.RLock()
         self._windows = windows or list(DEFAULT_WINDOWS)
         self._metrics = metrics or list(DEFAULT_METRICS)
+        # No raw samples are kept any more; memory is bounded by the rings.
+        # Accepted for compatibility with existing callers.
         self._max_samples = int(max_samples_per_metric)
+        self._sketch_accuracy = float(sketch_accuracy)
+        self._bucket_seconds: Dict[str, int] = {
+            w.key: max(int(min_bucket_seconds), math.ceil(w.seconds / max(1, int(buckets_per_window))))
+            for w in self._windows
+        }
 
         self._runtime_dir = Path(runtime_dir)
         self._path = self._runtime_dir / filename
 
-        # samples: metric -> list[(ts, value)]
-        self._samples: Dict[str, List[Tuple[float, float]]] = {m: [] for m in self._metrics}
+        # rings: metric -> window -> ring of buckets
+        self._rings: Dict[str, Dict[str, _Ring]] = {m: self._new_rings() for m in self._metrics}
 
         # computed: metric -> window -> stats
         self._baselines: Dict[str, Dict[str, dict]] = {m: {} for m in self._metrics}
@@ -80,25 +210,27 @@ class PerformanceBaselineTracker:
     # ---------------------------
 
     def update(self, metric: str, value: float, *, ts: Optional[float] = None) -> None:
-        """Add a sample for a metric (ts defaults to now)."""
-        if metric not in self._samples:
-            # allow dynamic metrics if needed
-            with self._lock:
-                self._samples.setdefault(metric, [])
-                self._baselines.setdefault(metric, {})
-
+        """Add a sample for a metric (ts defaults to now). O(number of windows)."""
         t = float(ts if ts is not None else time.time())
         v = float(value)
 
         with self._lock:
-            buf = self._samples[metric]
-            buf.append((t, v))
+            rings = self._rings.get(metric)
+            if rings is None:
+                # allow dynamic metrics if needed
+                rings = self._rings[metric] = self._new_rings()
+                self._baselines.setdefault(metric, {})
 
-            # cap memory
-            if len(buf) > self._max_samples:
-                # drop oldest chunk (fast)
-                drop = len(buf) - self._max_samples
-                del buf[:drop]
+            for ring in rings.values():
+                no = int(t // ring.bucket_seconds)
+                slot = no % len(ring.slots)
+                bucket = ring.slots[slot]
+                if bucket is None or bucket.no < no:
+                    bucket = ring.slots[slot] = _Bucket(no, QuantileSketch(self._sketch_accuracy))
+                elif bucket.no > no:
+                    # Older than this ring reaches back
+                    continue
+                bucket.add(v)
 
             self._dirty = True
 
@@ -107,11 +239,28 @@ class PerformanceBaselineTracker:
         n = float(now if now is not None else time.time())
 
         with self._lock:
-            for metric, buf in self._samples.items():
-                self._baselines[metric] = {}
-                for w in self._windows:
-                    stats = self._compute_window(buf, w.seconds, now=n)
-                    self._baselines[metric][w.key] = stats
+            for metric, rings in self._rings.items():
+                self._baselines[metric] = {
+                    w.key: self._compute_window(rings[w.key], w.seconds, now=n) for w in self._windows
+                }
+
+    def get_window_stats(self, metric: str, window: str, *, now: Optional[float] = None) -> Optional[dict]:
+        """Fresh stats for one metric/window, or None if the metric or window is unknown."""
+        spec = next((w for w in self._windows if w.key == window), None)
+        with self._lock:
+            rings = self._rings.get(metric)
+            if spec is None or rings is None:
+                return None
+            return self._compute_window(rings[window], spec.seconds, now=float(now if now is not None else time.time()))
+
+    def get_percentiles(
+        self, metric: str, window: str = "24h", *, min_count: int = 1, now: Optional[float] = None
+    ) -> Optional[Tuple[float, float]]:
+        """(p50, p95) for a metric/window, e.g. for scoring.normalize_positive; None below min_count."""
+        stats = self.get_window_stats(metric, window, now=now)
+        if not stats or stats["count"] < max(1, min_count):
+            return None
+        return stats["p50"], stats["p95"]
 
     def get_all_baselines(self, *, recompute: bool = True) -> dict:
         """Return a snapshot dict suitable for API output."""
@@ -128,10 +277,10 @@ class PerformanceBaselineTracker:
             }
 
     def persist(self, *, recompute: bool = True) -> None:
-        """Atomically write baselines to disk."""
-        payload = self.get_all_baselines(recompute=recompute)
-
+        """Atomically write baselines (and the bucket rings they are computed from) to disk."""
         with self._lock:
+            payload = dict(self.get_all_baselines(recompute=recompute))
+            payload["bucket_rings"] = self._dump_rings()
             self._ensure_runtime_dir()
             self._atomic_write_json(self._path, payload)
             self._last_persist_ts = time.time()
@@ -155,12 +304,12 @@ class PerformanceBaselineTracker:
         """
         # Track transition frequency (transitions per hour)
         self.update("state_transition_rate", 1.0, ts=event.ts)
-        
+
         # Track time in each state (state stability)
         if prev_snapshot and prev_snapshot.since_ts:
             time_in_state = event.ts - prev_snapshot.since_ts
             self.update(f"time_in_{prev_snapshot.state.lower()}", time_in_state, ts=event.ts)
-        
+
         # Track degraded ratio
         if new_snapshot.state == "DEGRADED":
             self.update("degraded_state_entered", 1.0, ts=event.ts)
@@ -171,48 +320,98 @@ class PerformanceBaselineTracker:
     # Internals
     # ---------------------------
 
-    def _compute_window(
-        self,
-        buf: List[Tuple[float, float]],
-        window_seconds: int,
-        *,
-        now: float,
-    ) -> dict:
-        cutoff = now - float(window_seconds)
-        # Filter recent samples (buf is chronological)
-        # We'll scan from end backwards until cutoff for speed on large buffers.
-        values: List[float] = []
-        for t, v in reversed(buf):
-            if t < cutoff:
-                break
-            values.append(v)
-
-        values.reverse()
-        n = len(values)
-        if n == 0:
+    def _new_rings(self) -> Dict[str, _Ring]:
+        rings = {}
+        for w in self._windows:
+            width = self._bucket_seconds[w.key]
+            # +1 slot: the current (partial) bucket next to a full window of closed ones
+            rings[w.key] = _Ring(width, [None] * (math.ceil(w.seconds / width) + 1))
+        return rings
+
+    def _compute_window(self, ring: _Ring, window_seconds: int, *, now: float) -> dict:
+        first_no = int((now - float(window_seconds)) // ring.bucket_seconds)
+        count, mean, m2 = 0, 0.0, 0.0
+        lo, hi = math.inf, -math.inf
+        sketch = QuantileSketch(self._sketch_accuracy)
+        for bucket in ring.slots:
+            if bucket is None or bucket.no < first_no:
+                continue
+            # Chan et al. parallel merge of (count, mean, M2)
+            total = count + bucket.count
+            delta = bucket.mean - mean
+            mean += delta * bucket.count / total
+            m2 += bucket.m2 + delta * delta * count * bucket.count / total
+            count = total
+            lo = min(lo, bucket.min)
+            hi = max(hi, bucket.max)
+            sketch.merge(bucket.sketch)
+
+        if count == 0:
             return {
                 "count": 0,
                 "mean": None,
                 "stddev": None,
                 "min": None,
                 "max": None,
+                "p50": None,
+                "p95": None,
                 "last_updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
             }
 
-        mean = sum(values) / n
         # population stddev (stable enough for baselines)
-        var = sum((x - mean) ** 2 for x in values) / n
-        std = math.sqrt(var)
+        std = math.sqrt(max(0.0, m2 / count))
+
+        def _pct(q: float) -> float:
+            # sketch bins are relative-error; keep the estimate inside the observed range
+            return min(hi, max(lo, sketch.quantile(q)))
 
         return {
-            "count": n,
+            "count": count,
             "mean": mean,
             "stddev": std,
-            "min": min(values),
-            "max": max(values),
+            "min": lo,
+            "max": hi,
+            "p50": _pct(0.50),
+            "p95": _pct(0.95),
             "last_updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
         }
 
+    def _dump_rings(self) -> dict:
+        dumped: Dict[str, Dict[str, dict]] = {}
+        for metric, rings in self._rings.items():
+            dumped[metric] = {}
+            for key, ring in rings.items():
+                buckets = sorted((b for b in ring.slots if b is not None), key=lambda b: b.no)
+                dumped[metric][key] = {
+                    "bucket_seconds": ring.bucket_seconds,
+                    # [bucket_no, count, mean, m2, min, max, sketch]
+                    "buckets": [[b.no, b.count, b.mean, b.m2, b.min, b.max, b.sketch.to_json()] for b in buckets],
+                }
+        return {"sketch_accuracy": self._sketch_accuracy, "metrics": dumped}
+
+    def _restore_rings(self, data: dict) -> None:
+        if not isinstance(data, dict) or float(data.get("sketch_accuracy", -1)) != self._sketch_accuracy:
+            return
+        for metric, win_map in (data.get("metrics") or {}).items():
+            if not isinstance(win_map, dict):
+                continue
+            rings = self._rings.setdefault(metric, self._new_rings())
+            self._baselines.setdefault(metric, {})
+            for key, stored in win_map.items():
+                ring = rings.get(key)
+                # Window layout changed since the file was written: start that ring fresh
+                if ring is None or stored.get("bucket_seconds") != ring.bucket_seconds:
+                    continue
+                for no, count, mean, m2, lo, hi, sketch in stored.get("buckets", []):
+                    slot = int(no) % len(ring.slots)
+                    current = ring.slots[slot]
+                    if current is not None and current.no >= int(no):
+                        continue
+                    ring.slots[slot] = _Bucket(
+                        int(no), QuantileSketch.from_json(sketch, self._sketch_accuracy),
+                        int(count), float(mean), float(m2), float(lo), float(hi),
+                    )
+
     def _ensure_runtime_dir(self) -> None:
         self._runtime_dir.mkdir(parents=True, exist_ok=True)
 
@@ -230,6 +429,9 @@ class PerformanceBaselineTracker:
                         if isinstance(win_map, dict):
                             self._baselines.setdefault(metric, {})
                             self._baselines[metric].update(win_map)
+            # Files written before the streaming rings only carry the snapshot above
+            with self._lock:
+                self._restore_rings(data.get("bucket_rings"))
         except Exception:
             # If file is corrupt, we ignore (Step 3 diagnostics can flag this later)
             return
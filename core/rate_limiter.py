@@ -1,47 +1,189 @@
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
+
 from core import storage
+from core.config import RateLimitConfig
+
+
+class _Bucket:
+    """Token bucket + concurrency limit of one source (guarded by its own lock)."""
+    __slots__ = ("source", "max_jobs_per_minute", "max_concurrent_jobs", "tokens", "refilled_at", "lock", "dirty")
+
+    def __init__(self, source: str, max_jobs_per_minute: int, max_concurrent_jobs: int,
+                 tokens: Optional[float], refilled_at: Optional[float], now: float):
+        self.source = source
+        self.max_jobs_per_minute = int(max_jobs_per_minute)
+        self.max_concurrent_jobs = int(max_concurrent_jobs)
+        self.tokens = float(self.max_jobs_per_minute if tokens is None else tokens)
+        self.refilled_at = float(now if refilled_at is None else refilled_at)
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    def refill(self, now: float) -> None:
+        # Capacity max_jobs_per_minute, refilled continuously at max_jobs_per_minute / 60 per second
+        elapsed = max(0.0, now - self.refilled_at)
+        self.tokens = min(float(self.max_jobs_per_minute), self.tokens + elapsed * self.max_jobs_per_minute / 60.0)
+        self.refilled_at = now
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "max_jobs_per_minute": self.max_jobs_per_minute,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            # Legacy columns: tokens spent from a full bucket, and the refill clock
+            "current_count": max(0, int(self.max_jobs_per_minute - self.tokens)),
+            "window_start": datetime.utcfromtimestamp(self.refilled_at).isoformat(),
+            "tokens": self.tokens,
+            "refilled_at": self.refilled_at,
+        }
+
 
 class RateLimiter:
-    """Handles per-source job limits and concurrency."""
-    
+    """
+    Handles per-source job limits and concurrency.
+
+    Limits are enforced in memory: one token bucket per source (capacity and
+    refill rate from max_jobs_per_minute) plus a max_concurrent_jobs gate on
+    the inflight counter (job_stats, O(1)). try_acquire(n) takes tokens for a
+    whole dispatch batch under the source's lock. Config is loaded once per
+    source; bucket state is written back to rate_limit_config at most every
+    PERSIST_INTERVAL_SEC (and on flush()).
+    """
+
+    def __init__(
+        self,
+        persist_interval_sec: float = RateLimitConfig.PERSIST_INTERVAL_SEC,
+        concurrency_fn: Optional[Callable[[str], int]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.persist_interval_sec = persist_interval_sec
+        self._concurrency = concurrency_fn or storage.count_running_jobs_by_source
+        self._clock = clock
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._last_persist = clock()
+        self.stats = {"decisions": 0, "granted": 0, "blocked_rate": 0, "blocked_concurrency": 0, "persists": 0}
+
+    def _bucket(self, source: str) -> _Bucket:
+        bucket = self._buckets.get(source)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(source)
+            if bucket is None:
+                config = storage.get_rate_limit_config(source)
+                now = self._clock()
+                if config:
+                    bucket = _Bucket(source, config["max_jobs_per_minute"], config["max_concurrent_jobs"],
+                                     config.get("tokens"), config.get("refilled_at"), now)
+                else:
+                    # Default limits if not configured
+                    bucket = _Bucket(source, RateLimitConfig.DEFAULT_JOBS_PER_MINUTE,
+                                     RateLimitConfig.DEFAULT_MAX_CONCURRENT, None, None, now)
+                    bucket.dirty = True
+                self._buckets[source] = bucket
+        return bucket
+
+    def configure(self, source: str, max_jobs_per_minute: Optional[int] = None,
+                  max_concurrent_jobs: Optional[int] = None) -> None:
+        """Change a source's limits; persisted with the next periodic write."""
+        bucket = self._bucket(source)
+        with bucket.lock:
+            bucket.refill(self._clock())
+            if max_jobs_per_minute is not None:
+                # Tokens already spent stay spent under the new capacity
+                spent = bucket.max_jobs_per_minute - bucket.tokens
+                bucket.max_jobs_per_minute = int(max_jobs_per_minute)
+                bucket.tokens = max(0.0, bucket.max_jobs_per_minute - spent)
+            if max_concurrent_jobs is not None:
+                bucket.max_concurrent_jobs = int(max_concurrent_jobs)
+            bucket.dirty = True
+
+    def try_acquire(self, source: str, n: int = 1, partial: bool = False) -> int:
+        """
+        Atomically admit n jobs for source. Returns the number admitted:
+        n or 0, or with partial=True as many as tokens and free concurrency allow.
+        """
+        if n <= 0:
+            return 0
+        bucket = self._bucket(source)
+        concurrent = self._concurrency(source)
+        now = self._clock()
+        blocked = None
+        with bucket.lock:
+            bucket.refill(now)
+            by_rate = int(bucket.tokens + 1e-9)
+            by_concurrency = max(0, bucket.max_concurrent_jobs - concurrent)
+            granted = min(n, by_rate, by_concurrency)
+            if granted < n:
+                blocked = "rate" if by_rate < min(n, by_concurrency) else "concurrency"
+                if not partial:
+                    granted = 0
+            if granted:
+                bucket.tokens -= granted
+                bucket.dirty = True
+        with self._lock:
+            self.stats["decisions"] += 1
+            self.stats["granted"] += granted
+            if blocked:
+                self.stats[f"blocked_{blocked}"] += 1
+        if blocked == "rate":
+            print(f"[rate-limit] Blocked {source}: Max jobs per minute reached ({bucket.max_jobs_per_minute})")
+        elif blocked == "concurrency":
+            print(f"[rate-limit] Blocked {source}: Max concurrent jobs reached ({bucket.max_concurrent_jobs})")
+        self.maybe_persist(now)
+        return granted
+
+    def release(self, source: str, n: int = 1) -> None:
+        """Return tokens for admitted jobs that were not dispatched after all."""
+        if n <= 0:
+            return
+        bucket = self._bucket(source)
+        with bucket.lock:
+            bucket.refill(self._clock())
+            bucket.tokens = min(float(bucket.max_jobs_per_minute), bucket.tokens + n)
+            bucket.dirty = True
+
     def check_limit(self, source: str) -> bool:
-        config = storage.get_rate_limit_config(source)
-        if not config:
-            # Default limits if not configured
-            config = {
-                "source": source,
-                "max_jobs_per_minute": 60,
-                "max_concurrent_jobs": 10,
-                "current_count": 0,
-                "window_start": datetime.utcnow().isoformat()
-            }
-            storage.update_rate_limit_config(**config)
-            return True
-
-        now = datetime.utcnow()
-        window_start = datetime.fromisoformat(config["window_start"])
-        
-        # Reset window if expired (1 minute)
-        if (now - window_start).total_seconds() >= 60:
-            config["current_count"] = 1
-            config["window_start"] = now.isoformat()
-            storage.update_rate_limit_config(**config)
-            return True
-        
-        # Check jobs per minute
-        if config["current_count"] >= config["max_jobs_per_minute"]:
-            print(f"[rate-limit] Blocked {source}: Max jobs per minute reached ({config['max_jobs_per_minute']})")
-            return False
-        
-        # Check concurrency
-        concurrent = storage.count_running_jobs_by_source(source)
-        if concurrent >= config["max_concurrent_jobs"]:
-            print(f"[rate-limit] Blocked {source}: Max concurrent jobs reached ({config['max_concurrent_jobs']})")
+        return self.try_acquire(source, 1) == 1
+
+    def maybe_persist(self, now: Optional[float] = None) -> bool:
+        """Write dirty buckets if PERSIST_INTERVAL_SEC passed since the last write."""
+        now = self._clock() if now is None else now
+        if now - self._last_persist < self.persist_interval_sec:
             return False
-        
-        # Increment counter
-        config["current_count"] += 1
-        storage.update_rate_limit_config(**config)
-        
+        self.flush()
         return True
+
+    def flush(self) -> None:
+        """Write every dirty bucket to rate_limit_config in one transaction."""
+        states: List[Dict[str, Any]] = []
+        with self._lock:
+            self._last_persist = self._clock()
+            buckets = list(self._buckets.values())
+        for bucket in buckets:
+            with bucket.lock:
+                if bucket.dirty:
+                    states.append(bucket.state())
+                    bucket.dirty = False
+        if not states:
+            return
+        try:
+            storage.save_rate_limit_states(states)
+            with self._lock:
+                self.stats["persists"] += 1
+        except Exception as e:
+            print(f"[rate-limit] Failed to persist limiter state: {e}")
+            failed = {state["source"] for state in states}
+            for bucket in buckets:
+                if bucket.source in failed:
+                    with bucket.lock:
+                        bucket.dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["sources"] = len(self._buckets)
+        return stats
@@ -48,6 +48,9 @@ class ReplayEngine:
         }
 
     def _load_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        # Buffered nodes must reach the file before we scan it
+        if hasattr(self.trace_logger, "flush"):
+            self.trace_logger.flush()
         log_path = Path(self.trace_logger.log_path)
         if not log_path.exists(): return None
         
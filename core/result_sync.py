@@ -0,0 +1,154 @@
+# core/result_sync.py
+"""
+Result Sync Notifications (Core side).
+
+Completion events replace the per-tick scan of every working job:
+  - ResultSyncQueue:   in-process, de-duplicating queue of job ids with a result
+                       to pick up; fed by /api/jobs/{id}/sync and the watcher
+  - ResultWatcher:     watches the transport's result side (watchdog on
+                       webrelay_in, data_version wait for the SQLite queue,
+                       one directory listing per interval as fallback)
+
+The Dispatcher drains the queue every tick and only falls back to a full
+working-job sweep every RobustnessConfig.SYNC_RECONCILE_SEC.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+    Observer = None
+    FileSystemEventHandler = object
+
+RESULT_SUFFIX = ".result.json"
+
+
+class ResultSyncQueue:
+    """Thread-safe FIFO of job ids; a job already queued is not queued twice."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"notified": 0, "deduped": 0, "dropped": 0, "drained": 0, "by_source": {}}
+
+    def notify(self, job_id: str, source: str = "unknown") -> bool:
+        with self._lock:
+            by_source = self.stats["by_source"]
+            by_source[source] = by_source.get(source, 0) + 1
+            if job_id in self._items:
+                self.stats["deduped"] += 1
+                return False
+            if len(self._items) >= self.maxsize:
+                # Reconciliation sweep picks dropped ids up later
+                self.stats["dropped"] += 1
+                return False
+            self._items[job_id] = source
+            self.stats["notified"] += 1
+            return True
+
+    def drain(self, max_items: int = 1000) -> List[str]:
+        with self._lock:
+            out = []
+            while self._items and len(out) < max_items:
+                job_id, _ = self._items.popitem(last=False)
+                out.append(job_id)
+            self.stats["drained"] += len(out)
+            return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "by_source": dict(self.stats["by_source"]), "depth": len(self._items)}
+
+
+class _ResultFileHandler(FileSystemEventHandler):
+    def __init__(self, queue: ResultSyncQueue):
+        self.queue = queue
+
+    def _push(self, path: str):
+        name = path.replace("\\", "/").rsplit("/", 1)[-1]
+        if name.endswith(RESULT_SUFFIX):
+            self.queue.notify(name[:-len(RESULT_SUFFIX)], source="watcher")
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._push(event.src_path)
+
+    def on_moved(self, event):
+        # FileDropTransport.send_result writes tmp + replace
+        if not event.is_directory:
+            self._push(event.dest_path)
+
+
+class ResultWatcher:
+    """Feeds a ResultSyncQueue from the transport's result side."""
+
+    def __init__(self, transport, queue: ResultSyncQueue, interval_sec: float = 0.5):
+        self.transport = transport
+        self.queue = queue
+        self.interval_sec = interval_sec
+        self.mode = "idle"
+        self._running = False
+        self._thread = None
+        self._observer = None
+        self._last_listing = set()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        if self.transport.name == "file" and HAS_WATCHDOG:
+            self._observer = Observer()
+            self._observer.schedule(_ResultFileHandler(self.queue), str(self.transport.in_dir), recursive=False)
+            self._observer.start()
+            self.mode = "watchdog"
+        else:
+            self.mode = "wait" if hasattr(self.transport, "wait_for_change") else "listing"
+            self._thread = threading.Thread(target=self._run, name="result-watcher", daemon=True)
+            self._thread.start()
+        print(f"[result_sync] Watching {self.transport.name} results ({self.mode})")
+
+    def _run(self):
+        while self._running:
+            try:
+                if self.mode == "wait":
+                    self.transport.wait_for_change(self.interval_sec)
+                else:
+                    time.sleep(self.interval_sec)
+                self.scan_once()
+            except Exception as e:
+                print(f"[result_sync] Watcher error: {e}")
+                time.sleep(self.interval_sec)
+
+    def scan_once(self) -> int:
+        """
+        One listing of waiting results; only ids not present in the previous
+        listing are queued, so a result the Dispatcher left in place is not
+        re-queued every interval (the reconciliation sweep covers those).
+        """
+        listing = set(self.transport.list_result_ids())
+        fresh = listing - self._last_listing
+        self._last_listing = listing
+        return sum(1 for job_id in fresh if self.queue.notify(job_id, source="watcher"))
+
+    def stop(self):
+        self._running = False
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -9,7 +9,7 @@ from __future__ import annotations
 import json
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import datetime, timezone, timedelta
 
 def utcnow_iso() -> str:
@@ -96,7 +96,7 @@ migrate_if_needed()
 # ------------------------------------------------------------------------------
 
 def list_missions() -> List[models.Mission]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("SELECT * FROM missions ORDER BY created_at DESC").fetchall()
         return [
             models.Mission(
@@ -112,7 +112,7 @@ def list_missions() -> List[models.Mission]:
         ]
 
 def get_mission(mission_id: str) -> Optional[models.Mission]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("SELECT * FROM missions WHERE id = ?", (mission_id,)).fetchone()
         if not r: return None
         return models.Mission(
@@ -148,8 +148,12 @@ def delete_mission(mission_id: str) -> bool:
         # Cascading delete handles tasks and jobs if schema has ON DELETE CASCADE
         # SQLite needs PRAGMA foreign_keys = ON;
         conn.execute("PRAGMA foreign_keys = ON")
-        res = conn.execute("DELETE FROM missions WHERE id = ?", (mission_id,))
-        conn.commit()
+        try:
+            res = conn.execute("DELETE FROM missions WHERE id = ?", (mission_id,))
+            conn.commit()
+        finally:
+            # Pooled connection is reused by other callers: restore the default
+            conn.execute("PRAGMA foreign_keys = OFF")
         return res.rowcount > 0
 
 # ------------------------------------------------------------------------------
@@ -157,7 +161,7 @@ def delete_mission(mission_id: str) -> bool:
 # ------------------------------------------------------------------------------
 
 def list_tasks() -> List[models.Task]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("SELECT * FROM tasks ORDER BY created_at ASC").fetchall()
         return [
             models.Task(
@@ -172,7 +176,7 @@ def list_tasks() -> List[models.Task]:
         ]
 
 def get_task(task_id: str) -> Optional[models.Task]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
         if not r: return None
         return models.Task(
@@ -203,7 +207,7 @@ def update_task(task: models.Task) -> None:
         conn.commit()
 
 def find_task_by_name(mission_id: str, name: str) -> Optional[models.Task]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("SELECT * FROM tasks WHERE mission_id = ? AND name = ?", (mission_id, name)).fetchone()
         if not r: return None
         return models.Task(
@@ -221,7 +225,7 @@ def find_task_by_name(mission_id: str, name: str) -> Optional[models.Task]:
 # ------------------------------------------------------------------------------
 
 def list_jobs() -> List[models.Job]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("SELECT * FROM jobs ORDER BY created_at ASC").fetchall()
         return [
             models.Job(
@@ -248,40 +252,63 @@ def list_jobs() -> List[models.Job]:
         ]
     return jobs
 
+def _row_to_job(r: sqlite3.Row) -> models.Job:
+    """Hydrate a full jobs row into a models.Job."""
+    return models.Job(
+        id=r['id'],
+        task_id=r['task_id'],
+        payload=json.loads(r['payload']),
+        status=r['status'],
+        result=json.loads(r['result']) if r['result'] else None,
+        retry_count=r['retry_count'],
+        idempotency_key=r['idempotency_key'],
+        idempotency_hash=r['idempotency_hash'],
+        completed_result=json.loads(r['completed_result']) if r['completed_result'] else None,
+        idempotency_first_seen_utc=r['idempotency_first_seen_utc'],
+        meta=json.loads(r['meta']) if r['meta'] else {},
+        result_hash=r['result_hash'],
+        result_hash_alg=r['result_hash_alg'],
+        result_canonical=r['result_canonical'],
+        priority=r['priority'],
+        timeout_seconds=r['timeout_seconds'],
+        depends_on=json.loads(r['depends_on']),
+        lease_owner=r['lease_owner'],
+        lease_until_utc=r['lease_until_utc'],
+        next_retry_utc=r['next_retry_utc'],
+        created_at=r['created_at'],
+        updated_at=r['updated_at']
+    )
+
+def _rows_to_jobs(rows) -> List[models.Job]:
+    """Hydrate rows, skipping (and logging) undecodable ones."""
+    jobs = []
+    for r in rows:
+        try:
+            jobs.append(_row_to_job(r))
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            print(f"[storage] Error decoding job {r['id']}: {e}")
+    return jobs
+
 def get_job(job_id: str) -> Optional[models.Job]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
         if r:
             try:
-                return models.Job(
-                    id=r['id'],
-                    task_id=r['task_id'],
-                    payload=json.loads(r['payload']),
-                    status=r['status'],
-                    result=json.loads(r['result']) if r['result'] else None,
-                    retry_count=r['retry_count'],
-                    idempotency_key=r['idempotency_key'],
-                    idempotency_hash=r['idempotency_hash'],
-                    completed_result=json.loads(r['completed_result']) if r['completed_result'] else None,
-                    idempotency_first_seen_utc=r['idempotency_first_seen_utc'],
-                    meta=json.loads(r['meta']) if r['meta'] else {},
-                    result_hash=r['result_hash'],
-                    result_hash_alg=r['result_hash_alg'],
-                    result_canonical=r['result_canonical'],
-                    priority=r['priority'],
-                    timeout_seconds=r['timeout_seconds'],
-                    depends_on=json.loads(r['depends_on']),
-                    lease_owner=r['lease_owner'],
-                    lease_until_utc=r['lease_until_utc'],
-                    next_retry_utc=r['next_retry_utc'],
-                    created_at=r['created_at'],
-                    updated_at=r['updated_at']
-                )
+                return _row_to_job(r)
             except (json.JSONDecodeError, TypeError, KeyError) as e:
                 print(f"[storage] Error decoding job {r['id']}: {e}")
                 return None
     return None
 
+def _sync_job_dependencies(conn, job_id: str, depends_on: List[str]) -> None:
+    """Mirror jobs.depends_on into the normalized job_dependencies table."""
+    conn.execute("DELETE FROM job_dependencies WHERE job_id = ?", (job_id,))
+    if depends_on:
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_dependencies (job_id, depends_on_id) VALUES (?, ?)",
+            [(job_id, d) for d in depends_on if d],
+        )
+
 def create_job(job: models.Job) -> models.Job:
     with get_db() as conn:
         conn.execute("""
@@ -299,6 +326,7 @@ def create_job(job: models.Job) -> models.Job:
             job.lease_owner, job.lease_until_utc, job.next_retry_utc,
             job.created_at, job.updated_at
         ))
+        _sync_job_dependencies(conn, job.id, job.depends_on)
         conn.commit()
     return job
 
@@ -313,6 +341,7 @@ def create_job_with_conn(conn, job: models.Job) -> models.Job:
         job.lease_owner, job.lease_until_utc, job.next_retry_utc,
         job.created_at, job.updated_at
     ))
+    _sync_job_dependencies(conn, job.id, job.depends_on)
     conn.commit()
     return job
 
@@ -340,58 +369,121 @@ def update_job(job: models.Job) -> None:
             job.lease_owner, job.lease_until_utc, job.next_retry_utc,
             utcnow_iso(), job.id
         ))
+        _sync_job_dependencies(conn, job.id, job.depends_on)
         conn.commit()
     
     # --- TRACE ON DB WRITE (deterministic, path-independent) ---
     # Log trace whenever job status changes to completed/failed
     if job.status in ["completed", "failed"]:
-        try:
-            from core.decision_trace import trace_logger
-            import os
-            import uuid
-            
-            trace_logger.log_node(
-                trace_id=f"db-write-{job.id}",
-                intent="job_status_change",
-                build_id=os.getenv("SHERATAN_BUILD_ID", "main-v2"),
-                job_id=job.id,
-                depth=0,
-                state={
-                    "context_refs": [f"job:{job.id}"],
-                    "constraints": {
-                        "budget_remaining": 100,
-                        "risk_level": "low"
-                    }
+        kind = job.payload.get("kind", "unknown") if isinstance(job.payload, dict) else "unknown"
+        _log_job_status_trace(job.id, job.status, kind, job.retry_count)
+
+# Columns accepted by update_job_fields (id is the key, never updated)
+_JOB_UPDATABLE_COLUMNS = {
+    "task_id", "payload", "status", "result", "retry_count",
+    "idempotency_key", "idempotency_hash", "completed_result",
+    "idempotency_first_seen_utc", "meta",
+    "result_hash", "result_hash_alg", "result_canonical",
+    "priority", "timeout_seconds", "depends_on",
+    "lease_owner", "lease_until_utc", "next_retry_utc", "updated_at",
+}
+
+def _encode_job_column(column: str, value: Any) -> Any:
+    """Serialize one job column the same way update_job does."""
+    if column in ("result", "completed_result"):
+        return json.dumps(value) if value else None
+    if column in ("payload", "meta", "depends_on"):
+        return json.dumps(value)
+    return value
+
+def update_job_fields(job_id: str, expected_status: Optional[str] = None, **changes: Any) -> bool:
+    """
+    Partial job update: writes only the given columns (plus updated_at).
+
+    expected_status makes the update a compare-and-set on status, replacing
+    get_job -> mutate -> update_job round trips. Returns False if the job does
+    not exist or its status no longer matches.
+    """
+    unknown = set(changes) - _JOB_UPDATABLE_COLUMNS
+    if unknown:
+        raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+    changes.setdefault("updated_at", utcnow_iso())
+
+    assignments = ", ".join(f"{col} = ?" for col in changes)
+    params: List[Any] = [_encode_job_column(col, val) for col, val in changes.items()]
+    sql = f"UPDATE jobs SET {assignments} WHERE id = ?"
+    params.append(job_id)
+    if expected_status is not None:
+        sql += " AND status = ?"
+        params.append(expected_status)
+    sql += " RETURNING json_extract(payload, '$.kind'), retry_count"
+
+    with get_db() as conn:
+        row = conn.execute(sql, params).fetchone()
+        if row is not None and "depends_on" in changes:
+            _sync_job_dependencies(conn, job_id, changes["depends_on"])
+        conn.commit()
+
+    if row is None:
+        return False
+
+    status = changes.get("status")
+    if status in ("completed", "failed"):
+        _log_job_status_trace(job_id, status, row[0] or "unknown", row[1])
+    return True
+
+def _log_job_status_trace(job_id: str, status: str, kind: str, retry_count: int) -> None:
+    """Decision trace for a job reaching completed/failed (never raises)."""
+    try:
+        from core.decision_trace import trace_logger
+        import os
+        import uuid
+        
+        trace_logger.log_node(
+            trace_id=f"db-write-{job_id}",
+            intent="job_status_change",
+            build_id=os.getenv("SHERATAN_BUILD_ID", "main-v2"),
+            job_id=job_id,
+            depth=0,
+            state={
+                "context_refs": [f"job:{job_id}"],
+                "constraints": {
+                    "budget_remaining": 100,
+                    "risk_level": "low"
+                }
+            },
+            action={
+                "action_id": str(uuid.uuid4()),
+                "type": "EXECUTE",
+                "mode": "execute",
+                "params": {
+                    "status": status,
+                    "kind": kind
                 },
-                action={
-                    "action_id": str(uuid.uuid4()),
-                    "type": "EXECUTE",
-                    "mode": "execute",
-                    "params": {
-                        "status": job.status,
-                        "kind": job.payload.get("kind", "unknown") if isinstance(job.payload, dict) else "unknown"
-                    },
-                    "select_score": 1.0,
-                    "risk_gate": True
+                "select_score": 1.0,
+                "risk_gate": True
+            },
+            result={
+                "status": "success" if status == "completed" else "failed",
+                "metrics": {
+                    "retry_count": retry_count
                 },
-                result={
-                    "status": "success" if job.status == "completed" else "failed",
-                    "metrics": {
-                        "retry_count": job.retry_count
-                    },
-                    "score": 1.0 if job.status == "completed" else 0.0
-                }
-            )
-        except Exception as trace_err:
-            # Never fail job update due to trace error
-            print(f"[storage] Warning: Failed to log trace on DB write: {trace_err}")
+                "score": 1.0 if status == "completed" else 0.0
+            }
+        )
+    except Exception as trace_err:
+        # Never fail job update due to trace error
+        print(f"[storage] Warning: Failed to log trace on DB write: {trace_err}")
 
 def find_job_by_idempotency_key(key: str) -> Optional[models.Job]:
     """Find a job by its idempotency key."""
-    with get_db() as conn:
-        r = conn.execute("SELECT id FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+    with get_db(readonly=True) as conn:
+        r = conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
         if r:
-            return get_job(r[0])
+            try:
+                return _row_to_job(r)
+            except (json.JSONDecodeError, TypeError, KeyError) as e:
+                print(f"[storage] Error decoding job {r['id']}: {e}")
     return None
 
 def update_job_integrity(job_id: str, result_hash: str, result_hash_alg: str, result_canonical: Optional[str] = None):
@@ -416,8 +508,13 @@ def cache_completed_result(job_id: str, result_obj: Dict[str, Any], result_hash:
 # --- Rate Limit Config CRUD ---
 
 def get_rate_limit_config(source: str) -> Optional[dict]:
-    with get_db() as conn:
-        r = conn.execute("SELECT * FROM rate_limit_config WHERE source = ?", (source,)).fetchone()
+    """Limits for source plus its token-bucket state (tokens/refilled_at are None if never saved)."""
+    with get_db(readonly=True) as conn:
+        r = conn.execute("""
+            SELECT c.*, s.tokens, s.refilled_at
+            FROM rate_limit_config c LEFT JOIN rate_limit_state s ON s.source = c.source
+            WHERE c.source = ?
+        """, (source,)).fetchone()
         if r:
             return dict(r)
     return None
@@ -430,24 +527,68 @@ def update_rate_limit_config(source: str, max_jobs_per_minute: int, max_concurre
         """, (source, max_jobs_per_minute, max_concurrent_jobs, current_count, window_start))
         conn.commit()
 
-def count_running_jobs_by_source(source: str) -> int:
+def save_rate_limit_states(states: List[dict]) -> None:
+    """Upsert limiter config + token-bucket state for several sources in one transaction."""
+    if not states:
+        return
     with get_db() as conn:
-        r = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('working', 'running')").fetchone()
-        return r[0]
+        conn.executemany("""
+            INSERT OR REPLACE INTO rate_limit_config (source, max_jobs_per_minute, max_concurrent_jobs, current_count, window_start)
+            VALUES (:source, :max_jobs_per_minute, :max_concurrent_jobs, :current_count, :window_start)
+        """, states)
+        conn.executemany("""
+            INSERT OR REPLACE INTO rate_limit_state (source, tokens, refilled_at)
+            VALUES (:source, :tokens, :refilled_at)
+        """, states)
+        conn.commit()
+
+def count_running_jobs_by_source(source: str) -> int:
+    # Jobs carry no source yet: every source shares the global inflight counter
+    return count_inflight_jobs()
+
+# Statuses counted as inflight by the backpressure gates
+INFLIGHT_STATUSES = ("working", "running")
+
+def get_job_stats() -> Dict[str, Any]:
+    """
+    Trigger-maintained job counters (job_stats table), read in O(1).
+    by_status: current jobs per status; created_total / completed_total are
+    monotonic; last_completed_utc is the time of the latest completion.
+    """
+    with get_db(readonly=True) as conn:
+        rows = conn.execute("SELECT key, value, updated_utc FROM job_stats").fetchall()
+    by_status: Dict[str, int] = {}
+    stats: Dict[str, Any] = {"created_total": 0, "completed_total": 0, "last_completed_utc": None}
+    for key, value, updated_utc in rows:
+        if key.startswith("status:"):
+            if value:
+                by_status[key[len("status:"):]] = value
+        elif key in stats:
+            stats[key] = value
+            if key == "completed_total" and value:
+                stats["last_completed_utc"] = updated_utc
+    stats["by_status"] = by_status
+    stats["total"] = sum(by_status.values())
+    stats["pending"] = by_status.get("pending", 0)
+    stats["inflight"] = sum(by_status.get(s, 0) for s in INFLIGHT_STATUSES)
+    return stats
 
 def count_pending_jobs() -> int:
-    with get_db() as conn:
-        r = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending'").fetchone()
-        return r[0]
+    with get_db(readonly=True) as conn:
+        r = conn.execute("SELECT value FROM job_stats WHERE key = 'status:pending'").fetchone()
+        return r[0] if r else 0
 
 def count_inflight_jobs() -> int:
-    with get_db() as conn:
-        r = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('working', 'running')").fetchone()
+    with get_db(readonly=True) as conn:
+        r = conn.execute(
+            "SELECT COALESCE(SUM(value), 0) FROM job_stats WHERE key IN (?, ?)",
+            tuple(f"status:{s}" for s in INFLIGHT_STATUSES),
+        ).fetchone()
         return r[0]
 
 def count_recent_errors(limit: int = 100) -> int:
     """Efficiently count errors in the last N jobs without loading them into memory."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("""
             SELECT COUNT(*) FROM (
                 SELECT status FROM jobs ORDER BY created_at DESC LIMIT ?
@@ -457,7 +598,7 @@ def count_recent_errors(limit: int = 100) -> int:
 
 def count_ready_jobs(now_iso: str) -> int:
     """Pending jobs that have no next_retry_utc or next_retry_utc <= now."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("""
             SELECT COUNT(*) FROM jobs 
             WHERE status = 'pending' 
@@ -465,6 +606,52 @@ def count_ready_jobs(now_iso: str) -> int:
         """, (now_iso,)).fetchone()
         return r[0]
 
+# Priority rank used by the dispatcher: critical=0, high=1, anything else=2
+_PRIORITY_RANK_SQL = "CASE j.priority WHEN 'critical' THEN 0 WHEN 'high' THEN 1 ELSE 2 END"
+
+# Pending, retry-eligible and every dependency completed (missing deps count as unmet)
+_READY_WHERE_SQL = """
+    j.status = 'pending'
+    AND (j.next_retry_utc IS NULL OR j.next_retry_utc <= ?)
+    AND NOT EXISTS (
+        SELECT 1 FROM job_dependencies d
+        LEFT JOIN jobs p ON p.id = d.depends_on_id
+        WHERE d.job_id = j.id
+          AND (p.status IS NULL OR p.status != 'completed')
+    )
+"""
+
+def list_ready_jobs(limit: int = 100, now_iso: Optional[str] = None) -> List[models.Job]:
+    """
+    Ready-queue for the Dispatcher.
+    Returns pending, retry-eligible, dependency-satisfied jobs ordered by
+    priority then created_at. Served from idx_jobs_ready + job_dependencies,
+    so the cost scales with the pending set instead of the full job history.
+    """
+    now_iso = now_iso or utcnow_iso()
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(f"""
+            SELECT j.* FROM jobs j
+            WHERE {_READY_WHERE_SQL}
+            ORDER BY {_PRIORITY_RANK_SQL}, j.created_at ASC
+            LIMIT ?
+        """, (now_iso, limit)).fetchall()
+    return _rows_to_jobs(rows)
+
+def list_jobs_by_status(statuses: List[str], limit: Optional[int] = None) -> List[models.Job]:
+    """Index-backed lookup of jobs in the given statuses (oldest first)."""
+    if not statuses:
+        return []
+    placeholders = ",".join("?" for _ in statuses)
+    sql = f"SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at ASC"
+    params: List[Any] = list(statuses)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return _rows_to_jobs(rows)
+
 def lease_next_job(worker_id: str, lease_sec: int) -> Optional[models.Job]:
     """Atomically claim the next ready job."""
     now_iso = utcnow_iso()
@@ -498,6 +685,62 @@ def lease_next_job(worker_id: str, lease_sec: int) -> Optional[models.Job]:
             conn.execute("ROLLBACK")
             raise
 
+def lease_jobs(
+    worker_id: str,
+    n: int,
+    lease_sec: int,
+    kinds: Optional[Iterable[Any]] = None,
+) -> List[models.Job]:
+    """
+    Atomically claim up to N ready jobs in a single UPDATE ... RETURNING.
+
+    Candidates follow the ready-queue rules (pending, retry-eligible,
+    dependencies completed) in priority then created_at order. `kinds`
+    restricts claims to payload.kind values the worker advertises; it accepts
+    plain strings or capability objects with a `.kind` attribute
+    (e.g. mesh_registry.WorkerCapability). Returns fully hydrated jobs
+    straight from the RETURNING rows, no second read.
+    """
+    if n <= 0:
+        return []
+
+    kind_filter = ""
+    kind_params: List[Any] = []
+    if kinds is not None:
+        kind_params = sorted({getattr(k, "kind", k) for k in kinds})
+        if not kind_params:
+            return []
+        kind_filter = f"AND json_extract(j.payload, '$.kind') IN ({','.join('?' for _ in kind_params)})"
+
+    now_iso = utcnow_iso()
+    lease_until = (datetime.now(timezone.utc) + timedelta(seconds=lease_sec)).isoformat() + "Z"
+
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(f"""
+                UPDATE jobs
+                SET status = 'working', lease_owner = ?, lease_until_utc = ?, updated_at = ?
+                WHERE id IN (
+                    SELECT j.id FROM jobs j
+                    WHERE {_READY_WHERE_SQL}
+                      {kind_filter}
+                    ORDER BY {_PRIORITY_RANK_SQL}, j.created_at ASC
+                    LIMIT ?
+                )
+                RETURNING *
+            """, (worker_id, lease_until, now_iso, now_iso, *kind_params, n)).fetchall()
+            conn.commit()
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # RETURNING order is unspecified; restore queue order for the caller
+    priority_map = {"critical": 0, "high": 1}
+    jobs = _rows_to_jobs(rows)
+    jobs.sort(key=lambda j: (priority_map.get(j.priority, 2), j.created_at))
+    return jobs
+
 def reap_expired_leases() -> int:
     """Return expired working/running jobs to pending."""
     now_iso = utcnow_iso()
@@ -833,7 +1076,7 @@ def claim_next_pending_spec(conn, chain_id: str, lease_seconds: int = 60) -> Opt
         spec_id = row[0]
 
         # Update and claim
-        conn.execute(
+        cur = conn.execute(
             """
             UPDATE chain_specs
             SET claim_id=?, claimed_until=?, updated_at=?
@@ -843,8 +1086,9 @@ def claim_next_pending_spec(conn, chain_id: str, lease_seconds: int = 60) -> Opt
             (claim_id, expires_iso, now_iso, spec_id, now_iso),
         )
         
-        # Verify we actually updated a row (optimistic check)
-        if conn.total_changes == 0:
+        # Verify we actually updated a row (optimistic check).
+        # rowcount, not conn.total_changes: pooled connections are long-lived.
+        if cur.rowcount == 0:
             # Someone else was faster
             conn.execute("ROLLBACK")
             return None
@@ -959,7 +1203,7 @@ def mark_chain_spec_done(conn, chain_id: str, spec_id: str, ok: bool, info: Opti
 # ------------------------------------------------------------------------------
 
 def get_host(host_id: str) -> Optional[Dict[str, Any]]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         r = conn.execute("SELECT * FROM hosts WHERE id = ?", (host_id,)).fetchone()
         if not r: return None
         return {
@@ -1057,7 +1301,7 @@ def clear_policy(host_id: str, by: str = "admin") -> None:
     upsert_host(host_id, updates)
 
 def list_policies() -> List[Dict[str, Any]]:
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT id, policy_state, policy_reason, policy_until_utc, policy_hits, policy_updated_utc, policy_by
             FROM hosts
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from core import config, storage, models
+from core.job_transport import create_transport, InvalidResult
 from core.mcts_light import mcts
 from core.decision_trace import trace_logger
 
@@ -44,6 +45,13 @@ class WebRelayBridge:
         self.relay_out_dir.mkdir(parents=True, exist_ok=True)
         self.relay_in_dir.mkdir(parents=True, exist_ok=True)
 
+        # Job handoff transport (file drop by default, SHERATAN_JOB_TRANSPORT=sqlite for the queue)
+        self.transport = create_transport(
+            self.relay_out_dir,
+            self.relay_in_dir,
+            queue_path=config.DATA_DIR / "job_transport.db",
+        )
+
         # Initialize Mesh components
         self.ledger = None
         self.registry = None
@@ -97,9 +105,9 @@ class WebRelayBridge:
 
 
     # --------------------------------------------------------------
-    # WRITE UNIFIED JOB FILE
+    # WRITE UNIFIED JOB (via transport)
     # --------------------------------------------------------------
-    def enqueue_job(self, job_id: str) -> Path:
+    def enqueue_job(self, job_id: str) -> Optional[Path]:
         job = storage.get_job(job_id)
         if job is None:
             raise ValueError("Job not found")
@@ -191,7 +199,7 @@ class WebRelayBridge:
             job.payload["mesh"] = {}
         job.payload["mesh"]["worker_id"] = worker_id
         job.payload["mesh"]["cost"] = cost
-        storage.update_job(job)
+        storage.update_job_fields(job.id, payload=job.payload)
         # ----------------------------
 
         # Phase 10.3: Include artifacts from chain_context for full visibility
@@ -221,11 +229,8 @@ class WebRelayBridge:
             },
         }
 
-        job_file = self.relay_out_dir / f"{job.id}.job.json"
-        with open(job_file, "w", encoding="utf-8") as f:
-            json.dump(unified, f, indent=2)
-
-        return job_file
+        # File drop returns the job file path; queue transports return None
+        return self.transport.send_job(unified)
 
     # --------------------------------------------------------------
     # READ AND PROCESS RESULT FILES
@@ -235,24 +240,21 @@ class WebRelayBridge:
         if job is None:
             return None
 
-        result_file = self.relay_in_dir / f"{job_id}.result.json"
-
-        if not result_file.exists():
-            return None
-
         try:
-            raw = result_file.read_text()
-            print(f"[bridge] 📨 Syncing result for job {job_id[:8]}... RAW length: {len(raw)}")
-            content = json.loads(raw)
-        except Exception:
+            content = self.transport.fetch_result(job_id)
+        except InvalidResult:
             job.status = "failed"
             job.result = {"ok": False, "error": "invalid_json"}
             job.updated_at = datetime.utcnow().isoformat() + "Z"
-            storage.update_job(job)
+            storage.update_job_fields(job.id, status=job.status, result=job.result, updated_at=job.updated_at)
             if remove_after_read:
-                result_file.unlink(missing_ok=True)
+                self.transport.ack_result(job_id)
             return job
 
+        if content is None:
+            return None
+        print(f"[bridge] 📨 Syncing result for job {job_id[:8]} via {self.transport.name} transport")
+
         job.result = content
         if not content.get("ok", True):
             job.status = "failed"
@@ -314,10 +316,10 @@ class WebRelayBridge:
                     print(f"[bridge] Warning: Could not record mesh stats: {e}")
         # -------------------------------
 
-        storage.update_job(job)
+        storage.update_job_fields(job.id, status=job.status, result=job.result, updated_at=job.updated_at)
 
         if remove_after_read:
-            result_file.unlink(missing_ok=True)
+            self.transport.ack_result(job_id)
 
         # NOTE: LCP interpreter call removed from here. 
         # It is now handled centrally in main.py:sync_job to avoid double execution.
@@ -13,6 +13,8 @@ from .why_reader import latest_event, trace_by_id, traces_by_job_id, stats, sani
 # - no writes
 # - no priors updates
 # - no log mutation
+# (The offset index sidecar <log>.idx.db is a derived cache and may be
+#  created/updated by lookups; the trace log itself is never touched.)
 
 DEFAULT_LOG_PATH = "logs/decision_trace.jsonl"
 
@@ -0,0 +1,226 @@
+# core/why_index.py
+"""
+Offset index over decision_trace.jsonl (+ rotated segments).
+
+Sidecar SQLite DB (<log>.idx.db) mapping trace_id / job_id / intent to
+(segment, byte offset, length), maintained incrementally: each refresh()
+only parses bytes appended since the last one. Lookups then seek straight
+to the matching lines, so /api/why/* costs O(matches) for traces of any age.
+
+Segments:
+  - active:  logs/decision_trace.jsonl
+  - sealed:  logs/decision_trace.<UTC stamp>.jsonl (rotated by DecisionTraceLogger)
+A rotated active segment is recognised by its head bytes and re-labelled
+in place, so rotation never forces a re-index.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HEAD_BYTES = 256
+_INDEXES: Dict[str, "TraceIndex"] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def rotated_segment_path(log_path: Path) -> Path:
+    """Name for sealing the active segment; lexicographic order == age order."""
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    return log_path.with_name(f"{log_path.stem}.{stamp}{log_path.suffix}")
+
+
+def sealed_segments(log_path: Path) -> List[Path]:
+    return sorted(log_path.parent.glob(f"{log_path.stem}.*{log_path.suffix}"))
+
+
+def get_index(log_path: str) -> "TraceIndex":
+    """Shared TraceIndex per log file."""
+    key = str(Path(log_path).resolve())
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = _INDEXES[key] = TraceIndex(Path(log_path))
+        return idx
+
+
+def _read_head(path: Path, n: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(n)
+
+
+class TraceIndex:
+    def __init__(self, log_path: Path, index_path: Optional[Path] = None):
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path else self.log_path.with_name(self.log_path.name + ".idx.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    head BLOB NOT NULL DEFAULT x'',
+                    indexed_bytes INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    segment_id INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    trace_id TEXT,
+                    job_id TEXT,
+                    intent TEXT,
+                    ts TEXT,
+                    PRIMARY KEY (segment_id, offset)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_entries_trace ON entries(trace_id);
+                CREATE INDEX IF NOT EXISTS idx_entries_job ON entries(job_id, ts);
+                CREATE INDEX IF NOT EXISTS idx_entries_intent ON entries(intent, ts);
+            """)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the files on disk. Returns lines added."""
+        with self._lock, self._conn:
+            rows = {name: (sid, bytes(head), indexed)
+                    for sid, name, head, indexed in self._conn.execute(
+                        "SELECT id, name, head, indexed_bytes FROM segments")}
+            on_disk = {p.name: p for p in sealed_segments(self.log_path)}
+            if self.log_path.exists():
+                on_disk[self.log_path.name] = self.log_path
+
+            active = self.log_path.name
+            if active in rows:
+                sid, head, indexed = rows[active]
+                if not self._still_same(self.log_path, head, indexed):
+                    # Rotated (or rewritten): re-label if a new sealed file carries its head
+                    target = next((name for name, p in on_disk.items()
+                                   if name != active and name not in rows and head
+                                   and self._still_same(p, head, indexed)), None)
+                    if target:
+                        self._conn.execute("UPDATE segments SET name = ? WHERE id = ?", (target, sid))
+                        rows[target] = rows.pop(active)
+                    else:
+                        self._drop_segment(sid)
+                        rows.pop(active)
+
+            for name in [n for n in rows if n not in on_disk]:
+                self._drop_segment(rows.pop(name)[0])
+
+            added = 0
+            for name, path in on_disk.items():
+                if name not in rows:
+                    cur = self._conn.execute("INSERT INTO segments (name) VALUES (?)", (name,))
+                    rows[name] = (cur.lastrowid, b"", 0)
+                sid, head, indexed = rows[name]
+                added += self._index_tail(sid, path, head, indexed)
+            return added
+
+    @staticmethod
+    def _still_same(path: Path, head: bytes, indexed: int) -> bool:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False
+        return size >= indexed and _read_head(path, len(head)) == head
+
+    def _drop_segment(self, sid: int) -> None:
+        self._conn.execute("DELETE FROM entries WHERE segment_id = ?", (sid,))
+        self._conn.execute("DELETE FROM segments WHERE id = ?", (sid,))
+
+    def _index_tail(self, sid: int, path: Path, head: bytes, indexed: int) -> int:
+        size = path.stat().st_size
+        if size <= indexed:
+            return 0
+        with open(path, "rb") as f:
+            f.seek(indexed)
+            chunk = f.read(size - indexed)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return 0  # only a partial line so far
+        chunk = chunk[:end + 1]
+
+        batch = []
+        pos = indexed
+        for raw in chunk.splitlines(keepends=True):
+            line = raw.strip()
+            if line:
+                try:
+                    e = json.loads(line)
+                except Exception:
+                    e = None
+                if isinstance(e, dict):
+                    job_id = e.get("job_id")
+                    batch.append((sid, pos, len(raw), e.get("trace_id"),
+                                  str(job_id) if job_id is not None else None,
+                                  e.get("intent"), str(e.get("timestamp", ""))))
+            pos += len(raw)
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO entries (segment_id, offset, length, trace_id, job_id, intent, ts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+        if len(head) < HEAD_BYTES:
+            head = _read_head(path, min(HEAD_BYTES, pos))
+        self._conn.execute("UPDATE segments SET head = ?, indexed_bytes = ? WHERE id = ?", (head, pos, sid))
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return self._read_entries(rows)
+
+    def _read_entries(self, rows: Iterable[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+        """rows: (segment name, offset, length) -> parsed events, in row order."""
+        out: List[Dict[str, Any]] = []
+        handles: Dict[str, Any] = {}
+        try:
+            for name, offset, length in rows:
+                f = handles.get(name)
+                if f is None:
+                    f = handles[name] = open(self.log_path.with_name(name), "rb")
+                f.seek(offset)
+                try:
+                    out.append(json.loads(f.read(length)))
+                except Exception:
+                    continue
+        finally:
+            for f in handles.values():
+                f.close()
+        return out
+
+    _SELECT = "SELECT s.name, e.offset, e.length FROM entries e JOIN segments s ON s.id = e.segment_id "
+
+    def by_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        return self._query(self._SELECT + "WHERE e.trace_id = ?", (trace_id,))
+
+    def trace_ids_for_job(self, job_id: str) -> List[str]:
+        """Trace ids touching job_id, newest first (answered from the index alone)."""
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT trace_id, MAX(ts) AS last_ts FROM entries "
+                "WHERE job_id = ? AND trace_id IS NOT NULL GROUP BY trace_id ORDER BY last_ts DESC",
+                (job_id,),
+            ).fetchall()
+        return [str(r[0]) for r in rows]
+
+    def latest(self, intent: str) -> Optional[Dict[str, Any]]:
+        events = self._query(self._SELECT + "WHERE e.intent = ? ORDER BY e.ts DESC LIMIT 1", (intent,))
+        return events[0] if events else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
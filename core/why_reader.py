@@ -15,19 +15,47 @@ class WhyMeta:
     skipped_invalid_lines: int
 
 
-def _iter_lines_tail(path: Path, max_lines: int) -> Tuple[List[str], int]:
+def _iter_lines_tail(path: Path, max_lines: int, block_size: int = 64 * 1024) -> Tuple[List[str], int]:
     """
-    Simple, deterministic tail by reading all lines then slicing.
-    OK for bounded windows (e.g. 2000/10000) and avoids platform-specific seek hacks.
-    Returns (lines, total_lines).
+    Seek-based tail: reads fixed-size blocks backwards from EOF until
+    max_lines complete lines are collected (cost ~ window, not file size).
+    Returns (lines, lines_read).
     """
-    if not path.exists():
+    if not path.exists() or max_lines <= 0:
         return ([], 0)
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    total = len(lines)
-    if max_lines <= 0:
-        return ([], total)
-    return (lines[-max_lines:], total)
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= max_lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    raw_lines = buf.splitlines()
+    if pos > 0:
+        raw_lines = raw_lines[1:]  # first line may be cut by the block boundary
+    lines = [ln.decode("utf-8", errors="replace") for ln in raw_lines[-max_lines:]]
+    return (lines, len(lines))
+
+
+def _index_for(log_path: str):
+    """
+    Offset index for log_path, or None (falls back to the tail window).
+    Opened whenever there is something to index or already indexed, so
+    sealed segments stay searchable while no active file exists (e.g.
+    right after rotation).
+    """
+    try:
+        from core.why_index import get_index, sealed_segments
+        p = Path(log_path)
+        sidecar = p.with_name(p.name + ".idx.db")
+        if not (p.exists() or sidecar.exists() or sealed_segments(p)):
+            return None
+        return get_index(log_path)
+    except Exception as e:
+        print(f"[why] Trace index unavailable for {log_path}: {e}")
+        return None
 
 
 def _parse_json_lines(lines: Iterable[str]) -> Tuple[List[Dict[str, Any]], int]:
@@ -57,6 +85,12 @@ def latest_event(
     intent: Optional[str] = None,
     max_lines: int = 2000,
 ) -> Tuple[Optional[Dict[str, Any]], WhyMeta]:
+    if intent:
+        idx = _index_for(log_path)
+        if idx is not None:
+            ev = idx.latest(intent)
+            n = 1 if ev else 0
+            return ev, WhyMeta(scanned_lines=n, returned=n, skipped_invalid_lines=0)
     events, meta = tail_events(log_path, max_lines=max_lines)
     if intent:
         events = [e for e in events if e.get("intent") == intent]
@@ -69,8 +103,14 @@ def latest_event(
 
 
 def trace_by_id(log_path: str, trace_id: str, max_lines: int = 10000) -> Tuple[List[Dict[str, Any]], WhyMeta]:
-    events, meta = tail_events(log_path, max_lines=max_lines)
-    filtered = [e for e in events if e.get("trace_id") == trace_id]
+    """All nodes of trace_id. Indexed (any age); max_lines only bounds the fallback scan."""
+    idx = _index_for(log_path)
+    if idx is not None:
+        filtered = idx.by_trace(trace_id)
+        meta = WhyMeta(scanned_lines=len(filtered), returned=len(filtered), skipped_invalid_lines=0)
+    else:
+        events, meta = tail_events(log_path, max_lines=max_lines)
+        filtered = [e for e in events if e.get("trace_id") == trace_id]
     # Stable ordering: timestamp then depth
     filtered.sort(key=lambda e: (str(e.get("timestamp", "")), int(e.get("depth", 0))))
     meta = WhyMeta(scanned_lines=meta.scanned_lines, returned=len(filtered), skipped_invalid_lines=meta.skipped_invalid_lines)
@@ -78,6 +118,11 @@ def trace_by_id(log_path: str, trace_id: str, max_lines: int = 10000) -> Tuple[L
 
 
 def traces_by_job_id(log_path: str, job_id: str, max_lines: int = 10000) -> Tuple[List[str], WhyMeta]:
+    """Trace ids for job_id, newest first. Indexed (any age); max_lines only bounds the fallback scan."""
+    idx = _index_for(log_path)
+    if idx is not None:
+        uniq = idx.trace_ids_for_job(job_id)
+        return uniq, WhyMeta(scanned_lines=len(uniq), returned=len(uniq), skipped_invalid_lines=0)
     events, meta = tail_events(log_path, max_lines=max_lines)
     trace_ids = []
     for e in events:
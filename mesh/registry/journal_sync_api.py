@@ -1,18 +1,110 @@
 """
 Writer HTTP API for Journal Sync.
 
-Serves journal segments via HTTP for replica nodes to consume.
+Serves journal segments via HTTP for replica nodes to consume. Each segment
+is bounded by max_bytes, ends on a complete line and is streamed from disk;
+responses are gzip-compressed for clients that accept it.
 """
+import json
 import os
+import threading
 from pathlib import Path
-from fastapi import FastAPI, Query, Response
-from fastapi.responses import PlainTextResponse
+from fastapi import FastAPI, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import uvicorn
 
 app = FastAPI(title="Ledger Journal Sync API")
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Configuration
 JOURNAL_PATH = Path(os.getenv("LEDGER_JOURNAL_PATH", "ledger_events.jsonl"))
+DEFAULT_MAX_BYTES = int(os.getenv("LEDGER_SYNC_MAX_BYTES", str(1024 * 1024)))
+MAX_BYTES_LIMIT = 64 * 1024 * 1024
+_BLOCK = 64 * 1024
+
+# Events counted so far, advanced incrementally so /health and /journal do
+# not rescan the whole journal
+_count_lock = threading.Lock()
+_counted = {"offset": 0, "events": 0}
+
+
+def _count_events(size: int) -> int:
+    """Number of complete lines in the first size bytes of the journal."""
+    with _count_lock:
+        if size < _counted["offset"]:
+            # Journal was replaced
+            _counted.update(offset=0, events=0)
+        with open(JOURNAL_PATH, 'rb') as f:
+            f.seek(_counted["offset"])
+            while _counted["offset"] < size:
+                block = f.read(min(_BLOCK, size - _counted["offset"]))
+                if not block:
+                    break
+                _counted["events"] += block.count(b"\n")
+                _counted["offset"] += len(block)
+        return _counted["events"]
+
+
+def _chunk_end(f, offset: int, size: int, max_bytes: int) -> int:
+    """
+    End of the last complete line in [offset, offset + max_bytes). A first
+    line longer than max_bytes is returned whole so replicas always progress.
+    """
+    limit = min(size, offset + max_bytes)
+    pos = limit
+    while pos > offset:
+        start = max(offset, pos - _BLOCK)
+        f.seek(start)
+        newline = f.read(pos - start).rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        pos = start
+
+    f.seek(limit)
+    pos = limit
+    while pos < size:
+        block = f.read(min(_BLOCK, size - pos))
+        if not block:
+            break
+        newline = block.find(b"\n")
+        if newline >= 0:
+            return pos + newline + 1
+        pos += len(block)
+    # No complete line yet
+    return offset
+
+
+def _last_event(f, start: int, end: int) -> dict:
+    """Parse the last line in [start, end), which ends with a newline."""
+    pos = end - 1
+    tail = b""
+    while pos > start:
+        read_from = max(start, pos - _BLOCK)
+        f.seek(read_from)
+        tail = f.read(pos - read_from) + tail
+        newline = tail.rfind(b"\n")
+        if newline >= 0:
+            tail = tail[newline + 1:]
+            break
+        pos = read_from
+    try:
+        return json.loads(tail)
+    except Exception:
+        return {}
+
+
+def _stream(start: int, end: int):
+    with open(JOURNAL_PATH, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(_BLOCK, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
 
 @app.get("/health")
 def health():
@@ -25,30 +117,25 @@ def health():
             "last_event_ts": None,
             "total_events": 0
         }
-    
+
     size = JOURNAL_PATH.stat().st_size
-    
+
     # Read last line to get metadata
     last_hash = None
     last_ts = None
     total_events = 0
-    
+
     try:
-        with open(JOURNAL_PATH, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    total_events += 1
-            # Go back to read last line
-            f.seek(max(0, size - 1024))
-            lines = f.readlines()
-            if lines:
-                import json
-                last_event = json.loads(lines[-1])
+        total_events = _count_events(size)
+        with open(JOURNAL_PATH, 'rb') as f:
+            end = _chunk_end(f, 0, size, size)
+            if end:
+                last_event = _last_event(f, 0, end)
                 last_hash = last_event.get("hash")
                 last_ts = last_event.get("ts")
     except Exception:
         pass
-    
+
     return {
         "status": "ok",
         "journal_size_bytes": size,
@@ -58,10 +145,17 @@ def health():
     }
 
 @app.get("/journal")
-def get_journal(offset: int = Query(0, ge=0)):
+def get_journal(
+    offset: int = Query(0, ge=0),
+    max_bytes: int = Query(DEFAULT_MAX_BYTES, ge=1, le=MAX_BYTES_LIMIT)
+):
     """
     Serves journal content starting from byte offset.
-    Only returns complete lines (ending with newline).
+    Only returns complete lines (ending with newline), at most max_bytes
+    unless a single line is longer.
+
+    Headers report the segment end (X-Journal-Next-Offset), its last event,
+    and the journal size and event count so replicas can report their lag.
     """
     if not JOURNAL_PATH.exists():
         return PlainTextResponse(
@@ -69,12 +163,18 @@ def get_journal(offset: int = Query(0, ge=0)):
             headers={
                 "X-Journal-Next-Offset": "0",
                 "X-Journal-Last-Hash": "",
-                "X-Journal-Last-TS": "0"
+                "X-Journal-Last-TS": "0",
+                "X-Journal-Size": "0",
+                "X-Journal-Events": "0"
             }
         )
-    
+
     file_size = JOURNAL_PATH.stat().st_size
-    
+    headers = {
+        "X-Journal-Size": str(file_size),
+        "X-Journal-Events": str(_count_events(file_size))
+    }
+
     if offset >= file_size:
         # Already at end
         return PlainTextResponse(
@@ -82,53 +182,23 @@ def get_journal(offset: int = Query(0, ge=0)):
             headers={
                 "X-Journal-Next-Offset": str(file_size),
                 "X-Journal-Last-Hash": "",
-                "X-Journal-Last-TS": "0"
+                "X-Journal-Last-TS": "0",
+                **headers
             }
         )
-    
-    # Read from offset to end
+
     with open(JOURNAL_PATH, 'rb') as f:
-        f.seek(offset)
-        chunk = f.read()
-    
-    # Decode and find last complete line
-    try:
-        text = chunk.decode('utf-8')
-    except UnicodeDecodeError:
-        # Partial UTF-8 sequence, truncate
-        text = chunk.decode('utf-8', errors='ignore')
-    
-    # Only return complete lines
-    if text and not text.endswith('\n'):
-        last_newline = text.rfind('\n')
-        if last_newline >= 0:
-            text = text[:last_newline + 1]
-        else:
-            # No complete lines in this chunk
-            text = ""
-    
-    next_offset = offset + len(text.encode('utf-8'))
-    
-    # Extract last hash and ts
-    last_hash = ""
-    last_ts = "0"
-    if text.strip():
-        lines = text.strip().split('\n')
-        if lines:
-            import json
-            try:
-                last_event = json.loads(lines[-1])
-                last_hash = last_event.get("hash", "")
-                last_ts = str(last_event.get("ts", 0))
-            except Exception:
-                pass
-    
-    return PlainTextResponse(
-        content=text,
+        next_offset = _chunk_end(f, offset, file_size, max_bytes)
+        last_event = _last_event(f, offset, next_offset) if next_offset > offset else {}
+
+    return StreamingResponse(
+        _stream(offset, next_offset),
+        media_type="text/plain; charset=utf-8",
         headers={
             "X-Journal-Next-Offset": str(next_offset),
-            "X-Journal-Last-Hash": last_hash,
-            "X-Journal-Last-TS": last_ts
+            "X-Journal-Last-Hash": last_event.get("hash", ""),
+            "X-Journal-Last-TS": str(last_event.get("ts", 0)),
+            **headers
         }
     )
 
@@ -3,38 +3,63 @@ Service layer for the mesh fake ledger.
 
 This module provides a high-level business API for ledger operations,
 managing state persistence and providing convenient wrapper functions.
+
+The journal (core.ledger_journal) is authoritative: an operation commits
+when its event is appended, and the in-memory state is updated from that
+event. ledger.json is a periodic snapshot that records the journal offset
+it reflects; startup loads it and replays the journal tail. Transfer history
+goes to an indexed TransferStore, not into ledger.json.
 """
 
+import contextlib
+import json
+import os
+import time
 from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal, ROUND_DOWN
 from pathlib import Path
 from threading import Lock
-from typing import Optional, Set
+from typing import Any, Optional, Set
 
 from .ledger_store import (
     LedgerState,
     TransferRecord,
     load_state,
     save_state,
+    create_empty_state,
     ensure_account,
     get_balance,
     can_pay,
-    transfer,
-    get_transfers,
+    validate_transfer,
+    record_transfer,
     AccountNotFoundError,
     InsufficientBalanceError,
     LedgerError,
 )
-from core.utils.atomic_io import json_lock, atomic_write_json
+from .transfer_store import TransferStore
+from core.utils.atomic_io import json_lock
+
+SYSTEM_ACCOUNT = "system"
+SYSTEM_BALANCE = 10**18  # Effectively unlimited
 
 
 @dataclass
 class LedgerConfig:
-    """Configuration for the ledger service."""
+    """
+    Configuration for the ledger service.
+    
+    journal_path, index_path, domain_lock_path and transfers_path default to
+    files next to ledger_path (<stem>_events.jsonl, <stem>_job_index.json,
+    <stem>_domain.lock, <stem>_transfers.db), so a snapshot is always
+    paired with its own journal whatever the working directory. Derived
+    paths remember legacy_dir, where older versions kept these files, so an
+    upgraded ledger without a paired journal keeps using its old one.
+    """
     ledger_path: Path = Path("ledger.json")
-    journal_path: Path = Path("ledger_events.jsonl")
-    index_path: Path = Path("ledger_job_index.json")
-    domain_lock_path: Path = Path("ledger_domain.lock")
+    journal_path: Optional[Path] = None
+    index_path: Optional[Path] = None
+    domain_lock_path: Optional[Path] = None
     default_provider_account: str = "mesh_provider"
     operator_account: str = "system:operator"
     default_margin: float = 0.10
@@ -42,7 +67,20 @@ class LedgerConfig:
     margin_k1: float = 0.20 # Success rate weight
     margin_k2: float = 0.10 # Latency weight
     auto_create_accounts: bool = True
-    snapshot_interval: int = 100  # Create a checkpoint every 100 events
+    snapshot_interval: int = 100  # Snapshot ledger.json every 100 events...
+    snapshot_interval_sec: float = 30.0  # ...or after this many seconds with new events
+    checkpoint_interval: int = 10_000  # Journal checkpoint sidecar record every N events
+    
+    # Transfer history (SQLite)
+    transfers_path: Optional[Path] = None
+    transfer_retention_days: Optional[float] = None
+    transfer_max_records: Optional[int] = None
+    
+    # Group commit: journal appends batched by a JournalWriter (one fsync per
+    # batch). Only for a process that is the journal's sole writer.
+    group_commit: bool = False
+    group_commit_max_batch: int = 512
+    group_commit_max_latency_ms: float = 0.0
     
     # Governance Polish
     gov_enabled: bool = True
@@ -54,6 +92,40 @@ class LedgerConfig:
     writer_url: Optional[str] = None
     sync_interval: int = 5  # seconds
     readonly_enforced: bool = True
+    
+    # Directory of the pre-pairing defaults (ledger_events.jsonl,
+    # ledger_job_index.json, ledger_domain.lock); the working directory
+    legacy_dir: Optional[Path] = None
+
+    def __post_init__(self):
+        self.ledger_path = Path(self.ledger_path)
+        stem = self.ledger_path.stem
+        if self.journal_path is None:
+            self.journal_path = self.ledger_path.with_name(f"{stem}_events.jsonl")
+            if self.legacy_dir is None:
+                self.legacy_dir = Path(".")
+        if self.index_path is None:
+            self.index_path = self.ledger_path.with_name(f"{stem}_job_index.json")
+        if self.domain_lock_path is None:
+            self.domain_lock_path = self.ledger_path.with_name(f"{stem}_domain.lock")
+        if self.transfers_path is None:
+            self.transfers_path = self.ledger_path.with_name(f"{stem}_transfers.db")
+
+
+def _amount(raw: Any) -> float:
+    """Parse a journal decimal-string amount (integral amounts stay int)."""
+    text = str(raw).strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _event_timestamp(raw: dict) -> Optional[str]:
+    ts = raw.get("ts")
+    if ts is None:
+        return None
+    return datetime.utcfromtimestamp(float(ts)).isoformat() + "Z"
 
 
 class LedgerService:
@@ -62,6 +134,16 @@ class LedgerService:
     
     This service manages the ledger state, handles persistence,
     and provides thread-safe access to ledger operations.
+    
+    Every mutation appends to the journal under the domain lock (the commit
+    point) and is then applied to the in-memory state by _apply(), the same
+    code that replays the journal at startup. Before mutating, the service
+    applies events other processes appended since its journal offset.
+    
+    With config.group_commit the service is the journal's sole writer: it
+    skips the domain lock and catch-up, hands events to a JournalWriter and
+    applies them right away, then waits for durability outside its lock so
+    concurrent operations share one fsync.
     """
     
     def __init__(self, config: Optional[LedgerConfig] = None):
@@ -72,38 +154,163 @@ class LedgerService:
             config: Optional configuration (uses defaults if not provided)
         """
         self.config = config or LedgerConfig()
-        from core.ledger_journal import append_event, read_events
+        self._adopt_legacy_paths()
+        from core.ledger_journal import (
+            HASH_CHAIN_ENABLED, JournalWriter, append_event, journal_job_ids, load_checkpoints,
+            normalize_event, read_events_from, verify_lines, write_checkpoints, _read_last_hash_fast
+        )
         self._append_event = append_event # Keep reference to function
-        self._read_events = read_events
-        self._state: LedgerState = load_state(self.config.ledger_path)
+        self._normalize_event = normalize_event
+        self._journal_job_ids = journal_job_ids
+        self._write_checkpoints = write_checkpoints
+        self._read_events_from = read_events_from
+        self._hash_at = _read_last_hash_fast
+        self._verify_lines = verify_lines if HASH_CHAIN_ENABLED else None
+        self._writer_cls = JournalWriter
+        self._writer = self._new_writer()
+        self._tail_future = None
+        self._transfers = TransferStore(
+            self.config.transfers_path,
+            retention_days=self.config.transfer_retention_days,
+            max_records=self.config.transfer_max_records,
+        )
+        self._pending_transfers: list[TransferRecord] = []
+        self._state: LedgerState = create_empty_state()
         self._lock = Lock()
         self._settled_jobs: Set[str] = set()
+        self._journal_offset = 0
+        self._journal_hash = "GENESIS"
+        self._journal_events = 0
         self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        checkpoints = load_checkpoints(str(self.config.journal_path))
+        self._checkpoint_events = checkpoints[-1]["events"] if checkpoints else 0
         
-        # Load idempotency index and catch up from journal
-        self._load_job_index()
-        
-        # Ensure default provider and operator accounts exist
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
+                # Snapshot + journal tail replay
+                stale = self._recover()
                 # Ensure operator clearing account
                 ensure_account(self._state, self.config.operator_account, 0)
                 
-                # Ensure default provider account exists
-                if self.config.default_provider_account:
-                    created = ensure_account(self._state, self.config.default_provider_account, 0)
-                    if created:
-                        self._append_event(
-                            {"type": "credit", "account": self.config.default_provider_account, "amount": "0", "reason": "initial_funding"},
-                            journal_path=str(self.config.journal_path),
-                            domain_lock=str(self.config.domain_lock_path),
-                            lock=False
-                        )
-                self._save()
+                # Ensure default provider account exists (a replica gets it from the writer)
+                provider = self.config.default_provider_account
+                if provider and provider not in self._state["accounts"] and self.config.mode != "replica":
+                    self._commit({"type": "credit", "account": provider, "amount": "0", "reason": "initial_funding"})
+                if stale or self._events_since_snapshot:
+                    self._save()
+        self._wait_durable()
+
+    def _adopt_legacy_paths(self) -> None:
+        """
+        Keep using the working-directory journal (and index and domain lock)
+        of a ledger written before they were paired with ledger_path. A new
+        empty journal would forget the settled jobs and restart the chain.
+        """
+        config = self.config
+        legacy_dir = config.legacy_dir
+        if (legacy_dir is None or config.mode == "replica"
+                or config.journal_path.exists() or not config.ledger_path.exists()):
+            return
+        legacy_journal = Path(legacy_dir) / "ledger_events.jsonl"
+        if not legacy_journal.exists() or legacy_journal.resolve() == config.journal_path.resolve():
+            return
+        meta = load_state(config.ledger_path).get("snapshot")
+        if meta is not None and int(meta.get("journal_offset", 0)) == 0:
+            # Snapshot of an empty journal: nothing to continue
+            return
+        
+        stem = config.ledger_path.stem
+        print(f"[ledger] {config.journal_path} not found, continuing the legacy journal {legacy_journal}")
+        config.journal_path = legacy_journal
+        if config.index_path == config.ledger_path.with_name(f"{stem}_job_index.json"):
+            config.index_path = Path(legacy_dir) / "ledger_job_index.json"
+        if config.domain_lock_path == config.ledger_path.with_name(f"{stem}_domain.lock"):
+            config.domain_lock_path = Path(legacy_dir) / "ledger_domain.lock"
+
+    def _new_writer(self):
+        if not self.config.group_commit:
+            return None
+        return self._writer_cls(
+            str(self.config.journal_path),
+            max_batch=self.config.group_commit_max_batch,
+            max_latency_ms=self.config.group_commit_max_latency_ms,
+            domain_lock=str(self.config.domain_lock_path),
+        )
+
+    def _domain_lock(self):
+        """Cross-process domain lock; not needed by a group-commit (sole) writer."""
+        if self._writer is not None:
+            return contextlib.nullcontext()
+        return json_lock(str(self.config.domain_lock_path))
+
+    def _recover(self) -> bool:
+        """
+        Load the snapshot and replay the journal tail (assumes locks are held).
+        
+        Returns True if the snapshot on disk has to be rewritten.
+        
+        Raises:
+            LedgerError: If the snapshot does not match the journal (e.g. the
+                journal of another ledger, or a missing one). Nothing is
+                written: replaying an unrelated journal would replace the
+                snapshot's balances.
+        """
+        journal = str(self.config.journal_path)
+        journal_size = os.path.getsize(journal) if os.path.exists(journal) else 0
+        state = load_state(self.config.ledger_path)
+        meta = state.pop("snapshot", None)
+        legacy_transfers = state.pop("transfers", None)
+        
+        if self.config.mode == "replica" and self.config.ledger_path.exists():
+            # A replica's files must mirror the writer's journal; older ones
+            # cannot be continued and are rebuilt from the writer instead
+            if meta is None:
+                self._reset_replica_files("ledger.json has no journal position (written by an older version)")
+                return True
+            offset = int(meta.get("journal_offset", 0))
+            if offset > journal_size or self._hash_at(journal, offset) != meta.get("last_hash", "GENESIS"):
+                self._reset_replica_files(f"snapshot does not match the local journal at offset {offset}")
+                return True
+        
+        if meta is not None:
+            offset = int(meta.get("journal_offset", 0))
+            if offset > journal_size or self._hash_at(journal, offset) != meta.get("last_hash", "GENESIS"):
+                raise LedgerError(
+                    f"Snapshot {self.config.ledger_path} does not match journal {journal} at offset {offset}; "
+                    f"refusing to start (restore the journal or move the snapshot aside to rebuild from it)"
+                )
+        
+        if legacy_transfers:
+            # History used to be kept inside ledger.json: move it to the store
+            self._transfers.add_many(legacy_transfers)
+            print(f"[ledger] Migrated {len(legacy_transfers)} transfers to {self._transfers.path}")
+        
+        if meta is None and self.config.ledger_path.exists():
+            # Legacy ledger.json was rewritten after every append: it already
+            # reflects the whole journal.
+            self._state = state
+            self._journal_offset = journal_size
+            self._journal_hash = self._hash_at(journal)
+            self._load_job_index()
+            # Jobs settled into the migrated history count as settled even
+            # when their journal is gone
+            self._settled_jobs.update(t["job_id"] for t in legacy_transfers or () if t.get("job_id"))
+            return True
+        
+        if meta is not None:
+            self._state = state
+            self._journal_offset = offset
+            self._journal_hash = meta.get("last_hash", "GENESIS")
+            self._journal_events = int(meta.get("events", 0))
+            self._settled_jobs = set(meta.get("settled_jobs", []))
+        
+        self._replay_tail()
+        return (meta is None or legacy_transfers is not None
+                or self._journal_offset != int(meta.get("journal_offset", 0)))
 
     def _load_job_index(self) -> None:
-        """Populate the settled jobs index from disk, then catch up from journal."""
+        """Populate the settled jobs index of a legacy ledger from disk and the journal."""
         # 1. Load from persistent index file
         if self.config.index_path.exists():
             try:
@@ -114,31 +321,293 @@ class LedgerService:
             except Exception:
                 pass
 
-        # 2. Catch up from journal (O(N) only for events NOT in index yet)
-        # Note: In v1 we scan everything if index is empty. 
-        # In v2 we could store 'last_journal_offset' in the index.
+        # 2. Catch up from journal: job ids of the trusted checkpoints plus a
+        # scan of the tail after them. Done once: afterwards the settled jobs
+        # live in the snapshot and only the journal tail is replayed.
         try:
-            for ev in self._read_events(str(self.config.journal_path)):
-                jid = ev.raw.get("job_id")
-                if jid:
-                    self._settled_jobs.add(str(jid))
+            job_ids, self._journal_events = self._journal_job_ids(str(self.config.journal_path))
+            self._settled_jobs.update(job_ids)
         except Exception:
             pass
 
-    def _save_job_index(self) -> None:
-        """Persist the job index to disk."""
+    def _catch_up(self) -> None:
+        """Apply journal events appended by other processes since our offset (assumes locks are held)."""
+        if self._writer is None:
+            self._replay_tail()
+
+    def _replay_tail(self) -> None:
+        """Apply journal events after our offset (assumes locks are held)."""
+        journal = str(self.config.journal_path)
         try:
-            atomic_write_json(str(self.config.index_path), list(self._settled_jobs))
-        except Exception:
-            pass
+            size = os.path.getsize(journal)
+        except OSError:
+            return
+        if size == self._journal_offset:
+            return
+        if size < self._journal_offset:
+            raise LedgerError(f"Journal {journal} shrank below offset {self._journal_offset}")
+        for ev, end in self._read_events_from(journal, self._journal_offset):
+            self._apply(ev.raw)
+            self._journal_offset = end
+            self._events_since_snapshot += 1
+
+    def _apply(self, raw: dict) -> Optional[TransferRecord]:
+        """Apply one committed journal event to the in-memory state (assumes lock is held)."""
+        state = self._state
+        accounts = state["accounts"]
+        etype = raw.get("type")
+        account = str(raw.get("account", ""))
+        to_account = raw.get("to_account")
+        amount = _amount(raw.get("amount", "0"))
+        job_id = raw.get("job_id")
+        note = raw.get("note")
+        stamp = {"record_id": raw.get("event_id"), "timestamp": _event_timestamp(raw)}
+        record = None
+        
+        if to_account:
+            # Double-entry move
+            ensure_account(state, account, 0)
+            ensure_account(state, to_account, 0)
+            record = record_transfer(state, account, to_account, amount, job_id, note, **stamp)
+        elif etype == "credit":
+            if raw.get("reason") == "initial_funding" and account not in accounts:
+                ensure_account(state, account, amount)
+            else:
+                # Credits are paid out of the system account
+                ensure_account(state, SYSTEM_ACCOUNT, SYSTEM_BALANCE)
+                ensure_account(state, account, 0)
+                if accounts[SYSTEM_ACCOUNT]["balance"] < amount:
+                    accounts[SYSTEM_ACCOUNT]["balance"] = SYSTEM_BALANCE
+                record = record_transfer(state, SYSTEM_ACCOUNT, account, amount, None, note, **stamp)
+        elif etype == "charge" and raw.get("worker_id"):
+            ensure_account(state, account, 0)
+            ensure_account(state, raw["worker_id"], 0)
+            record = record_transfer(state, account, raw["worker_id"], amount, job_id, note, **stamp)
+        elif etype in ("debit", "charge", "transfer"):
+            ensure_account(state, account, 0)
+            accounts[account]["balance"] -= amount
+        elif etype == "adjust":
+            ensure_account(state, account, 0)
+            accounts[account]["balance"] += amount
+        
+        if job_id:
+            self._settled_jobs.add(str(job_id))
+        self._journal_hash = raw.get("hash", self._journal_hash)
+        self._journal_events += 1
+        if record is not None:
+            self._pending_transfers.append(record)
+        return record
+
+    def _commit(self, event: dict) -> Optional[TransferRecord]:
+        """Append an event to the journal and apply it (assumes domain lock and lock are held)."""
+        if self._writer is not None:
+            # Submission order is chain order; durability is awaited by _wait_durable()
+            ev = self._normalize_event(event)
+            self._tail_future = self._writer.submit(ev)
+            self._events_since_snapshot += 1
+            return self._apply(ev)
+        
+        ev = self._append_event(
+            event,
+            journal_path=str(self.config.journal_path),
+            domain_lock=str(self.config.domain_lock_path),
+            lock=False
+        )
+        record = self._apply(ev)
+        # We hold the domain lock, so our line is the last one
+        self._journal_offset = os.path.getsize(self.config.journal_path)
+        self._events_since_snapshot += 1
+        return record
+
+    def _maybe_snapshot(self) -> None:
+        """Snapshot every snapshot_interval events or snapshot_interval_sec seconds (assumes lock is held)."""
+        if not self._events_since_snapshot:
+            return
+        if (self._events_since_snapshot >= self.config.snapshot_interval
+                or time.monotonic() - self._last_snapshot_at >= self.config.snapshot_interval_sec):
+            self._save()
     
+    def _wait_durable(self) -> None:
+        """
+        Group commit: wait until the latest submitted event is fsynced. The
+        writer is FIFO and fail-stop, so this covers the caller's own events.
+        On failure the in-memory state is rebuilt from disk.
+        """
+        future = self._tail_future
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception:
+            with self._lock:
+                if self._writer.failed is not None:
+                    self._writer.close()
+                    self._writer = self._new_writer()
+                    self._tail_future = None
+                    self._state = create_empty_state()
+                    self._settled_jobs = set()
+                    self._pending_transfers = []
+                    self._journal_offset, self._journal_hash, self._journal_events = 0, "GENESIS", 0
+                    self._recover()
+                    ensure_account(self._state, self.config.operator_account, 0)
+            raise
+
     def _save(self) -> None:
-        """Save current state to disk (internal, assumes lock is held)."""
-        save_state(self._state, self.config.ledger_path)
-    
-    def _reload(self) -> None:
-        """Reload state from disk (internal, assumes lock is held)."""
-        self._state = load_state(self.config.ledger_path)
+        """Write the snapshot: state plus the journal position it reflects (assumes lock is held)."""
+        if self._writer is not None:
+            # The state includes queued events: snapshot only once they are durable
+            self._writer.flush()
+            if self._writer.failed is not None:
+                return
+            if self._writer.offset is not None:
+                self._journal_offset = self._writer.offset
+                self._journal_hash = self._writer.head_hash
+        # History first: anything not stored yet is in the tail the next start replays
+        self._flush_transfers()
+        self._transfers.compact()
+        snapshot = dict(self._state)
+        snapshot["snapshot"] = {
+            "journal_offset": self._journal_offset,
+            "last_hash": self._journal_hash,
+            "events": self._journal_events,
+            "settled_jobs": sorted(self._settled_jobs),
+            "taken_at": time.time(),
+        }
+        save_state(snapshot, self.config.ledger_path)
+        self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        
+        if self._journal_events - self._checkpoint_events >= self.config.checkpoint_interval:
+            try:
+                self._write_checkpoints(str(self.config.journal_path), every=self.config.checkpoint_interval)
+            except Exception as e:
+                print(f"[ledger] Failed to write journal checkpoints: {e}")
+            self._checkpoint_events = self._journal_events
+
+    def _flush_transfers(self) -> None:
+        """Write pending transfer records to the store (assumes lock is held)."""
+        if self._pending_transfers:
+            self._transfers.add_many(self._pending_transfers)
+            self._pending_transfers = []
+
+    def snapshot(self) -> None:
+        """Write a snapshot now (e.g. on shutdown) so the next start replays no tail."""
+        with self._lock:
+            self._save()
+
+    def close(self) -> None:
+        """Snapshot and stop the group-commit writer, if any."""
+        self.snapshot()
+        if self._writer is not None:
+            self._writer.close()
+        self._transfers.close()
+
+    def reset_replica(self, reason: str) -> None:
+        """
+        Discard a replica's local ledger and journal and start again from an
+        empty state, to be rebuilt from the writer. The old files are moved
+        aside, not deleted.
+        
+        Args:
+            reason: Why the local files cannot be continued (logged)
+            
+        Raises:
+            LedgerError: If this service is not a replica
+        """
+        if self.config.mode != "replica":
+            raise LedgerError("Only a replica can be reset")
+        with self._domain_lock():
+            with self._lock:
+                self._reset_replica_files(reason)
+                ensure_account(self._state, self.config.operator_account, 0)
+                self._save()
+
+    def _reset_replica_files(self, reason: str) -> None:
+        """Move the replica's files aside and reset the in-memory state (assumes locks are held)."""
+        suffix = f".replaced-{int(time.time())}"
+        journal = Path(self.config.journal_path)
+        transfers = Path(self.config.transfers_path)
+        self._transfers.close()
+        moved = []
+        for path in (
+            Path(self.config.ledger_path),
+            journal,
+            journal.with_name(journal.name + ".checkpoints.jsonl"),
+            Path(self.config.index_path),
+            transfers,
+            transfers.with_name(transfers.name + "-wal"),
+            transfers.with_name(transfers.name + "-shm"),
+        ):
+            if path.exists():
+                path.rename(path.with_name(path.name + suffix))
+                moved.append(path.name)
+        print(f"[ledger] Replica reset: {reason}; moved aside {moved} (suffix {suffix}), rebuilding from the writer")
+        
+        self._transfers = TransferStore(
+            self.config.transfers_path,
+            retention_days=self.config.transfer_retention_days,
+            max_records=self.config.transfer_max_records,
+        )
+        self._pending_transfers = []
+        self._state = create_empty_state()
+        self._settled_jobs = set()
+        self._journal_offset, self._journal_hash, self._journal_events = 0, "GENESIS", 0
+        self._checkpoint_events = 0
+        self._events_since_snapshot = 0
+
+    def journal_position(self) -> dict:
+        """Return the journal offset, head hash and event count the state reflects."""
+        with self._lock:
+            return {
+                "offset": self._journal_offset,
+                "last_hash": self._journal_hash,
+                "events": self._journal_events,
+            }
+
+    def apply_replicated(self, offset: int, data: bytes) -> int:
+        """
+        Append a journal segment received from the writer and apply it.
+        
+        A replica's journal mirrors the writer's byte for byte, so the segment
+        must start at our journal offset and continue our hash chain. It is
+        appended with one fsync, applied in one pass and followed by a single
+        snapshot.
+        
+        Args:
+            offset: Writer journal offset the segment starts at
+            data: Complete journal lines
+            
+        Returns:
+            Number of events applied
+            
+        Raises:
+            LedgerError: If the segment does not continue the local journal
+        """
+        if self._writer is not None:
+            raise LedgerError("A group-commit writer cannot apply replicated events")
+        if data and not data.endswith(b"\n"):
+            raise LedgerError("Replicated segment must end with a complete line")
+        with self._domain_lock():
+            with self._lock:
+                self._catch_up()
+                if offset != self._journal_offset:
+                    raise LedgerError(f"Replicated segment starts at {offset}, local journal is at {self._journal_offset}")
+                if not data:
+                    return 0
+                lines = data.splitlines(keepends=True)
+                if self._verify_lines is not None:
+                    ok, details = self._verify_lines(lines, self._journal_hash, self._journal_events + 1)
+                    if not ok:
+                        raise LedgerError(f"Replicated segment breaks the hash chain: {details}")
+                self.config.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.config.journal_path, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                before = self._journal_events
+                self._replay_tail()
+                self._save()
+                return self._journal_events - before
     
     def create_account_if_missing(
         self,
@@ -148,19 +617,15 @@ class LedgerService:
         """
         Create an account if it doesn't exist.
         """
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
-                created = ensure_account(self._state, account_id, initial_balance)
-                if created:
-                    self._append_event(
-                        {"type": "credit", "account": account_id, "amount": str(initial_balance), "reason": "initial_funding"},
-                        journal_path=str(self.config.journal_path),
-                        domain_lock=str(self.config.domain_lock_path),
-                        lock=False
-                    )
-                    self._save()
-                return created
+                self._catch_up()
+                if account_id in self._state["accounts"]:
+                    return False
+                self._commit({"type": "credit", "account": account_id, "amount": str(initial_balance), "reason": "initial_funding"})
+                self._maybe_snapshot()
+        self._wait_durable()
+        return True
     
     def get_balance(self, account_id: str) -> int:
         """
@@ -182,9 +647,9 @@ class LedgerService:
         """
         Check if an account has sufficient balance.
         """
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
+                self._catch_up()
                 return can_pay(self._state, payer_id, amount)
     
     def charge(
@@ -198,32 +663,26 @@ class LedgerService:
         """
         Charge tokens from payer to receiver.
         """
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
-                # Auto-create accounts if configured
-                if self.config.auto_create_accounts:
-                    ensure_account(self._state, payer_id, 0)
-                    ensure_account(self._state, receiver_id, 0)
-                
-                # Journal First
-                self._append_event(
-                    {
-                        "type": "charge", 
-                        "account": payer_id, 
-                        "amount": str(amount), 
-                        "job_id": job_id, 
-                        "worker_id": receiver_id, 
-                        "reason": note or "job_execution"
-                    },
-                    journal_path=str(self.config.journal_path),
-                    domain_lock=str(self.config.domain_lock_path),
-                    lock=False
-                )
+                self._catch_up()
+                # Missing accounts are created by _apply() from the committed
+                # event (auto_create_accounts), never by a failed charge
+                validate_transfer(self._state, payer_id, receiver_id, amount,
+                                  allow_missing=self.config.auto_create_accounts)
                 
-                record = transfer(self._state, payer_id, receiver_id, amount, job_id, note)
-                self._save()
-                return record
+                record = self._commit({
+                    "type": "charge", 
+                    "account": payer_id, 
+                    "amount": str(amount), 
+                    "job_id": job_id, 
+                    "worker_id": receiver_id, 
+                    "reason": note or "job_execution",
+                    "note": note
+                })
+                self._maybe_snapshot()
+        self._wait_durable()
+        return record
     
     def credit(
         self,
@@ -234,52 +693,49 @@ class LedgerService:
         """
         Credit tokens to an account (admin/god mode).
         """
-        system_account = "system"
+        if amount <= 0:
+            raise ValueError("Transfer amount must be positive")
         
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
-                # Ensure system account exists with unlimited balance
-                if system_account not in self._state["accounts"]:
-                    ensure_account(self._state, system_account, 10**18)  # Effectively unlimited
-                
-                # Ensure target account exists
-                if self.config.auto_create_accounts:
-                    ensure_account(self._state, account_id, 0)
-                
-                # Give system account enough balance if needed
-                if self._state["accounts"][system_account]["balance"] < amount:
-                    self._state["accounts"][system_account]["balance"] = 10**18
-                
-                # Journal First
-                self._append_event(
-                    {"type": "credit", "account": account_id, "amount": str(amount), "reason": reason or "manual_credit"},
-                    journal_path=str(self.config.journal_path),
-                    domain_lock=str(self.config.domain_lock_path),
-                    lock=False
-                )
+                self._catch_up()
+                if not self.config.auto_create_accounts and account_id not in self._state["accounts"]:
+                    raise AccountNotFoundError(f"Receiver account '{account_id}' does not exist")
                 
-                record = transfer(self._state, system_account, account_id, amount, None, reason)
-                self._save()
-                return record
+                record = self._commit({
+                    "type": "credit",
+                    "account": account_id,
+                    "amount": str(amount),
+                    "reason": reason or "manual_credit",
+                    "note": reason
+                })
+                self._maybe_snapshot()
+        self._wait_durable()
+        return record
     
     def get_transfers(
         self,
         account_id: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        before: Optional[str] = None
     ) -> list[TransferRecord]:
         """
-        Get transfer history.
+        Get transfer history, one page at a time.
         
         Args:
             account_id: Optional account to filter by
-            limit: Optional limit on number of records
+            limit: Optional page size
+            before: Optional cursor: id of the last record of the previous page
             
         Returns:
             List of transfer records, newest first
         """
         with self._lock:
-            return get_transfers(self._state, account_id, limit)
+            if self._writer is not None:
+                self._writer.flush()
+            if self._writer is None or self._writer.failed is None:
+                self._flush_transfers()
+            return self._transfers.get_transfers(account_id, limit, before)
     
     def account_exists(self, account_id: str) -> bool:
         """
@@ -334,6 +790,45 @@ class LedgerService:
         # Clamp between base (min) and max
         return max(base, min(self.config.max_margin, margin))
 
+    def _commit_settlement(
+        self,
+        payer_id: str,
+        worker_id: str,
+        total: Decimal,
+        provider_share: Decimal,
+        job_id: str,
+        note: Optional[str],
+        payment_reason: str,
+        payout_reason: str
+    ) -> None:
+        """Journal and apply both legs of a settlement (assumes domain lock and lock are held)."""
+        operator = self.config.operator_account
+        ensure_account(self._state, operator, 0)
+        
+        # A) Charge Payer -> Operator
+        self._commit({
+            "type": "charge",
+            "account": payer_id,
+            "to_account": operator, # Make it double-entry
+            "amount": str(total),
+            "job_id": job_id,
+            "worker_id": worker_id,
+            "reason": payment_reason,
+            "note": note
+        })
+        
+        # B) Transfer Operator -> Worker
+        self._commit({
+            "type": "transfer",
+            "account": operator,
+            "to_account": worker_id,
+            "amount": str(provider_share),
+            "job_id": job_id,
+            "worker_id": worker_id,
+            "reason": payout_reason,
+            "note": note
+        })
+
     def charge_and_settle(
         self,
         payer_id: str,
@@ -361,75 +856,38 @@ class LedgerService:
         if not job_id:
             raise ValueError("job_id is required for settlement")
             
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
-                
-                # 1. Idempotency Check
-                if job_id in self._settled_jobs:
-                    return True
-                
-                # 2. Precision Calculation
-                Q = Decimal("0.0001")
-                def d(x) -> Decimal: return Decimal(str(x))
-                
-                total = d(total_amount)
-                m = d(margin if margin is not None else self.config.default_margin)
+                self._catch_up()
                 
-                provider_share = (total * (Decimal("1") - m)).quantize(Q, rounding=ROUND_DOWN)
-                
-                # Governance: Dry-run mode
-                if self.config.gov_dry_run:
-                    print(f"[DRY-RUN] Settlement for {job_id[:8]}: margin={float(m):.4f}, provider_share={float(provider_share):.4f}")
-                    return True
-                
-                # 3. Balance Check
-                if not can_pay(self._state, payer_id, float(total)):
-                    return False
+                # 1. Idempotency Check (under group commit it may still be in flight)
+                if job_id not in self._settled_jobs:
+                    # 2. Precision Calculation
+                    Q = Decimal("0.0001")
+                    def d(x) -> Decimal: return Decimal(str(x))
                     
-                # 4. Atomic Execution
-                operator = self.config.operator_account
-                ensure_account(self._state, payer_id, 0)
-                ensure_account(self._state, worker_id, 0)
-                ensure_account(self._state, operator, 0)
-                
-                # A) Charge Payer -> Operator
-                self._append_event(
-                    {
-                        "type": "charge",
-                        "account": payer_id,
-                        "to_account": operator, # Make it double-entry
-                        "amount": str(total),
-                        "job_id": job_id,
-                        "worker_id": worker_id,
-                        "reason": note or f"job_payment:{job_id}"
-                    },
-                    journal_path=str(self.config.journal_path),
-                    domain_lock=str(self.config.domain_lock_path),
-                    lock=False
-                )
-                transfer(self._state, payer_id, operator, float(total), job_id, note)
-                
-                # B) Transfer Operator -> Worker
-                self._append_event(
-                    {
-                        "type": "transfer",
-                        "account": operator,
-                        "to_account": worker_id,
-                        "amount": str(provider_share),
-                        "job_id": job_id,
-                        "worker_id": worker_id,
-                        "reason": f"provider_payout:{job_id}"
-                    },
-                    journal_path=str(self.config.journal_path),
-                    domain_lock=str(self.config.domain_lock_path),
-                    lock=False
-                )
-                transfer(self._state, operator, worker_id, float(provider_share), job_id, note)
-                
-                # 5. Commit
-                self._save()
-                return True
+                    total = d(total_amount)
+                    m = d(margin if margin is not None else self.config.default_margin)
+                    
+                    provider_share = (total * (Decimal("1") - m)).quantize(Q, rounding=ROUND_DOWN)
+                    
+                    # Governance: Dry-run mode
+                    if self.config.gov_dry_run:
+                        print(f"[DRY-RUN] Settlement for {job_id[:8]}: margin={float(m):.4f}, provider_share={float(provider_share):.4f}")
+                        return True
+                    
+                    # 3. Balance Check
+                    if not can_pay(self._state, payer_id, float(total)):
+                        return False
+                        
+                    # 4. Commit (journal append is the commit point)
+                    self._commit_settlement(
+                        payer_id, worker_id, total, provider_share, job_id, note,
+                        note or f"job_payment:{job_id}", f"provider_payout:{job_id}"
+                    )
+                    self._maybe_snapshot()
+        self._wait_durable()
+        return True
 
     def batch_settle(
         self,
@@ -443,15 +901,12 @@ class LedgerService:
         if not settlements:
             return []
 
-        with json_lock(str(self.config.domain_lock_path)):
+        with self._domain_lock():
             with self._lock:
-                self._reload()
+                self._catch_up()
                 
                 Q = Decimal("0.0001")
                 def d(x) -> Decimal: return Decimal(str(x))
-                operator = self.config.operator_account
-                
-                any_change = False
                 
                 for s in settlements:
                     job_id = s.get("job_id")
@@ -475,44 +930,13 @@ class LedgerService:
                     if not can_pay(self._state, payer_id, float(total)):
                         results.append(False)
                         continue
-                        
-                    # Prepare accounts
-                    ensure_account(self._state, payer_id, 0)
-                    ensure_account(self._state, worker_id, 0)
-                    ensure_account(self._state, operator, 0)
-                    
-                    # Journal & Transfer
-                    self._append_event(
-                        {
-                            "type": "charge", "account": payer_id, "to_account": operator,
-                            "amount": str(total), "job_id": job_id, "worker_id": worker_id,
-                            "reason": note or f"batch_payment:{job_id}"
-                        },
-                        journal_path=str(self.config.journal_path), domain_lock=str(self.config.domain_lock_path), lock=False
-                    )
-                    transfer(self._state, payer_id, operator, float(total), job_id, note)
                     
-                    self._append_event(
-                        {
-                            "type": "transfer", "account": operator, "to_account": worker_id,
-                            "amount": str(provider_share), "job_id": job_id, "worker_id": worker_id,
-                            "reason": f"batch_payout:{job_id}"
-                        },
-                        journal_path=str(self.config.journal_path), domain_lock=str(self.config.domain_lock_path), lock=False
+                    self._commit_settlement(
+                        payer_id, worker_id, total, provider_share, job_id, note,
+                        note or f"batch_payment:{job_id}", f"batch_payout:{job_id}"
                     )
-                    transfer(self._state, operator, worker_id, float(provider_share), job_id, note)
-                    
-                    self._settled_jobs.add(job_id)
                     results.append(True)
-                    any_change = True
-                    self._events_since_snapshot += 2
 
-                if any_change:
-                    self._save()
-                    self._save_job_index()
-                    
-                    if self._events_since_snapshot >= self.config.snapshot_interval:
-                        # In v1, our ledger.json IS the snapshot. reset counter.
-                        self._events_since_snapshot = 0
-                
-                return results
+                self._maybe_snapshot()
+        self._wait_durable()
+        return results
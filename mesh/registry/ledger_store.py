@@ -3,6 +3,8 @@ Core ledger module - Internal logic for account and transfer management.
 
 This module provides the low-level state management for the mesh fake ledger,
 including JSON persistence, account operations, and transfer validation.
+Transfer history is kept separately (see transfer_store), so the state holds
+only balances and stays constant-size per account.
 """
 
 import json
@@ -34,7 +36,6 @@ class TransferRecord(TypedDict):
 class LedgerState(TypedDict):
     """Complete ledger state structure."""
     accounts: dict[str, Account]
-    transfers: list[TransferRecord]
 
 
 class LedgerError(Exception):
@@ -55,8 +56,7 @@ class InsufficientBalanceError(LedgerError):
 def create_empty_state() -> LedgerState:
     """Create a new empty ledger state."""
     return {
-        "accounts": {},
-        "transfers": []
+        "accounts": {}
     }
 
 
@@ -156,28 +156,21 @@ def can_pay(state: LedgerState, payer_id: str, amount: float) -> bool:
         return False
 
 
-def transfer(
+def validate_transfer(
     state: LedgerState,
     payer_id: str,
     receiver_id: str,
     amount: float,
-    job_id: Optional[str] = None,
-    note: Optional[str] = None
-) -> TransferRecord:
+    *,
+    allow_missing: bool = False
+) -> None:
     """
-    Execute a transfer between two accounts.
+    Check that a transfer can be executed, without changing state.
     
     Args:
-        state: Ledger state
-        payer_id: Payer account identifier
-        receiver_id: Receiver account identifier
-        amount: Amount to transfer
-        job_id: Optional job identifier
-        note: Optional transfer note
-        
-    Returns:
-        TransferRecord of the completed transfer
-        
+        allow_missing: Treat missing accounts as balance 0 (they are created
+            when the transfer is applied) instead of raising
+    
     Raises:
         AccountNotFoundError: If either account doesn't exist
         InsufficientBalanceError: If payer has insufficient balance
@@ -187,26 +180,46 @@ def transfer(
         raise ValueError("Transfer amount must be positive")
     
     # Validate accounts exist
-    if payer_id not in state["accounts"]:
+    if payer_id not in state["accounts"] and not allow_missing:
         raise AccountNotFoundError(f"Payer account '{payer_id}' does not exist")
-    if receiver_id not in state["accounts"]:
+    if receiver_id not in state["accounts"] and not allow_missing:
         raise AccountNotFoundError(f"Receiver account '{receiver_id}' does not exist")
     
     # Validate sufficient balance
-    payer_balance = state["accounts"][payer_id]["balance"]
+    payer_balance = state["accounts"].get(payer_id, {"balance": 0})["balance"]
     if payer_balance < amount:
         raise InsufficientBalanceError(
             f"Insufficient balance: {payer_id} has {payer_balance}, needs {amount}"
         )
+
+
+def record_transfer(
+    state: LedgerState,
+    payer_id: str,
+    receiver_id: str,
+    amount: float,
+    job_id: Optional[str] = None,
+    note: Optional[str] = None,
+    *,
+    record_id: Optional[str] = None,
+    timestamp: Optional[str] = None
+) -> TransferRecord:
+    """
+    Move the balance and build the transfer record, without validation.
+    
+    Used for transfers that are already validated or already committed to
+    the journal (replay must not reject them). Both accounts must exist.
     
-    # Execute transfer
+    Args:
+        record_id: Optional record id (e.g. the journal event id)
+        timestamp: Optional ISO timestamp (e.g. from the journal event)
+    """
     state["accounts"][payer_id]["balance"] -= amount
     state["accounts"][receiver_id]["balance"] += amount
     
-    # Create transfer record
     record: TransferRecord = {
-        "id": str(uuid4()),
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "id": record_id or str(uuid4()),
+        "timestamp": timestamp or datetime.utcnow().isoformat() + "Z",
         "from_account": payer_id,
         "to_account": receiver_id,
         "amount": amount,
@@ -214,42 +227,35 @@ def transfer(
         "note": note
     }
     
-    # Append to transfer history
-    state["transfers"].append(record)
-    
     return record
 
 
-def get_transfers(
+def transfer(
     state: LedgerState,
-    account_id: Optional[str] = None,
-    limit: Optional[int] = None
-) -> list[TransferRecord]:
+    payer_id: str,
+    receiver_id: str,
+    amount: float,
+    job_id: Optional[str] = None,
+    note: Optional[str] = None
+) -> TransferRecord:
     """
-    Get transfer history, optionally filtered by account.
+    Execute a transfer between two accounts.
     
     Args:
         state: Ledger state
-        account_id: Optional account to filter by (shows transfers where account is sender or receiver)
-        limit: Optional limit on number of records to return (most recent first)
+        payer_id: Payer account identifier
+        receiver_id: Receiver account identifier
+        amount: Amount to transfer
+        job_id: Optional job identifier
+        note: Optional transfer note
         
     Returns:
-        List of transfer records, newest first
+        TransferRecord of the completed transfer (for the caller to store)
+        
+    Raises:
+        AccountNotFoundError: If either account doesn't exist
+        InsufficientBalanceError: If payer has insufficient balance
+        ValueError: If amount is not positive
     """
-    transfers = state["transfers"]
-    
-    # Filter by account if specified
-    if account_id:
-        transfers = [
-            t for t in transfers
-            if t["from_account"] == account_id or t["to_account"] == account_id
-        ]
-    
-    # Reverse to get newest first
-    transfers = list(reversed(transfers))
-    
-    # Apply limit if specified
-    if limit is not None:
-        transfers = transfers[:limit]
-    
-    return transfers
+    validate_transfer(state, payer_id, receiver_id, amount)
+    return record_transfer(state, payer_id, receiver_id, amount, job_id, note)
@@ -2,6 +2,12 @@
 Replica Sync Service.
 
 Periodically syncs journal from writer node and applies events to local state.
+
+The replica keeps a byte-for-byte copy of the writer's journal: each segment
+(at most max_bytes) is checked against the local hash chain, appended, and
+applied by the ledger in one batch with a single snapshot. Local files that
+are not a prefix of the writer's journal (e.g. from an older version) are
+moved aside and rebuilt from offset 0.
 """
 import json
 import time
@@ -10,6 +16,10 @@ from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, asdict
 
+from .ledger_store import LedgerError
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+
 @dataclass
 class ReplicaState:
     writer_url: str
@@ -18,14 +28,34 @@ class ReplicaState:
     last_event_ts: float = 0.0
     last_sync_at: float = 0.0
     total_events_synced: int = 0
+    writer_size: int = 0
+    writer_events: int = 0
+    local_events: int = 0
 
 class ReplicaSyncService:
-    def __init__(self, writer_url: str, state_path: Path, ledger_service):
+    def __init__(
+        self,
+        writer_url: str,
+        state_path: Path,
+        ledger_service,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        session=None
+    ):
+        """
+        Args:
+            writer_url: Base URL of the writer's journal sync API
+            state_path: Replica state file (sync position and lag metrics)
+            ledger_service: Local LedgerService (mode="replica")
+            max_bytes: Upper bound on the size of one journal segment
+            session: Optional HTTP client with a requests-style get()
+        """
         self.writer_url = writer_url
         self.state_path = state_path
         self.ledger = ledger_service
-        self.partial_buffer = ""
+        self.max_bytes = max_bytes
+        self.http = session or requests
         self.state = self._load_state()
+        self._prefix_checked = False
     
     def _load_state(self) -> ReplicaState:
         """Load replica state from disk."""
@@ -43,99 +73,115 @@ class ReplicaSyncService:
         with open(self.state_path, 'w', encoding='utf-8') as f:
             json.dump(asdict(self.state), f, indent=2)
     
-    def sync_once(self) -> bool:
+    def _fetch(self, offset: int, max_bytes: Optional[int] = None):
+        """Fetch one journal segment starting at offset."""
+        resp = self.http.get(
+            f"{self.writer_url}/journal",
+            params={"offset": offset, "max_bytes": max_bytes or self.max_bytes},
+            timeout=10
+        )
+        resp.raise_for_status()
+        return resp.content, resp.headers
+    
+    def _last_local_line(self, offset: int) -> bytes:
+        """Return the last line of the local journal before offset."""
+        block = 4096
+        with open(self.ledger.config.journal_path, 'rb') as f:
+            while True:
+                start = max(0, offset - block)
+                f.seek(start)
+                tail = f.read(offset - start)
+                newline = tail.rfind(b"\n", 0, len(tail) - 1)
+                if newline >= 0 or start == 0:
+                    return tail[newline + 1:]
+                block *= 2
+    
+    def _check_prefix(self):
+        """
+        Make sure the local journal is a prefix of the writer's; otherwise
+        reset the replica so it is rebuilt from offset 0. Each line carries
+        the chain hash, so comparing the last local line with the writer's
+        bytes at the same offset covers the whole history.
+        """
+        offset = self.ledger.journal_position()["offset"]
+        if offset > 0:
+            last_line = self._last_local_line(offset)
+            start = offset - len(last_line)
+            data, _ = self._fetch(start, max_bytes=len(last_line))
+            if data != last_line:
+                self.ledger.reset_replica(f"local journal diverges from the writer's before offset {offset}")
+                self.state.sync_offset = 0
+                self.state.last_hash = ""
+                self.state.local_events = 0
+                self._save_state()
+        self._prefix_checked = True
+    
+    def sync_once(self, max_chunks: Optional[int] = None) -> bool:
         """
-        Fetch and apply new events from writer.
-        Returns True if sync succeeded, False if writer unreachable.
+        Fetch and apply new events from writer, one segment at a time, until
+        caught up (or max_chunks segments were applied).
+        Returns True if sync succeeded, False if writer unreachable or the
+        received journal does not continue the local one.
         """
+        events_applied = 0
+        chunks = 0
         try:
-            # Fetch chunk from writer
-            resp = requests.get(
-                f"{self.writer_url}/journal",
-                params={"offset": self.state.sync_offset},
-                timeout=10
-            )
-            resp.raise_for_status()
-            
-            chunk = resp.text
-            next_offset = int(resp.headers.get('X-Journal-Next-Offset', self.state.sync_offset))
-            last_hash = resp.headers.get('X-Journal-Last-Hash', '')
-            last_ts = float(resp.headers.get('X-Journal-Last-TS', 0))
-            
-            # Handle partial lines
-            if self.partial_buffer:
-                chunk = self.partial_buffer + chunk
-                self.partial_buffer = ""
-            
-            if chunk and not chunk.endswith('\n'):
-                last_newline = chunk.rfind('\n')
-                if last_newline >= 0:
-                    self.partial_buffer = chunk[last_newline+1:]
-                    chunk = chunk[:last_newline+1]
-                else:
-                    self.partial_buffer = chunk
-                    chunk = ""
-            
-            # Apply events
-            events_applied = 0
-            for line in chunk.splitlines():
-                if not line.strip():
-                    continue
-                try:
-                    event = json.loads(line)
-                    self._apply_event(event)
-                    events_applied += 1
-                except Exception as e:
-                    print(f"[replica] Error applying event: {e}")
-            
-            # Update state
-            self.state.sync_offset = next_offset
-            if last_hash:
-                self.state.last_hash = last_hash
-            if last_ts:
-                self.state.last_event_ts = last_ts
-            self.state.last_sync_at = time.time()
-            self.state.total_events_synced += events_applied
-            self._save_state()
+            if not self._prefix_checked:
+                self._check_prefix()
+            while max_chunks is None or chunks < max_chunks:
+                # The local journal is the sync position
+                position = self.ledger.journal_position()
+                offset = position["offset"]
+                data, headers = self._fetch(offset)
+                
+                next_offset = int(headers.get('X-Journal-Next-Offset', offset))
+                if next_offset != offset + len(data):
+                    raise LedgerError(f"Segment at {offset} has {len(data)} bytes, writer reports end {next_offset}")
+                
+                applied = self.ledger.apply_replicated(offset, data)
+                events_applied += applied
+                chunks += 1
+                
+                # Update state
+                self.state.sync_offset = next_offset
+                self.state.last_hash = self.ledger.journal_position()["last_hash"]
+                last_ts = float(headers.get('X-Journal-Last-TS', 0) or 0)
+                if last_ts:
+                    self.state.last_event_ts = last_ts
+                self.state.writer_size = int(headers.get('X-Journal-Size', next_offset))
+                self.state.writer_events = int(headers.get('X-Journal-Events', 0))
+                self.state.local_events = position["events"] + applied
+                self.state.last_sync_at = time.time()
+                self.state.total_events_synced += applied
+                self._save_state()
+                
+                if not data or next_offset >= self.state.writer_size:
+                    break
             
             if events_applied > 0:
-                print(f"[replica] Synced {events_applied} events (offset: {next_offset})")
+                print(f"[replica] Synced {events_applied} events in {chunks} chunks (offset: {self.state.sync_offset})")
             
             return True
             
+        except LedgerError as e:
+            print(f"[replica] Rejected journal segment: {e}")
+            return False
         except Exception as e:
             print(f"[replica] Sync failed: {e}")
             return False
     
-    def _apply_event(self, event: dict):
-        """Apply a single event to the ledger state."""
-        # This uses the same logic as replay() but for a single event
-        from mesh.registry.ledger_store import ensure_account, transfer
-        
-        state = self.ledger._state
-        etype = event.get("type")
-        account = event.get("account", "")
-        to_account = event.get("to_account", "")
-        amount = float(event.get("amount", 0))
-        
-        if to_account:
-            # Double-entry
-            ensure_account(state, account, 0)
-            ensure_account(state, to_account, 0)
-            state["accounts"][account]["balance"] -= amount
-            state["accounts"][to_account]["balance"] += amount
-        elif etype == "credit":
-            ensure_account(state, account, 0)
-            state["accounts"][account]["balance"] += amount
-        elif etype in ["debit", "charge"]:
-            ensure_account(state, account, 0)
-            state["accounts"][account]["balance"] -= amount
-        elif etype == "adjust":
-            ensure_account(state, account, 0)
-            state["accounts"][account]["balance"] += amount
-        
-        # Save state after each event (or batch for performance)
-        self.ledger._save()
+    def lag(self) -> dict:
+        """
+        Replication lag as of the last sync: bytes and events behind the
+        writer, and seconds since the last successful sync.
+        """
+        return {
+            "bytes_behind": max(0, self.state.writer_size - self.state.sync_offset),
+            "events_behind": max(0, self.state.writer_events - self.state.local_events),
+            "seconds_since_sync": time.time() - self.state.last_sync_at if self.state.last_sync_at else None,
+            "sync_offset": self.state.sync_offset,
+            "writer_size": self.state.writer_size,
+        }
     
     def run_loop(self, interval: int = 5):
         """Run continuous sync loop."""
@@ -151,6 +197,7 @@ if __name__ == "__main__":
     
     writer_url = os.getenv("LEDGER_WRITER_URL", "http://localhost:8100")
     sync_interval = int(os.getenv("LEDGER_SYNC_INTERVAL", "5"))
+    max_bytes = int(os.getenv("LEDGER_SYNC_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
     
     config = LedgerConfig(
         mode="replica",
@@ -162,7 +209,8 @@ if __name__ == "__main__":
     replica = ReplicaSyncService(
         writer_url=writer_url,
         state_path=Path("replica_state.json"),
-        ledger_service=ledger
+        ledger_service=ledger,
+        max_bytes=max_bytes
     )
     
     replica.run_loop(interval=sync_interval)
@@ -0,0 +1,211 @@
+"""
+Transfer history store for the mesh fake ledger.
+
+Transfer records live in SQLite instead of the ledger document, indexed by
+account and insertion order (which is time order), so the balance document
+stays constant-size per account and history reads are paginated index scans.
+A retention policy (max age and/or max records) bounds the table.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .ledger_store import TransferRecord
+
+_COLUMNS = "id, timestamp, from_account, to_account, amount, job_id, note"
+
+
+def _amount(text: str):
+    """Amounts are stored as decimal strings; integral amounts stay int."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class TransferStore:
+    """
+    SQLite-backed transfer history.
+
+    Not thread-safe on its own: LedgerService calls it under its lock.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: Optional[float] = None,
+        max_records: Optional[int] = None
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+            retention_days: Drop transfers older than this on compact()
+            max_records: Keep at most this many newest transfers on compact()
+        """
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.max_records = max_records
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS transfers (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                timestamp TEXT NOT NULL,
+                from_account TEXT NOT NULL,
+                to_account TEXT NOT NULL,
+                amount TEXT NOT NULL,
+                job_id TEXT,
+                note TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_transfers_from ON transfers(from_account, seq);
+            CREATE INDEX IF NOT EXISTS idx_transfers_to ON transfers(to_account, seq);
+            CREATE INDEX IF NOT EXISTS idx_transfers_timestamp ON transfers(timestamp);
+        """)
+        self._migrate_amounts()
+        self._conn.commit()
+
+    def _migrate_amounts(self) -> None:
+        """Stores created with a REAL amount column: rewrite amounts as decimal strings."""
+        columns = {row[1]: row[2] for row in self._conn.execute("PRAGMA table_info(transfers)")}
+        if columns.get("amount", "").upper() != "REAL":
+            return
+        self._conn.executescript(f"""
+            BEGIN;
+            ALTER TABLE transfers RENAME TO transfers_real;
+            CREATE TABLE transfers (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                timestamp TEXT NOT NULL,
+                from_account TEXT NOT NULL,
+                to_account TEXT NOT NULL,
+                amount TEXT NOT NULL,
+                job_id TEXT,
+                note TEXT
+            );
+            INSERT INTO transfers (seq, {_COLUMNS})
+                SELECT seq, id, timestamp, from_account, to_account,
+                       CASE WHEN amount = CAST(amount AS INTEGER) THEN CAST(CAST(amount AS INTEGER) AS TEXT)
+                            ELSE CAST(amount AS TEXT) END,
+                       job_id, note
+                FROM transfers_real ORDER BY seq;
+            DROP TABLE transfers_real;
+            CREATE INDEX IF NOT EXISTS idx_transfers_from ON transfers(from_account, seq);
+            CREATE INDEX IF NOT EXISTS idx_transfers_to ON transfers(to_account, seq);
+            CREATE INDEX IF NOT EXISTS idx_transfers_timestamp ON transfers(timestamp);
+            COMMIT;
+        """)
+        print(f"[transfers] Migrated amounts in {self.path} to decimal strings")
+
+    def add_many(self, records: Iterable[TransferRecord]) -> int:
+        """
+        Append transfer records in one transaction.
+
+        Records whose id is already stored are skipped, so replaying journal
+        events (record id = event id) is idempotent.
+
+        Returns:
+            Number of records inserted
+        """
+        rows = [
+            (r["id"], r["timestamp"], r["from_account"], r["to_account"], str(r["amount"]), r.get("job_id"), r.get("note"))
+            for r in records
+        ]
+        if not rows:
+            return 0
+        before = self._conn.total_changes
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO transfers ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self._conn.commit()
+        return self._conn.total_changes - before
+
+    def get_transfers(
+        self,
+        account_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> list[TransferRecord]:
+        """
+        Get transfer history, newest first.
+
+        Args:
+            account_id: Optional account to filter by (sender or receiver)
+            limit: Optional page size
+            before: Optional cursor: id of the last record of the previous page
+
+        Returns:
+            List of transfer records, newest first
+        """
+        max_seq = None
+        if before is not None:
+            row = self._conn.execute("SELECT seq FROM transfers WHERE id = ?", (before,)).fetchone()
+            if row is None:
+                return []
+            max_seq = row[0]
+
+        seq_filter = "" if max_seq is None else "AND seq < :max_seq"
+        page = "" if limit is None else "LIMIT :limit"
+        params = {"account": account_id, "max_seq": max_seq, "limit": limit}
+        if account_id:
+            # One index range scan per side; UNION drops self-transfers seen twice
+            sql = f"""
+                SELECT seq, {_COLUMNS} FROM (
+                    SELECT * FROM (SELECT * FROM transfers WHERE from_account = :account {seq_filter}
+                                   ORDER BY seq DESC {page})
+                    UNION
+                    SELECT * FROM (SELECT * FROM transfers WHERE to_account = :account {seq_filter}
+                                   ORDER BY seq DESC {page})
+                ) ORDER BY seq DESC {page}
+            """
+        else:
+            sql = f"SELECT seq, {_COLUMNS} FROM transfers WHERE 1 {seq_filter} ORDER BY seq DESC {page}"
+
+        return [
+            {
+                "id": row[1],
+                "timestamp": row[2],
+                "from_account": row[3],
+                "to_account": row[4],
+                "amount": _amount(row[5]),
+                "job_id": row[6],
+                "note": row[7],
+            }
+            for row in self._conn.execute(sql, params)
+        ]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM transfers").fetchone()[0]
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """
+        Apply the retention policy and release freed pages.
+
+        Returns:
+            Number of transfers removed
+        """
+        if self.retention_days is None and self.max_records is None:
+            return 0
+        before = self._conn.total_changes
+        if self.retention_days is not None:
+            cutoff = (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+            self._conn.execute("DELETE FROM transfers WHERE timestamp < ?", (cutoff.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),))
+        if self.max_records is not None:
+            self._conn.execute(
+                "DELETE FROM transfers WHERE seq <= (SELECT MAX(seq) FROM transfers) - ?", (self.max_records,)
+            )
+        self._conn.commit()
+        removed = self._conn.total_changes - before
+        if removed:
+            self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        return removed
+
+    def close(self) -> None:
+        self._conn.close()
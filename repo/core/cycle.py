@@ -1,4 +1,4 @@
-from core.resonance import compute_segment_resonance
+from core.resonance import compute_segment_resonance_arrays
 
 def run_cycle(events, memory, logger, cycle, defaults):
     """
@@ -8,15 +8,15 @@ def run_cycle(events, memory, logger, cycle, defaults):
     3. Update Memory (Deterministic State)
     """
     # 1. Compute segment-based resonance
-    resonances = compute_segment_resonance(events)
+    segments, values = compute_segment_resonance_arrays(events)
+    resonances = list(zip(segments.tolist(), values.tolist()))
+
+    # 2. Log the cycle as one batch, then update memory for the whole batch at once
+    if logger:
+        logger.log_cycle(cycle, segments, values)
+
+    memory.update_many(segments, values, cycle, defaults)
 
-    # 2. Log and update memory for each segment
-    for segment, value in resonances:
-        if logger:
-            logger.log(cycle, segment, value)
-        
-        memory.update(segment, value, cycle, defaults)
-    
     if logger:
         logger.flush()
 
@@ -1,7 +1,8 @@
 import numpy as np
 from .events import create_event_buffer
+from .identity import IdentitySelector
 from .memory import Memory
-from .observe import ResonanceLogger
+from .observe import iter_log_blocks, open_resonance_logger
 from .cycle import run_cycle
 
 class SheratanEngine:
@@ -13,7 +14,7 @@ class SheratanEngine:
         self.config = config
         self.memory = Memory()
         log_path = getattr(config, "RESONANCE_LOG", "logs/resonance_log.csv")
-        self.logger = ResonanceLogger(path=log_path)
+        self.logger = open_resonance_logger(log_path)
 
         self.cycle_count = 0
         self.window_size = getattr(config, "WINDOW_SIZE", 1000)
@@ -25,6 +26,7 @@ class SheratanEngine:
         self.max_age = getattr(config, "MAX_SEGMENT_AGE", 100)
         self.max_active_states = getattr(config, "max_active_states", 1000)
         self._last_selected = set()
+        self.identity = IdentitySelector()
 
     def reset(self):
         """Resets the engine to the initial deterministic state."""
@@ -35,7 +37,8 @@ class SheratanEngine:
     def process_events(self, raw_events):
         """
         Processes a batch of raw events through the resonance cycle.
-        raw_events: list of tuples (id, value, timestamp, channel)
+        raw_events: list of tuples (id, value, timestamp, channel), or columnar
+                    input / packed bytes (see core.events.event_columns)
         """
         # 1. Create structured buffer (with rolling support)
         event_buffer = create_event_buffer(raw_events, self.window_size, self.window_stride)
@@ -60,26 +63,36 @@ class SheratanEngine:
 
     def replay_from_log(self, log_path):
         """
-        Deterministic reconstruction of memory states from a resonance CSV.
+        Deterministic reconstruction of memory states from a resonance log
+        (CSV or binary .rlog), applied one cycle block at a time.
         """
-        import csv
         reconstructed_count = 0
-        with open(log_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                cycle = int(row["cycle"])
-                segment = int(row["segment"])
-                resonance = float(row["resonance"])
-                
-                # Update memory without triggering a new log entry
-                self.memory.update(segment, resonance, cycle, self.defaults)
-                
-                # Sync local cycle counter
-                if cycle >= self.cycle_count:
-                    self.cycle_count = cycle + 1
-                reconstructed_count += 1
+        for cycle, segments, resonances in iter_log_blocks(log_path):
+            # Update memory without triggering a new log entry
+            self.memory.update_many(segments, resonances, cycle, self.defaults)
+
+            # Sync local cycle counter
+            if cycle >= self.cycle_count:
+                self.cycle_count = cycle + 1
+            reconstructed_count += len(segments)
         return reconstructed_count
 
+    def select_identity(self, threshold: float = 0.5, top_k: int = 10, channel_thresholds: dict = None):
+        """
+        Identity Layer selection for the current cycle (cached per cycle).
+        Remembers the selection for next turn's persistence check.
+        """
+        selected = self.identity.select(
+            self.memory,
+            self.cycle_count,
+            last_selected_segments=self._last_selected,
+            threshold=threshold,
+            top_k=top_k,
+            channel_thresholds=channel_thresholds,
+        )
+        self._last_selected = {int(s["segment"]) for s in selected}
+        return selected
+
     def get_state_snapshot(self):
         """Returns current memory states."""
         return self.memory.snapshot()
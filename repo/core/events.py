@@ -20,31 +20,68 @@ EVENT_DTYPE = np.dtype([
     ("segment", np.uint64), # (channel << 32) | window
 ])
 
+# Packed little-endian wire record for columnar/binary ingestion (14 bytes)
+EVENT_RECORD_DTYPE = np.dtype([
+    ("id", "<u4"),
+    ("value", "<f4"),
+    ("timestamp", "<u4"),
+    ("channel", "<u2"),
+])
+
+def event_columns(events):
+    """
+    Normalises raw event input to (ids, values, timestamps, channels) arrays.
+
+    events: list of tuples (id, value, timestamp, channel),
+            dict of columns {"id", "value", "timestamp", "channel"},
+            structured array with those fields, or
+            packed EVENT_RECORD_DTYPE bytes
+    """
+    if isinstance(events, (bytes, bytearray, memoryview)):
+        if len(events) % EVENT_RECORD_DTYPE.itemsize:
+            raise ValueError(f"binary event body must be a multiple of {EVENT_RECORD_DTYPE.itemsize} bytes")
+        events = np.frombuffer(events, dtype=EVENT_RECORD_DTYPE)
+
+    if isinstance(events, dict) or (isinstance(events, np.ndarray) and events.dtype.names):
+        try:
+            return tuple(np.asarray(events[name]) for name in EVENT_RECORD_DTYPE.names)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"columnar events need {EVENT_RECORD_DTYPE.names}: {e}")
+
+    rows = np.asarray(events, dtype=np.float64).reshape(-1, 4)
+    return rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+
 def create_event_buffer(events, window_size: int = 1000, window_stride: int = None):
     """
-    Converts list of raw events to a structured numpy array with rolling support.
-    
-    events: list of tuples (id, value, timestamp, channel)
+    Converts raw events to a structured numpy array with rolling support.
+
+    events: list of tuples (id, value, timestamp, channel), or columnar
+            input accepted by event_columns()
     window_size: granularity of resonance windows (ms)
     window_stride: overlap stride (ms). If None, defaults to window_size (no overlap).
     """
     if window_stride is None:
         window_stride = window_size
-        
-    processed = []
-    for eid, val, ts, ch in events:
-        # Determine all windows this event belongs to
-        # k such that: k*stride <= ts < k*stride + window_size
-        
-        # First possible window k: k*stride <= ts  => k_max = ts // stride
-        # Last possible window k: k*stride + window_size > ts => k*stride > ts - window_size
-        k_min = max(0, (ts - window_size + window_stride) // window_stride)
-        k_max = ts // window_stride
-        
-        for k in range(k_min, k_max + 1):
-            window = k
-            segment = (np.uint64(ch) << 32) | np.uint64(window)
-            processed.append((eid, val, ts, ch, window, segment))
-
-    return np.array(processed, dtype=EVENT_DTYPE)
 
+    ids, values, timestamps, channels = event_columns(events)
+    ts = timestamps.astype(np.int64)
+
+    # Window k holds the event when k*stride <= ts < k*stride + window_size:
+    # k_min = max(0, (ts - window_size + stride) // stride), k_max = ts // stride
+    k_min = np.maximum(0, (ts - window_size + window_stride) // window_stride)
+    k_max = ts // window_stride
+    counts = np.maximum(k_max - k_min + 1, 0)
+
+    # One output row per (event, window), events in input order, windows ascending
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(starts, counts)
+    windows = np.repeat(k_min, counts) + rank
+
+    buf = np.empty(len(windows), dtype=EVENT_DTYPE)
+    buf["id"] = np.repeat(ids, counts)
+    buf["value"] = np.repeat(values, counts)
+    buf["timestamp"] = np.repeat(timestamps, counts)
+    buf["channel"] = np.repeat(channels, counts)
+    buf["window"] = windows
+    buf["segment"] = (buf["channel"].astype(np.uint64) << np.uint64(32)) | buf["window"].astype(np.uint64)
+    return buf
@@ -1,5 +1,59 @@
 import numpy as np
 
+def _state_columns(memory_states):
+    """(segments uint64, values float64, last_seen int64) for an array or list of states."""
+    if isinstance(memory_states, np.ndarray) and memory_states.dtype.names:
+        return (memory_states["segment"].astype(np.uint64),
+                memory_states["value"].astype(np.float64),
+                memory_states["last_seen"].astype(np.int64))
+    n = len(memory_states)
+    return (np.fromiter((int(s["segment"]) for s in memory_states), dtype=np.uint64, count=n),
+            np.fromiter((float(s["value"]) for s in memory_states), dtype=np.float64, count=n),
+            np.fromiter((int(s["last_seen"]) for s in memory_states), dtype=np.int64, count=n))
+
+def select_top_indices(
+    segments,
+    values,
+    last_seen,
+    threshold: float = 0.5,
+    top_k: int = 10,
+    channel_thresholds: dict = None,
+    current_cycle: int = 0,
+    persistence_window: int = 5,
+    last_selected_segments=None
+):
+    """
+    Vectorised core of select_top_states over state columns.
+    Returns row indices of the selection, best first; equal scores keep row order.
+    """
+    # 1. Adaptive Thresholding: channel override masks over the base threshold
+    limits = np.full(len(segments), threshold, dtype=np.float64)
+    if channel_thresholds:
+        channels = segments >> np.uint64(32)
+        for channel, limit in channel_thresholds.items():
+            limits[channels == np.uint64(channel)] = limit
+
+    # 2./3. Threshold OR persistence (previous selection, still fresh)
+    age = current_cycle - last_seen
+    selected = values >= limits
+    if last_selected_segments:
+        previous = np.fromiter((int(s) for s in last_selected_segments), dtype=np.uint64)
+        selected |= np.isin(segments, previous) & (age <= persistence_window)
+    candidates = np.flatnonzero(selected)
+
+    # 4. Ranking: value with a 1%-per-cycle age penalty
+    scores = values[candidates] * np.maximum(0.0, 1.0 - (age[candidates] * 0.01))
+
+    if 0 < top_k < len(candidates):
+        # argpartition finds the k-th best score; rows tied at it go by row order
+        cut = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+        better = np.flatnonzero(scores > cut)
+        tied = np.flatnonzero(scores == cut)[:top_k - len(better)]
+        keep = np.concatenate((better, tied))
+        candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))
+    return candidates[order][:top_k]
+
 def select_top_states(
     memory_states, 
     threshold: float = 0.5, 
@@ -16,48 +70,72 @@ def select_top_states(
     2. Persistence (Hysteresis): Keep segments that were recently selected even if below threshold.
     3. Selection: Filter by threshold OR persistence.
     4. Ranking: Value-weighted aging.
+
+    memory_states: list of states or a STATE_DTYPE array (e.g. Memory.rows()).
     """
-    if not memory_states:
+    if memory_states is None or len(memory_states) == 0:
         return []
 
-    if channel_thresholds is None:
-        channel_thresholds = {}
-    if last_selected_segments is None:
-        last_selected_segments = set()
+    segments, values, last_seen = _state_columns(memory_states)
+    rows = select_top_indices(
+        segments, values, last_seen,
+        threshold=threshold,
+        top_k=top_k,
+        channel_thresholds=channel_thresholds,
+        current_cycle=current_cycle,
+        persistence_window=persistence_window,
+        last_selected_segments=last_selected_segments,
+    )
+    return [memory_states[i] for i in rows.tolist()]
 
-    candidates = []
-    
-    for s in memory_states:
-        segment_id = int(s["segment"])
-        channel = segment_id >> 32
-        
-        # Determine adaptive threshold
-        # Base limit from config or channel override
-        base_limit = channel_thresholds.get(channel, threshold)
-        
-        # Rule A: Threshold selection
-        is_above_threshold = float(s["value"]) >= base_limit
-        
-        # Rule B: Persistence (Hysteresis)
-        # If it was selected in the previous turn and is still "fresh", keep it.
-        is_persistent = (segment_id in last_selected_segments) and \
-                        ((current_cycle - int(s["last_seen"])) <= persistence_window)
-        
-        if is_above_threshold or is_persistent:
-            candidates.append(s)
-
-    # 4. Refined Ranking: (Value * DecayFactor) where DecayFactor decreases with age
-    # We use a simple linear or exponential weight for last_seen.
-    def ranking_score(state):
-        val = float(state["value"])
-        # Age penalty: reduce score by 1% for each cycle since last_seen
-        age = current_cycle - int(state["last_seen"])
-        age_penalty = max(0.0, 1.0 - (age * 0.01))
-        return val * age_penalty
-
-    candidates.sort(key=ranking_score, reverse=True)
-    
-    return candidates[:top_k]
+class IdentitySelector:
+    """
+    Cached identity selection over a Memory.
+
+    The result is reused while the memory version, cycle and parameters are
+    unchanged, so repeated polls within a cycle cost O(k). Feeding the
+    previous selection back as last_selected_segments (what /api/identity
+    does) also hits the cache: that selection is contained in the new
+    candidate set, which is a subset of the old one, so top-k is unchanged.
+    """
+    def __init__(self):
+        self._key = None
+        self._previous = None
+        self._selected_ids = None
+        self._selected = []
+
+    def select(
+        self,
+        memory,
+        current_cycle: int,
+        last_selected_segments=None,
+        threshold: float = 0.5,
+        top_k: int = 10,
+        channel_thresholds: dict = None,
+        persistence_window: int = 5
+    ):
+        previous = frozenset(int(s) for s in (last_selected_segments or ()))
+        key = (memory.version, current_cycle, threshold, top_k,
+               tuple(sorted((channel_thresholds or {}).items())), persistence_window)
+        if key == self._key and (previous == self._previous or (top_k > 0 and previous == self._selected_ids)):
+            return self._selected
+
+        rows = memory.rows()
+        indices = select_top_indices(
+            *_state_columns(rows),
+            threshold=threshold,
+            top_k=top_k,
+            channel_thresholds=channel_thresholds,
+            current_cycle=current_cycle,
+            persistence_window=persistence_window,
+            last_selected_segments=previous,
+        )
+        # Fancy indexing copies: later memory updates don't alter the cached rows
+        selected = rows[indices]
+        self._key, self._previous = key, previous
+        self._selected_ids = frozenset(selected["segment"].tolist())
+        self._selected = list(selected)
+        return self._selected
 
 def calculate_adaptive_threshold(memory_states, base_threshold: float, target_count: int = 20):
     """
@@ -1,3 +1,6 @@
+import hashlib
+from collections.abc import Mapping
+
 import numpy as np
 
 # Sheratan Phase 2: Memory State Format
@@ -9,17 +12,88 @@ STATE_DTYPE = np.dtype([
     ("last_seen", np.uint32),
 ])
 
+_INITIAL_CAPACITY = 64
+
+
+class _StatesView(Mapping):
+    """Read-only segment_id -> state row mapping (legacy `memory.states` access)."""
+    def __init__(self, memory):
+        self._memory = memory
+
+    def __getitem__(self, segment):
+        return self._memory.rows()[self._memory._index[int(segment)]]
+
+    def __contains__(self, segment):
+        try:
+            return int(segment) in self._memory._index
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return iter(self._memory._index)
+
+    def __len__(self):
+        return len(self._memory._index)
+
+
 class Memory:
     """
     Deterministic memory system.
     Manages states indexed by segment_id.
+
+    States live in one contiguous STATE_DTYPE array (rows in insertion order)
+    with a segment_id -> row index, so a cycle's updates, pruning and the
+    state hash are array operations instead of per-segment scalar work.
     """
     def __init__(self):
-        self.states = {} # segment_id -> structured_array (single element)
+        self.clear()
 
     def clear(self):
         """Clears all memory states."""
-        self.states = {}
+        self._rows = np.zeros(_INITIAL_CAPACITY, dtype=STATE_DTYPE)
+        self._size = 0
+        self._index = {}  # segment_id -> row
+        # Bumped on every change; lets readers (e.g. IdentitySelector) cache derived views
+        self.version = getattr(self, "version", 0) + 1
+
+    @property
+    def states(self):
+        """segment_id -> state row (read-only views into the live array)."""
+        return _StatesView(self)
+
+    def __len__(self):
+        return self._size
+
+    def rows(self):
+        """Returns the live state rows as a read-only STATE_DTYPE array (insertion order)."""
+        view = self._rows[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def _reserve(self, n: int):
+        if n > len(self._rows):
+            grown = np.zeros(max(n, 2 * len(self._rows)), dtype=STATE_DTYPE)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+
+    def _rows_for(self, segments, defaults: dict):
+        """Row numbers for segments, appending initialised rows for new ones."""
+        index = self._index
+        rows = np.fromiter((index.get(s, -1) for s in segments), dtype=np.int64, count=len(segments))
+        new = np.flatnonzero(rows < 0)
+        if len(new):
+            start = self._size
+            self._reserve(start + len(new))
+            fresh = self._rows[start:start + len(new)]
+            fresh[:] = 0
+            fresh["segment"] = [segments[i] for i in new]
+            fresh["weight"] = defaults.get("weight", 1.0)
+            fresh["decay"] = defaults.get("decay", 0.95)
+            rows[new] = np.arange(start, start + len(new))
+            for i, row in zip(new.tolist(), range(start, start + len(new))):
+                index[segments[i]] = row
+            self._size += len(new)
+        return rows
 
     def update(self, segment: int, resonance: float, cycle: int, defaults: dict):
         """
@@ -27,72 +101,93 @@ class Memory:
         Rule 1: Activation (state.value += resonance * weight)
         Rule 2: Decay (state.value *= decay)
         """
-        if segment not in self.states:
-            # Initialize new state
-            self.states[segment] = np.zeros(1, dtype=STATE_DTYPE)[0]
-            self.states[segment]["segment"] = segment
-            self.states[segment]["weight"] = defaults.get("weight", 1.0)
-            self.states[segment]["decay"] = defaults.get("decay", 0.95)
-
-        state = self.states[segment]
-        # 1. Activate
-        state["value"] += np.float32(resonance) * state["weight"]
-        # 2. Apply Decay (Deterministic aging)
-        state["value"] *= state["decay"]
-        # 3. Mark last seen cycle
-        state["last_seen"] = np.uint32(cycle)
+        self.update_many([segment], [resonance], cycle, defaults)
+
+    def update_many(self, segments, resonances, cycle: int, defaults: dict = None):
+        """
+        Applies update() for a batch of segments of one cycle, vectorised.
+        Same float32 arithmetic per row as update(); a segment listed more
+        than once is applied in order, like consecutive update() calls.
+        """
+        segments = [int(s) for s in np.asarray(segments, dtype=np.uint64).tolist()]
+        if not segments:
+            return
+        resonances = np.asarray(resonances, dtype=np.float32)
+        if len(set(segments)) != len(segments):
+            for segment, resonance in zip(segments, resonances):
+                self.update_many([segment], [resonance], cycle, defaults)
+            return
+
+        rows = self._rows_for(segments, defaults or {})
+        state = self._rows
+        # 1. Activate  2. Apply Decay (Deterministic aging)  3. Mark last seen cycle
+        value = state["value"][rows] + resonances * state["weight"][rows]
+        state["value"][rows] = value * state["decay"][rows]
+        state["last_seen"][rows] = np.uint32(cycle)
+        self.version += 1
 
     def snapshot(self):
         """Returns all current memory states."""
-        return list(self.states.values())
+        return list(self._rows[:self._size].copy())
 
     def get_state(self, segment: int):
         """Returns the state for a specific segment if it exists."""
-        return self.states.get(segment)
+        row = self._index.get(int(segment))
+        return None if row is None else self.rows()[row]
+
+    def _remove(self, drop):
+        """Drops rows where mask is set, keeping the survivors in insertion order."""
+        keep = ~drop
+        survivors = self._rows[:self._size][keep]
+        self._size = len(survivors)
+        self._rows[:self._size] = survivors
+        self._index = {int(seg): row for row, seg in enumerate(survivors["segment"].tolist())}
+        self.version += 1
 
     def cleanup_stale_segments(self, current_cycle: int, max_age: int):
         """
         Removes segments that have not been seen for more than max_age cycles.
         Ensures memory remains bounded and deterministic.
         """
-        stale_keys = [
-            seg for seg, state in self.states.items()
-            if (current_cycle - int(state["last_seen"])) > max_age
-        ]
-        for k in stale_keys:
-            del self.states[k]
-        return len(stale_keys)
+        last_seen = self._rows["last_seen"][:self._size].astype(np.int64)
+        stale = (current_cycle - last_seen) > max_age
+        removed = int(stale.sum())
+        if removed:
+            self._remove(stale)
+        return removed
 
     def enforce_boundaries(self, max_active_states: int):
         """
         Ensures the total number of segments in memory does not exceed max_active_states.
         Prunes segments with the lowest resonance values (least significant).
         """
-        if len(self.states) <= max_active_states:
+        if self._size <= max_active_states:
             return 0
-        
-        # Sort current states by resonance value ascending (lowest first)
-        # Using a list of tuples (segment_id, value)
-        sorted_states = sorted(
-            self.states.items(), 
-            key=lambda item: (float(item[1]["value"]), int(item[1]["last_seen"]))
-        )
-        
-        num_to_remove = len(self.states) - max_active_states
-        to_prune = sorted_states[:num_to_remove]
-        
-        for k, _ in to_prune:
-            del self.states[k]
-            
+
+        # Lowest (value, last_seen) first, ties in insertion order: argpartition
+        # finds the cut value in O(n); only rows tied at the cut need ordering.
+        num_to_remove = self._size - max(0, max_active_states)
+        values = self._rows["value"][:self._size]
+        cut = values[np.argpartition(values, num_to_remove - 1)[num_to_remove - 1]]
+        drop = values < cut
+        tied = np.flatnonzero(values == cut)
+        needed = num_to_remove - int(drop.sum())
+        order = np.lexsort((tied, self._rows["last_seen"][tied]))
+        drop[tied[order[:needed]]] = True
+
+        self._remove(drop)
         return num_to_remove
+
     def get_state_hash(self):
         """
         Computes a deterministic hash of the entire memory state.
         Uses SHA256 over the bytes of all current states sorted by segment ID.
         """
-        import hashlib
-        sorted_keys = sorted(self.states.keys())
-        hasher = hashlib.sha256()
-        for k in sorted_keys:
-            hasher.update(self.states[k].tobytes())
-        return hasher.hexdigest()
+        cached = getattr(self, "_hash_cache", None)
+        if cached and cached[0] == self.version:
+            return cached[1]
+        rows = self._rows[:self._size]
+        ordered = rows[np.argsort(rows["segment"], kind="stable")]
+        digest = hashlib.sha256(ordered.tobytes()).hexdigest()
+        self._hash_cache = (self.version, digest)
+        return digest
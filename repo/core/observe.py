@@ -2,6 +2,28 @@ import csv
 import os
 from pathlib import Path
 
+import numpy as np
+
+# Binary resonance log (.rlog): 16-byte header + fixed-size records, one
+# contiguous block per cycle. Records carry their cycle, so the block index
+# sidecar (<log>.idx) is only an accelerator and can be rebuilt from the data.
+RLOG_MAGIC = b"SHRRLOG\x00"
+RLOG_VERSION = 1
+RLOG_HEADER_SIZE = 16
+
+LOG_RECORD_DTYPE = np.dtype([
+    ("cycle", "<u4"),
+    ("resonance", "<f4"),
+    ("segment", "<u8"),
+])
+
+LOG_INDEX_DTYPE = np.dtype([
+    ("cycle", "<u4"),
+    ("count", "<u4"),
+    ("start", "<u8"),  # first record of the block
+])
+
+
 class ResonanceLogger:
     """
     Observer for Sheratan Resonance Cycles.
@@ -10,12 +32,12 @@ class ResonanceLogger:
     def __init__(self, path="logs/resonance_log.csv"):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        
+
         # Check if file exists to decide whether to write header
         exists = self.path.exists()
         self.file = open(self.path, "a", newline="", encoding="utf-8")
         self.writer = csv.writer(self.file)
-        
+
         if not exists:
             self.writer.writerow(["cycle", "segment", "resonance"])
             self.file.flush()
@@ -24,6 +46,12 @@ class ResonanceLogger:
         """Logs a single resonance result."""
         self.writer.writerow([cycle, int(segment), float(value)])
 
+    def log_cycle(self, cycle: int, segments, values):
+        """Logs all resonance results of one cycle."""
+        self.writer.writerows(
+            [cycle, seg, val] for seg, val in zip(np.asarray(segments).tolist(), np.asarray(values).tolist())
+        )
+
     def flush(self):
         """Flushes the log to disk."""
         self.file.flush()
@@ -31,3 +59,188 @@ class ResonanceLogger:
     def close(self):
         """Closes the log file."""
         self.file.close()
+
+
+class BinaryResonanceLogger:
+    """
+    Observer for Sheratan Resonance Cycles (binary format).
+    Appends one LOG_RECORD_DTYPE block per cycle and its entry in the
+    block index; replay memory-maps the file (see iter_log_blocks).
+    """
+    def __init__(self, path="logs/resonance_log.rlog"):
+        self.path = Path(path)
+        self.index_path = index_path_for(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not self.path.exists() or self.path.stat().st_size < RLOG_HEADER_SIZE:
+            with open(self.path, "wb") as f:
+                f.write(_rlog_header())
+            self.index_path.unlink(missing_ok=True)
+        else:
+            _check_header(self.path)
+        index = load_block_index(self.path)
+        self._records = int(index["start"][-1] + index["count"][-1]) if len(index) else 0
+        # Drop a torn tail (records or index bytes after the last complete block)
+        os.truncate(self.path, RLOG_HEADER_SIZE + self._records * LOG_RECORD_DTYPE.itemsize)
+        self.index_path.write_bytes(index.tobytes())
+
+        self.file = open(self.path, "ab")
+        self.index_file = open(self.index_path, "ab")
+        self._pending = []
+        self._pending_index = []
+
+    def log(self, cycle: int, segment: int, value: float):
+        """Logs a single resonance result (joins the cycle's current block)."""
+        self.log_cycle(cycle, [segment], [value])
+
+    def log_cycle(self, cycle: int, segments, values):
+        """Logs all resonance results of one cycle as one block."""
+        n = len(segments)
+        if n == 0:
+            return
+        block = np.empty(n, dtype=LOG_RECORD_DTYPE)
+        block["cycle"] = cycle
+        block["segment"] = segments
+        block["resonance"] = values
+        if self._pending_index and self._pending_index[-1][0] == cycle:
+            prev_cycle, prev_count, prev_start = self._pending_index[-1]
+            self._pending_index[-1] = (prev_cycle, prev_count + n, prev_start)
+        else:
+            self._pending_index.append((cycle, n, self._records))
+        self._pending.append(block)
+        self._records += n
+
+    def flush(self):
+        """Writes pending blocks (data first, then their index entries)."""
+        if not self._pending:
+            return
+        self.file.write(b"".join(block.tobytes() for block in self._pending))
+        self.file.flush()
+        self.index_file.write(np.array(self._pending_index, dtype=LOG_INDEX_DTYPE).tobytes())
+        self.index_file.flush()
+        self._pending = []
+        self._pending_index = []
+
+    def close(self):
+        """Flushes and closes the log files."""
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+
+
+def _rlog_header() -> bytes:
+    return RLOG_MAGIC + np.array([RLOG_VERSION, LOG_RECORD_DTYPE.itemsize], dtype="<u4").tobytes()
+
+
+def _check_header(path):
+    with open(path, "rb") as f:
+        header = f.read(RLOG_HEADER_SIZE)
+    if header != _rlog_header():
+        raise ValueError(f"{path} is not a v{RLOG_VERSION} binary resonance log")
+
+
+def index_path_for(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def is_binary_log(path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(RLOG_MAGIC)) == RLOG_MAGIC
+
+
+def open_resonance_logger(path):
+    """CSV logger for *.csv paths, binary logger otherwise (e.g. *.rlog)."""
+    if Path(path).suffix.lower() == ".csv":
+        return ResonanceLogger(path=path)
+    return BinaryResonanceLogger(path=path)
+
+
+def _map_records(path):
+    size = Path(path).stat().st_size - RLOG_HEADER_SIZE
+    count = max(0, size) // LOG_RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=LOG_RECORD_DTYPE)
+    return np.memmap(path, dtype=LOG_RECORD_DTYPE, mode="r", offset=RLOG_HEADER_SIZE, shape=(count,))
+
+
+def rebuild_block_index(records):
+    """Block index from the records themselves: one block per run of equal cycle."""
+    if len(records) == 0:
+        return np.zeros(0, dtype=LOG_INDEX_DTYPE)
+    cycles = np.asarray(records["cycle"])
+    starts = np.flatnonzero(np.concatenate(([True], cycles[1:] != cycles[:-1])))
+    index = np.empty(len(starts), dtype=LOG_INDEX_DTYPE)
+    index["cycle"] = cycles[starts]
+    index["start"] = starts
+    index["count"] = np.diff(np.append(starts, len(cycles)))
+    return index
+
+
+def load_block_index(path):
+    """
+    Block index of a binary log. A missing sidecar, or one that does not
+    cover the data file (torn write, copied without it), is rebuilt.
+    """
+    path = Path(path)
+    records = _map_records(path)
+    index_path = index_path_for(path)
+    index = np.zeros(0, dtype=LOG_INDEX_DTYPE)
+    if index_path.exists():
+        raw = index_path.read_bytes()
+        index = np.frombuffer(raw[:len(raw) - len(raw) % LOG_INDEX_DTYPE.itemsize], dtype=LOG_INDEX_DTYPE)
+    covered = int(index["start"][-1] + index["count"][-1]) if len(index) else 0
+    if covered > len(records) or (covered < len(records) and not index_path.exists()):
+        index = rebuild_block_index(records)
+        index_path.write_bytes(index.tobytes())
+    return index[index["start"] + index["count"] <= len(records)]
+
+
+def iter_log_blocks(path):
+    """
+    Yields (cycle, segments, resonances) per cycle block of a resonance log.
+    Binary logs are memory-mapped; CSV logs are grouped by consecutive cycle.
+    """
+    if is_binary_log(path):
+        _check_header(path)
+        records = _map_records(path)
+        for cycle, count, start in load_block_index(path).tolist():
+            block = records[start:start + count]
+            yield cycle, block["segment"], block["resonance"]
+        return
+
+    batch_cycle, segments, resonances = None, [], []
+    with open(path, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames and not {"cycle", "segment", "resonance"} <= set(reader.fieldnames):
+            raise ValueError(f"{path}: expected cycle,segment,resonance columns, got {reader.fieldnames}")
+        for row in reader:
+            cycle = int(row["cycle"])
+            if cycle != batch_cycle:
+                if segments:
+                    yield batch_cycle, segments, resonances
+                batch_cycle, segments, resonances = cycle, [], []
+            segments.append(int(row["segment"]))
+            resonances.append(float(row["resonance"]))
+    if segments:
+        yield batch_cycle, segments, resonances
+
+
+def convert_csv_log(csv_path, out_path=None) -> Path:
+    """Converts a CSV resonance log to the binary format. Returns the new path."""
+    out_path = Path(out_path) if out_path else Path(csv_path).with_suffix(".rlog")
+    if out_path.exists():
+        raise FileExistsError(out_path)
+    logger = BinaryResonanceLogger(out_path)
+    try:
+        for cycle, segments, resonances in iter_log_blocks(csv_path):
+            logger.log_cycle(cycle, segments, resonances)
+            if len(logger._pending) >= 1024:
+                logger.flush()
+    except Exception:
+        logger.close()
+        out_path.unlink(missing_ok=True)
+        index_path_for(out_path).unlink(missing_ok=True)
+        raise
+    logger.close()
+    return out_path
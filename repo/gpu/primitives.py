@@ -17,6 +17,42 @@ def reduce_values(device_array, op="sum"):
     if op == "sum": return cp.sum(device_array)
     return device_array
 
+def _segment_reduce_sum_cpu(segments, values):
+    """
+    Sort-based CPU reduction, O(N log N) instead of one mask scan per segment.
+
+    Results are bit-identical to the previous np.sum(values[segments == seg])
+    loop: a stable sort keeps each segment's values in arrival order, and
+    segments of equal length are summed together as rows of a 2-D gather.
+    np.sum over the last axis runs the same pairwise loop per row as over
+    the 1-D masked copy. Only one bucket per distinct segment length is
+    visited, which is at most sqrt(2N) buckets.
+    """
+    segments = np.asarray(segments)
+    values = np.asarray(values)
+    if len(segments) == 0:
+        return np.unique(segments), np.zeros(0, dtype=np.float32)
+
+    if np.all(segments[1:] >= segments[:-1]):
+        sorted_segs, sorted_vals = segments, values
+    else:
+        order = np.argsort(segments, kind="stable")
+        sorted_segs, sorted_vals = segments[order], values[order]
+
+    starts = np.flatnonzero(np.concatenate(([True], sorted_segs[1:] != sorted_segs[:-1])))
+    lengths = np.diff(np.append(starts, len(sorted_segs)))
+    unique_segs = sorted_segs[starts]
+
+    reduced_vals = np.empty(len(starts), dtype=np.float32)
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        if length == 1:
+            reduced_vals[rows] = sorted_vals[starts[rows]]
+            continue
+        gather = starts[rows][:, None] + np.arange(length)
+        reduced_vals[rows] = np.sum(sorted_vals[gather], axis=1)
+    return unique_segs, reduced_vals
+
 def segment_reduce_sum(segments, values):
     """
     segments: uint64 array (device or host)
@@ -24,12 +60,7 @@ def segment_reduce_sum(segments, values):
     returns: (unique_segments, reduced_values)
     """
     if not HAS_GPU:
-        # CPU Fallback using numpy
-        unique_segs = np.unique(segments)
-        reduced_vals = []
-        for seg in unique_segs:
-            reduced_vals.append(np.sum(values[segments == seg]))
-        return unique_segs, np.array(reduced_vals, dtype=np.float32)
+        return _segment_reduce_sum_cpu(segments, values)
 
     # GPU Implementation (Optimized via Prefix Scan)
     # 1. Radix Sort
@@ -112,9 +112,23 @@ async def get_job(job_id: str):
 
 @app.post("/api/event")
 async def post_event(payload: dict):
-    events = payload.get("events", [])
+    # {"events": [(id, value, ts, ch), ...]} or {"columns": {"id": [...], "value": [...], ...}}
+    events = payload.get("columns") or payload.get("events", [])
     if not events: return {"ok": False, "error": "empty"}
-    return {"ok": True, "resonances": engine.process_events(events)}
+    try:
+        return {"ok": True, "resonances": engine.process_events(events)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/event/binary")
+async def post_event_binary(request: Request):
+    # Body: packed little-endian records (u32 id, f32 value, u32 ts, u16 ch), see core.events.EVENT_RECORD_DTYPE
+    body = await request.body()
+    if not body: return {"ok": False, "error": "empty"}
+    try:
+        return {"ok": True, "resonances": engine.process_events(body)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/state")
 async def get_state():
@@ -124,14 +138,7 @@ async def get_state():
 
 @app.get("/api/identity")
 async def get_identity(threshold: float = 0.5, top_k: int = 10):
-    from core.identity import select_top_states
-    states = engine.get_state_snapshot()
-    selected = select_top_states(
-        states, threshold=threshold, top_k=top_k, 
-        current_cycle=engine.cycle_count,
-        last_selected_segments=getattr(engine, "_last_selected", set())
-    )
-    engine._last_selected = {int(s["segment"]) for s in selected}
+    selected = engine.select_identity(threshold=threshold, top_k=top_k)
     return {"ok": True, "selected_states": selected}
 
 @app.get("/")
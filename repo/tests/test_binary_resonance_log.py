@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+import pytest
+
+from core.engine import SheratanEngine
+from core.observe import (
+    BinaryResonanceLogger, LOG_RECORD_DTYPE, RLOG_HEADER_SIZE, convert_csv_log,
+    index_path_for, iter_log_blocks, load_block_index,
+)
+
+
+def make_config(log_path):
+    class Config:
+        WINDOW_SIZE = 1000
+        WINDOW_STRIDE = 250
+        MAX_SEGMENT_AGE = 5
+        max_active_states = 300
+        RESONANCE_LOG = str(log_path)
+    return Config()
+
+
+def run_live(log_path, cycles=30, seed=5):
+    rng = np.random.default_rng(seed)
+    engine = SheratanEngine(make_config(log_path))
+    for _ in range(cycles):
+        n = int(rng.integers(0, 400))
+        engine.process_events({
+            "id": np.arange(n), "value": rng.random(n, dtype=np.float32),
+            "timestamp": rng.integers(0, 60_000, n), "channel": rng.integers(0, 6, n),
+        })
+    engine.shutdown()
+    return engine
+
+
+def replay(log_path, tmp_path):
+    engine = SheratanEngine(make_config(tmp_path / "replay_out.rlog"))
+    count = engine.replay_from_log(str(log_path))
+    engine.shutdown()
+    return engine, count
+
+
+def test_binary_replay_hash_matches_csv_replay(tmp_path):
+    csv_live = run_live(tmp_path / "live.csv")
+    bin_live = run_live(tmp_path / "live.rlog")
+    assert csv_live.memory.get_state_hash() == bin_live.memory.get_state_hash()
+
+    csv_replayed, csv_count = replay(tmp_path / "live.csv", tmp_path)
+    bin_replayed, bin_count = replay(tmp_path / "live.rlog", tmp_path)
+    converted = convert_csv_log(tmp_path / "live.csv", tmp_path / "converted.rlog")
+    conv_replayed, conv_count = replay(converted, tmp_path)
+
+    assert csv_count == bin_count == conv_count > 0
+    assert bin_replayed.memory.get_state_hash() == csv_replayed.memory.get_state_hash()
+    assert conv_replayed.memory.get_state_hash() == csv_replayed.memory.get_state_hash()
+    assert bin_replayed.cycle_count == csv_replayed.cycle_count
+    assert (tmp_path / "converted.rlog").read_bytes() == (tmp_path / "live.rlog").read_bytes()
+
+
+def test_block_index_rebuild_and_torn_tail(tmp_path):
+    path = tmp_path / "r.rlog"
+    logger = BinaryResonanceLogger(path)
+    logger.log_cycle(0, [1, 2, 3], [0.5, 0.25, 1.0])
+    logger.log(1, 7, 2.0)
+    logger.log(1, 8, 3.0)
+    logger.close()
+
+    index = load_block_index(path)
+    assert index.tolist() == [(0, 3, 0), (1, 2, 3)]
+
+    # Sidecar lost: rebuilt from the records' cycles
+    index_path_for(path).unlink()
+    assert load_block_index(path).tolist() == [(0, 3, 0), (1, 2, 3)]
+
+    # Crash between data and index write: readers ignore the tail, the next logger drops it
+    with open(path, "ab") as f:
+        f.write(np.zeros(2, dtype=LOG_RECORD_DTYPE).tobytes()[:-5])
+    assert [c for c, _, _ in iter_log_blocks(path)] == [0, 1]
+    logger = BinaryResonanceLogger(path)
+    logger.log_cycle(2, [9], [1.5])
+    logger.close()
+    assert path.stat().st_size == RLOG_HEADER_SIZE + 6 * LOG_RECORD_DTYPE.itemsize
+    blocks = [(c, list(map(int, s)), r.tolist()) for c, s, r in iter_log_blocks(path)]
+    assert blocks[-1] == (2, [9], [1.5])
+
+
+def test_convert_refuses_to_overwrite(tmp_path):
+    src = tmp_path / "a.csv"
+    src.write_text("cycle,segment,resonance\n0,1,0.5\n")
+    out = convert_csv_log(src)
+    assert out.suffix == ".rlog"
+    with pytest.raises(FileExistsError):
+        convert_csv_log(src)
+
+
+def test_binary_log_replay_speed(tmp_path):
+    rng = np.random.default_rng(0)
+    csv_logger_path, bin_path = tmp_path / "big.csv", tmp_path / "big.rlog"
+    engine = SheratanEngine(make_config(csv_logger_path))
+    segments = rng.choice(1 << 24, size=2_000, replace=False).astype(np.uint64)
+    for cycle in range(100):
+        engine.logger.log_cycle(cycle, segments, rng.random(len(segments), dtype=np.float32))
+    engine.shutdown()
+    convert_csv_log(csv_logger_path, bin_path)
+
+    timings = {}
+    for name, path in (("csv", csv_logger_path), ("binary", bin_path)):
+        start = time.perf_counter()
+        replayed, count = replay(path, tmp_path)
+        timings[name] = time.perf_counter() - start
+        timings[name + "_hash"] = replayed.memory.get_state_hash()
+    print(f"[bench] replay of {count} records: csv {timings['csv'] * 1000:.0f} ms, "
+          f"binary {timings['binary'] * 1000:.0f} ms; size csv {csv_logger_path.stat().st_size} "
+          f"vs binary {bin_path.stat().st_size} bytes")
+    assert timings["csv_hash"] == timings["binary_hash"]
+    assert timings["binary"] < timings["csv"]
@@ -0,0 +1,83 @@
+# Throughput benchmark: python -m tests.test_event_ingestion
+import time
+
+import numpy as np
+import pytest
+
+from core.events import EVENT_DTYPE, EVENT_RECORD_DTYPE, create_event_buffer
+
+
+def reference_create_event_buffer(events, window_size=1000, window_stride=None):
+    # Previous per-event expansion loop
+    if window_stride is None:
+        window_stride = window_size
+    processed = []
+    for eid, val, ts, ch in events:
+        k_min = max(0, (ts - window_size + window_stride) // window_stride)
+        k_max = ts // window_stride
+        for k in range(k_min, k_max + 1):
+            segment = (np.uint64(ch) << 32) | np.uint64(k)
+            processed.append((eid, val, ts, ch, k, segment))
+    return np.array(processed, dtype=EVENT_DTYPE)
+
+
+def random_events(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return list(zip(range(n), rng.random(n).tolist(),
+                    rng.integers(0, 100_000, n).tolist(), rng.integers(0, 8, n).tolist()))
+
+
+def to_columns(events):
+    ids, values, ts, ch = zip(*events)
+    return {"id": list(ids), "value": list(values), "timestamp": list(ts), "channel": list(ch)}
+
+
+def to_binary(events):
+    return np.array(events, dtype=EVENT_RECORD_DTYPE).tobytes()
+
+
+@pytest.mark.parametrize("window_size,window_stride", [(1000, None), (1000, 500), (1000, 250), (1000, 300), (100, 400)])
+def test_vectorized_buffer_matches_reference(window_size, window_stride):
+    events = random_events(2_000) + [(9, 0.5, 0, 1), (10, 0.25, 999, 1), (11, 1.0, 1000, 65535)]
+    expected = reference_create_event_buffer(events, window_size, window_stride)
+    for raw in (events, to_columns(events), to_binary(events)):
+        buf = create_event_buffer(raw, window_size, window_stride)
+        assert buf.dtype == EVENT_DTYPE
+        assert buf.tobytes() == expected.tobytes()
+
+
+def test_empty_and_invalid_input():
+    assert len(create_event_buffer([])) == 0
+    assert len(create_event_buffer(b"")) == 0
+    with pytest.raises(ValueError):
+        create_event_buffer(b"\x00" * (EVENT_RECORD_DTYPE.itemsize + 1))
+    with pytest.raises(ValueError):
+        create_event_buffer({"id": [1], "value": [0.5]})
+
+
+def run_benchmark(n_events=200_000, window_size=1000, window_stride=250):
+    events = random_events(n_events)
+    inputs = {"tuples": events, "columns": to_columns(events), "binary": to_binary(events)}
+
+    start = time.perf_counter()
+    expected = reference_create_event_buffer(events[:20_000], window_size, window_stride)
+    legacy_rate = 20_000 / (time.perf_counter() - start)
+    print(f"[bench] legacy loop: {legacy_rate / 1e3:8.0f} k events/s ({len(expected) / 20_000:.0f} windows/event)")
+
+    rates = {}
+    for name, raw in inputs.items():
+        start = time.perf_counter()
+        create_event_buffer(raw, window_size, window_stride)
+        rates[name] = n_events / (time.perf_counter() - start)
+        print(f"[bench] {name:>8}:    {rates[name] / 1e3:8.0f} k events/s")
+    return legacy_rate, rates
+
+
+def test_ingestion_throughput():
+    legacy_rate, rates = run_benchmark()
+    assert rates["binary"] > 5 * legacy_rate
+    assert rates["tuples"] > legacy_rate
+
+
+if __name__ == "__main__":
+    run_benchmark(1_000_000)
@@ -0,0 +1,135 @@
+import hashlib
+import time
+
+import numpy as np
+
+from core.engine import SheratanEngine
+from core.memory import Memory, STATE_DTYPE
+
+DEFAULTS = {"weight": 1.0, "decay": 0.95}
+
+
+class LegacyMemory:
+    """Previous dict-of-scalars Memory, kept as the bit-compatibility reference."""
+    def __init__(self):
+        self.states = {}
+
+    def update(self, segment, resonance, cycle, defaults):
+        if segment not in self.states:
+            self.states[segment] = np.zeros(1, dtype=STATE_DTYPE)[0]
+            self.states[segment]["segment"] = segment
+            self.states[segment]["weight"] = defaults.get("weight", 1.0)
+            self.states[segment]["decay"] = defaults.get("decay", 0.95)
+        state = self.states[segment]
+        state["value"] += np.float32(resonance) * state["weight"]
+        state["value"] *= state["decay"]
+        state["last_seen"] = np.uint32(cycle)
+
+    def cleanup_stale_segments(self, current_cycle, max_age):
+        stale = [seg for seg, s in self.states.items() if (current_cycle - int(s["last_seen"])) > max_age]
+        for k in stale:
+            del self.states[k]
+        return len(stale)
+
+    def enforce_boundaries(self, max_active_states):
+        if len(self.states) <= max_active_states:
+            return 0
+        ordered = sorted(self.states.items(), key=lambda it: (float(it[1]["value"]), int(it[1]["last_seen"])))
+        num_to_remove = len(self.states) - max_active_states
+        for k, _ in ordered[:num_to_remove]:
+            del self.states[k]
+        return num_to_remove
+
+    def get_state_hash(self):
+        hasher = hashlib.sha256()
+        for k in sorted(self.states.keys()):
+            hasher.update(self.states[k].tobytes())
+        return hasher.hexdigest()
+
+
+def _drive(memory, rng, cycles=60, n_segments=400):
+    for cycle in range(cycles):
+        segments = rng.choice(n_segments, size=rng.integers(1, 80), replace=False).tolist()
+        # Coarse values so boundary pruning hits ties at the cut
+        values = (rng.integers(0, 8, len(segments)) / 4).astype(np.float32)
+        if isinstance(memory, Memory):
+            memory.update_many(segments, values, cycle, DEFAULTS)
+        else:
+            for seg, val in zip(segments, values.tolist()):
+                memory.update(seg, val, cycle, DEFAULTS)
+        if cycle % 10 == 0:
+            yield memory.cleanup_stale_segments(cycle, 15), memory.enforce_boundaries(120)
+        yield memory.get_state_hash()
+
+
+def test_columnar_memory_matches_legacy_hashes_and_pruning():
+    new, legacy = Memory(), LegacyMemory()
+    for got, expected in zip(_drive(new, np.random.default_rng(7)), _drive(legacy, np.random.default_rng(7))):
+        assert got == expected
+    assert set(new.states) == set(legacy.states)
+    for seg, state in legacy.states.items():
+        assert new.states[seg].tobytes() == state.tobytes()
+
+
+def test_update_many_with_repeated_segment_matches_sequential_updates():
+    new, legacy = Memory(), LegacyMemory()
+    segments, values = [3, 5, 3, 3], [0.25, 1.5, 0.1, 0.7]
+    new.update_many(segments, values, 4, DEFAULTS)
+    for seg, val in zip(segments, values):
+        legacy.update(seg, val, 4, DEFAULTS)
+    assert new.get_state_hash() == legacy.get_state_hash()
+    assert len(new) == 2 and new.get_state(3)["last_seen"] == 4
+
+
+def test_states_view_and_snapshot():
+    memory = Memory()
+    memory.update(np.uint64(1 << 32 | 7), 0.5, 0, DEFAULTS)
+    assert np.uint64(1 << 32 | 7) in memory.states
+    assert 1 not in memory.states
+    assert len(memory.states) == 1
+    snap = memory.snapshot()
+    assert int(snap[0]["segment"]) == 1 << 32 | 7
+    assert memory.rows().flags.writeable is False
+    memory.clear()
+    assert memory.get_state_hash() == hashlib.sha256().hexdigest()
+
+
+def test_engine_replay_hash_matches_live(tmp_path):
+    class Config:
+        WINDOW_SIZE = 100
+        RESONANCE_LOG = str(tmp_path / "live.csv")
+
+    rng = np.random.default_rng(3)
+    live = SheratanEngine(Config())
+    for cycle in range(5):
+        live.process_events([(i, float(rng.random()), int(rng.integers(0, 5000)), int(rng.integers(0, 4)))
+                             for i in range(200)])
+    live.shutdown()
+
+    Config.RESONANCE_LOG = str(tmp_path / "replay.csv")
+    replayed = SheratanEngine(Config())
+    replayed.replay_from_log(str(tmp_path / "live.csv"))
+    replayed.shutdown()
+    assert replayed.memory.get_state_hash() == live.memory.get_state_hash()
+
+
+def test_update_many_throughput():
+    rng = np.random.default_rng(1)
+    segments = rng.choice(1 << 20, size=50_000, replace=False).astype(np.uint64)
+    memory, legacy = Memory(), LegacyMemory()
+
+    start = time.perf_counter()
+    for cycle in range(5):
+        memory.update_many(segments, rng.random(len(segments), dtype=np.float32), cycle, DEFAULTS)
+    memory.enforce_boundaries(10_000)
+    memory.get_state_hash()
+    columnar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seg, val in zip(segments[:5_000].tolist(), rng.random(5_000).tolist()):
+        legacy.update(seg, val, 0, DEFAULTS)
+    per_row = (time.perf_counter() - start) / 5_000
+
+    print(f"[bench] columnar: 5 x 50k updates + prune + hash in {columnar * 1000:.0f} ms; "
+          f"legacy: {per_row * 1e6:.1f} us/update ({per_row * 250_000:.1f} s for 250k)")
+    assert columnar < per_row * 250_000
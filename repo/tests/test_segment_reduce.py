@@ -0,0 +1,86 @@
+# Benchmark over the full event/segment grid: python -m tests.test_segment_reduce
+import time
+
+import numpy as np
+import pytest
+
+from core.events import EVENT_DTYPE
+from core.resonance import compute_segment_resonance
+from gpu.primitives import _segment_reduce_sum_cpu
+
+EVENT_COUNTS = [10_000, 100_000, 1_000_000]
+SEGMENT_CARDINALITIES = [10, 1_000, 50_000]
+
+
+def reference_segment_reduce_sum(segments, values):
+    # Previous CPU fallback: one mask scan per unique segment (O(unique x N))
+    unique_segs = np.unique(segments)
+    return unique_segs, np.array([np.sum(values[segments == seg]) for seg in unique_segs], dtype=np.float32)
+
+
+def make_event_buffer(n_events, n_segments, seed=0):
+    rng = np.random.default_rng(seed)
+    buf = np.zeros(n_events, dtype=EVENT_DTYPE)
+    buf["id"] = np.arange(n_events)
+    buf["value"] = rng.random(n_events, dtype=np.float32)
+    buf["channel"] = rng.integers(0, 16, n_events)
+    buf["window"] = rng.integers(0, max(1, n_segments // 16), n_events)
+    buf["segment"] = (buf["channel"].astype(np.uint64) << np.uint64(32)) | buf["window"].astype(np.uint64)
+    return buf
+
+
+def run_benchmark(event_counts=EVENT_COUNTS, cardinalities=SEGMENT_CARDINALITIES, check_limit=2 * 10**8):
+    """Times compute_segment_resonance per (events, segments) and checks it against the reference loop."""
+    rows = []
+    for n_events in event_counts:
+        for n_segments in cardinalities:
+            buf = make_event_buffer(n_events, n_segments)
+            start = time.perf_counter()
+            result = compute_segment_resonance(buf)
+            elapsed = time.perf_counter() - start
+
+            checked = n_events * len(result) <= check_limit
+            if checked:
+                segs, vals = reference_segment_reduce_sum(buf["segment"], buf["value"])
+                assert result == list(zip(segs.tolist(), vals.tolist()))
+            rows.append((n_events, len(result), elapsed, checked))
+            print(f"[bench] events={n_events:>9,} segments={len(result):>7,} "
+                  f"{elapsed * 1000:8.1f} ms  {n_events / elapsed / 1e6:6.1f} M events/s"
+                  f"{'  (== reference)' if checked else ''}")
+    return rows
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_cpu_reduce_bit_identical_to_reference(dtype):
+    rng = np.random.default_rng(42)
+    for n_events, n_segments in [(1, 1), (7, 3), (5_000, 7), (20_000, 20_000), (50_000, 300)]:
+        segments = rng.integers(0, n_segments, n_events).astype(np.uint64)
+        values = (rng.random(n_events) * 100).astype(dtype)
+        segs, vals = _segment_reduce_sum_cpu(segments, values)
+        ref_segs, ref_vals = reference_segment_reduce_sum(segments, values)
+        assert segs.dtype == ref_segs.dtype and vals.dtype == np.float32
+        np.testing.assert_array_equal(segs, ref_segs)
+        np.testing.assert_array_equal(vals, ref_vals)
+
+
+def test_cpu_reduce_empty_and_presorted():
+    segs, vals = _segment_reduce_sum_cpu(np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.float32))
+    assert len(segs) == 0 and vals.dtype == np.float32
+
+    segments = np.repeat(np.arange(1000, dtype=np.uint64), 5)
+    values = np.linspace(0, 1, len(segments), dtype=np.float32)
+    segs, vals = _segment_reduce_sum_cpu(segments, values)
+    ref_segs, ref_vals = reference_segment_reduce_sum(segments, values)
+    np.testing.assert_array_equal(segs, ref_segs)
+    np.testing.assert_array_equal(vals, ref_vals)
+
+
+def test_segment_resonance_benchmark():
+    rows = run_benchmark([10_000, 200_000], [10, 1_000, 50_000])
+    assert any(checked for *_, checked in rows)
+    # The per-segment mask loop took minutes on 200k events x 50k segments
+    assert all(elapsed < 5.0 for _, _, elapsed, _ in rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,29 @@
+# repo/tools/convert_resonance_log.py
+"""
+Convert CSV resonance logs to the binary block format (.rlog + .rlog.idx).
+
+Usage: python tools/convert_resonance_log.py logs/resonance_log.csv [out.rlog]
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.observe import convert_csv_log, load_block_index
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(__doc__.strip())
+        sys.exit(2)
+    src = Path(sys.argv[1])
+    out = convert_csv_log(src, sys.argv[2] if len(sys.argv) == 3 else None)
+    blocks = load_block_index(out)
+    print(f"[convert] {src} -> {out}: {int(blocks['count'].sum())} records in {len(blocks)} cycle blocks "
+          f"({src.stat().st_size} -> {out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
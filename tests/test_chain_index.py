@@ -0,0 +1,76 @@
+"""
+ChainIndex on SQLite: API compatibility, bulk put_many and migration of the
+legacy whole-document JSON index (files are moved aside only once committed).
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import chain_index
+from core.chain_index import ChainIndex
+
+
+def test_put_get_delete(tmp_path):
+    idx = ChainIndex(str(tmp_path / "chain_index.db"))
+    assert idx.get("missing") is None
+
+    idx.put("job-1", {"chain_id": "c1", "role": "root"})
+    idx.put("job-1", {"chain_id": "c1", "role": "llm"})  # overwrite
+    assert idx.get("job-1") == {"chain_id": "c1", "role": "llm"}
+
+    idx.put_many([(f"child-{i}", {"chain_id": "c1", "depth": i}) for i in range(50)])
+    assert idx.get("child-49") == {"chain_id": "c1", "depth": 49}
+
+    idx.delete("job-1")
+    idx.delete("job-1")  # no-op
+    assert idx.get("job-1") is None
+
+    # Persistent across instances
+    assert ChainIndex(str(tmp_path / "chain_index.db")).get("child-0") == {"chain_id": "c1", "depth": 0}
+
+
+def test_migrates_legacy_json_files(tmp_path):
+    # main.py used chain_index.json, ChainRunner wrote JSON into chain_index.db
+    (tmp_path / "chain_index.json").write_text(json.dumps({"jobs": {"a": {"chain_id": "c-a"}}}), encoding="utf-8")
+    (tmp_path / "chain_index.db").write_text(json.dumps({"jobs": {"b": {"chain_id": "c-b"}}}), encoding="utf-8")
+
+    idx = ChainIndex(str(tmp_path / "chain_index.json"))
+    assert idx.path == str(tmp_path / "chain_index.db")
+    assert idx.get("a") == {"chain_id": "c-a"}
+    assert idx.get("b") == {"chain_id": "c-b"}
+    assert (tmp_path / "chain_index.json.migrated.json").exists()
+    assert (tmp_path / "chain_index.db.migrated.json").exists()
+    assert not (tmp_path / "chain_index.json").exists()
+
+    # Second open: nothing left to migrate, data intact
+    again = ChainIndex(str(tmp_path / "chain_index.db"))
+    assert again.get("a") == {"chain_id": "c-a"}
+
+
+def test_legacy_files_kept_until_migration_commits(tmp_path, monkeypatch):
+    (tmp_path / "chain_index.json").write_text(json.dumps({"jobs": {"a": {"chain_id": "c-a"}}}), encoding="utf-8")
+    (tmp_path / "chain_index.db").write_text(json.dumps({"jobs": {"b": {"chain_id": "c-b"}}}), encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(chain_index.json, "dumps", fail)
+    with pytest.raises(RuntimeError):
+        ChainIndex(str(tmp_path / "chain_index.json"))
+    monkeypatch.undo()
+    assert (tmp_path / "chain_index.json").exists()
+    assert (tmp_path / "chain_index.db.migrating.json").exists()
+    assert not list(tmp_path.glob("*.migrated.json"))
+
+    # Next open picks both up again
+    idx = ChainIndex(str(tmp_path / "chain_index.json"))
+    assert idx.get("a") == {"chain_id": "c-a"} and idx.get("b") == {"chain_id": "c-b"}
+    assert sorted(p.name for p in tmp_path.glob("*.migrat*")) == [
+        "chain_index.db.migrated.json", "chain_index.json.migrated.json"]
@@ -0,0 +1,104 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    yield tmp_path
+    database.close_all_connections()
+
+
+def test_connection_reused_per_thread(fresh_db):
+    before = database.get_pool_stats()
+    with database.get_db() as c1:
+        pass
+    with database.get_db() as c2:
+        assert c1 is c2
+        assert c2.execute("PRAGMA cache_size").fetchone()[0] < 0
+    after = database.get_pool_stats()
+    assert after["reused"] >= before["reused"] + 1
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(_conn_id()))
+    t.start()
+    t.join()
+    assert other and other[0] != id(c1)
+
+
+def _conn_id():
+    with database.get_db() as conn:
+        return id(conn)
+
+
+def test_readonly_connection_rejects_writes(fresh_db):
+    with database.get_db(readonly=True) as ro:
+        with pytest.raises(sqlite3.OperationalError):
+            ro.execute("DELETE FROM jobs")
+    with database.get_db() as rw:
+        assert rw is not ro
+
+
+def test_uncommitted_work_discarded_on_exit(fresh_db):
+    with database.get_db() as conn:
+        conn.execute("INSERT INTO rate_limit_config VALUES ('s', 1, 1, 0, 'now')")
+        with database.get_db() as nested:
+            # Nested use shares the connection and must not roll back the outer block
+            assert nested.in_transaction
+        assert conn.in_transaction
+    with database.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM rate_limit_config").fetchone()[0] == 0
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM rate_limit_config").fetchone()[0]
+
+
+def test_nested_blocks_use_savepoints(fresh_db):
+    with database.get_db() as conn:
+        conn.execute("INSERT INTO rate_limit_config VALUES ('outer', 1, 1, 0, 'now')")
+
+        # A failing inner block discards only its own writes
+        with pytest.raises(RuntimeError):
+            with database.get_db() as inner:
+                inner.execute("INSERT INTO rate_limit_config VALUES ('failed', 1, 1, 0, 'now')")
+                raise RuntimeError("boom")
+        assert _count(conn) == 1
+
+        # An inner commit does not commit the outer block's pending writes
+        with database.get_db() as inner:
+            inner.execute("INSERT INTO rate_limit_config VALUES ('inner', 1, 1, 0, 'now')")
+            inner.commit()
+        conn.rollback()
+    with database.get_db() as conn:
+        assert _count(conn) == 0
+
+        # With no outer transaction an inner commit is durable
+        with database.get_db() as inner:
+            inner.execute("INSERT INTO rate_limit_config VALUES ('inner', 1, 1, 0, 'now')")
+            inner.commit()
+            inner.execute("INSERT INTO rate_limit_config VALUES ('uncommitted', 1, 1, 0, 'now')")
+        assert _count(conn) == 1
+    with database.get_db(readonly=True) as ro:
+        with database.get_db(readonly=True) as nested:
+            assert _count(nested) == 1
+
+
+def test_close_all_reopens(fresh_db):
+    with database.get_db() as conn:
+        conn.execute("SELECT 1")
+    database.close_all_connections()
+    with database.get_db() as conn2:
+        assert conn2.execute("SELECT 1").fetchone()[0] == 1
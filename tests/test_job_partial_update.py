@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database, models, storage
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    yield tmp_path
+    database.close_all_connections()
+
+
+def _big_job(job_id="job-1"):
+    ts = "2026-01-01T00:00:00Z"
+    payload = {
+        "kind": "analyze_file",
+        "params": {"path": "core/main.py"},
+        "artifacts": {f"file_{i}": "x" * 2000 for i in range(25)},
+    }
+    return storage.create_job(models.Job(
+        id=job_id, task_id="t", payload=payload, status="pending",
+        created_at=ts, updated_at=ts,
+    ))
+
+
+def _bytes_written(fn):
+    """Expanded SQL bytes of UPDATE statements issued on this thread's write connection."""
+    written = []
+    with database.get_db() as conn:
+        conn.set_trace_callback(
+            lambda sql: written.append(len(sql.encode("utf-8"))) if sql.lstrip().upper().startswith("UPDATE") else None
+        )
+    try:
+        fn()
+    finally:
+        with database.get_db() as conn:
+            conn.set_trace_callback(None)
+    return sum(written)
+
+
+def test_update_job_fields_writes_only_changed_columns(fresh_db):
+    job = _big_job()
+    assert storage.update_job_fields(job.id, status="working")
+    stored = storage.get_job(job.id)
+    assert stored.status == "working"
+    assert stored.payload == job.payload
+
+    with pytest.raises(ValueError):
+        storage.update_job_fields(job.id, not_a_column=1)
+
+
+def test_update_job_fields_compare_and_set(fresh_db):
+    job = _big_job()
+    assert storage.update_job_fields(job.id, expected_status="pending", status="working")
+    assert not storage.update_job_fields(job.id, expected_status="pending", status="working")
+    assert not storage.update_job_fields("missing", status="working")
+    assert storage.get_job(job.id).status == "working"
+
+
+def test_bytes_written_per_dispatch(fresh_db):
+    """Dispatch = bridge persists mesh selection + dispatcher flips status."""
+    def full_rewrite(job_id):
+        def run():
+            job = storage.get_job(job_id)
+            job.payload["mesh"] = {"worker_id": "w1", "cost": 1}
+            storage.update_job(job)
+            job.status = "working"
+            storage.update_job(job)
+        return run
+
+    def partial(job_id):
+        def run():
+            job = storage.get_job(job_id)
+            job.payload["mesh"] = {"worker_id": "w1", "cost": 1}
+            storage.update_job_fields(job.id, payload=job.payload)
+            storage.update_job_fields(job.id, expected_status="pending", status="working")
+        return run
+
+    _big_job("before")
+    _big_job("after")
+    before = _bytes_written(full_rewrite("before"))
+    after = _bytes_written(partial("after"))
+    print(f"\nbytes written per dispatch: before={before} after={after} ({before / after:.2f}x)")
+    assert after < before
+    assert storage.get_job("after").payload["mesh"]["worker_id"] == "w1"
@@ -0,0 +1,120 @@
+"""
+job_stats counters: triggers keep per-status counts, created/completed totals
+and the last completion time in step with every write to jobs, the migration
+backfills an existing table, and reads stay O(1) as the table grows.
+"""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database, models, storage
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    return tmp_path
+
+
+def _job(job_id, status="pending"):
+    return storage.create_job(models.Job(
+        id=job_id,
+        task_id="task-1",
+        payload={"kind": "noop"},
+        status=status,
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    ))
+
+
+def _scan(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def test_counters_follow_status_changes(fresh_db):
+    for i in range(6):
+        _job(f"j{i}")
+    _job("done-at-insert", status="completed")
+
+    assert storage.update_job_fields("j0", expected_status="pending", status="working")
+    assert storage.update_job_fields("j1", status="running")
+    assert storage.update_job_fields("j2", status="completed")
+    assert storage.update_job_fields("j2", status="completed")  # no transition, no double count
+    assert storage.update_job_fields("j3", status="failed")
+    with database.get_db() as conn:
+        conn.execute("DELETE FROM jobs WHERE id = 'j5'")
+        conn.commit()
+
+    stats = storage.get_job_stats()
+    assert stats["by_status"] == _scan(fresh_db / "sheratan.db")
+    assert stats["by_status"] == {"pending": 1, "working": 1, "running": 1, "completed": 2, "failed": 1}
+    assert (stats["pending"], stats["inflight"], stats["total"]) == (1, 2, 6)
+    assert stats["created_total"] == 7 and stats["completed_total"] == 2
+    assert stats["last_completed_utc"]
+    assert storage.count_pending_jobs() == 1 and storage.count_inflight_jobs() == 2
+
+    # Leases go through a bulk UPDATE ... RETURNING
+    leased = storage.lease_jobs("worker-1", 10, lease_sec=60)
+    assert storage.get_job_stats()["by_status"] == _scan(fresh_db / "sheratan.db")
+    assert storage.count_inflight_jobs() == 2 + len(leased)
+
+
+def test_migration_backfills_existing_jobs(fresh_db):
+    for i in range(4):
+        _job(f"p{i}")
+    _job("c0", status="completed")
+    with database.get_db() as conn:
+        conn.execute("DROP TABLE job_stats")
+        conn.execute("DELETE FROM schema_migrations WHERE version = 'job_stats_v1'")
+        conn.commit()
+    database.close_all_connections()
+
+    database.init_db()
+    stats = storage.get_job_stats()
+    assert stats["by_status"] == {"pending": 4, "completed": 1}
+    assert stats["created_total"] == 5 and stats["completed_total"] == 1
+    assert stats["last_completed_utc"] == "2026-01-01T00:00:00Z"
+
+    # Re-running the migration does not double count
+    database.init_db()
+    assert storage.get_job_stats()["by_status"] == {"pending": 4, "completed": 1}
+
+
+def test_stats_read_cost_vs_scan(fresh_db):
+    n = 30_000
+    with database.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, task_id, status, created_at, updated_at) VALUES (?, 't', ?, 'x', 'x')",
+            [(f"b{i}", ("pending", "completed", "working")[i % 3]) for i in range(n)],
+        )
+        conn.commit()
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        stats = storage.get_job_stats()
+    stats_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    jobs = storage.list_jobs()
+    completed = len([j for j in jobs if j.status == "completed"])
+    scan_us = (time.perf_counter() - start) * 1e6
+
+    print(f"\n[bench] {n} jobs: get_job_stats {stats_us:.0f} us, list_jobs scan {scan_us / 1000:.0f} ms")
+    assert stats["completed_total"] == completed == n // 3
+    assert stats["total"] == len(jobs)
+    assert stats_us * 20 < scan_us
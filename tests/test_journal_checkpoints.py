@@ -0,0 +1,150 @@
+"""
+Journal checkpoint sidecar: verify_chain, replay and the job-id index resume
+from the latest trusted checkpoint with results identical to a full pass,
+tampered or unsigned records are not trusted, and full verification checks
+every segment (optionally in parallel). Also reports verify time with and
+without checkpoints.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import ledger_journal
+from core.ledger_journal import (
+    JournalWriter,
+    checkpoint_path,
+    journal_job_ids,
+    load_checkpoints,
+    read_events,
+    replay,
+    verify_chain,
+    write_checkpoints,
+)
+from mesh.registry.ledger_service import LedgerConfig, LedgerService
+
+
+def _build_journal(tmp_path, n):
+    journal = str(tmp_path / "ledger_events.jsonl")
+    writer = JournalWriter(journal)
+    for i in range(n):
+        if i % 3 == 0:
+            writer.submit({"type": "credit", "account": f"user{i % 7}", "amount": "10"})
+        else:
+            writer.submit({"type": "charge", "account": f"user{i % 7}", "to_account": f"worker{i % 5}",
+                           "amount": "0.37", "job_id": f"job-{i}"})
+    writer.close()
+    return journal
+
+
+def _tamper(journal, line_no, **fields):
+    lines = Path(journal).read_text(encoding="utf-8").splitlines()
+    data = json.loads(lines[line_no - 1])
+    data.update(fields)
+    lines[line_no - 1] = json.dumps(data, separators=(",", ":"))
+    Path(journal).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_resume_matches_full_pass(tmp_path):
+    journal = _build_journal(tmp_path, 250)
+    assert write_checkpoints(journal, every=50) == 5
+    assert write_checkpoints(journal, every=50) == 0
+    checkpoints = load_checkpoints(journal)
+    assert [cp["events"] for cp in checkpoints] == [50, 100, 150, 200, 250]
+
+    _build_more = JournalWriter(journal)
+    for i in range(30):
+        _build_more.submit({"type": "debit", "account": "user1", "amount": "0.5", "job_id": f"late-{i}"})
+    _build_more.close()
+
+    ok, details = verify_chain(journal)
+    assert ok and details["events"] == 280 and details["resumed_from"] == checkpoints[-1]["offset"]
+    assert verify_chain(journal, resume=False) == (True, {"status": "ok", "events": 280, "last_hash": details["last_hash"]})
+
+    assert replay(journal) == replay(journal, resume=False)
+    ids, events = journal_job_ids(journal)
+    assert events == 280
+    assert ids == {str(ev.raw["job_id"]) for ev in read_events(journal) if ev.raw.get("job_id")}
+
+
+def test_full_verify_checks_every_segment(tmp_path):
+    journal = _build_journal(tmp_path, 200)
+    write_checkpoints(journal, every=40)
+    _tamper(journal, 57, amount="9.37")  # same length: offsets and checkpoints stay valid
+
+    assert verify_chain(journal)[0]  # resumes after the tampered segment
+    for workers in (1, 2):
+        ok, details = verify_chain(journal, full=True, workers=workers)
+        assert not ok and details["reason"] == "hash_mismatch" and details["at_line"] == 57
+
+
+def test_untrusted_records_are_dropped(tmp_path, monkeypatch):
+    journal = _build_journal(tmp_path, 120)
+    write_checkpoints(journal, every=30)
+    sidecar = Path(checkpoint_path(journal))
+    records = sidecar.read_text(encoding="utf-8").splitlines()
+    forged = json.loads(records[2])
+    forged["balances"]["user1"] += 1000
+    records[2] = json.dumps(forged)
+    sidecar.write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    assert [cp["events"] for cp in load_checkpoints(journal)] == [30, 60]
+    assert replay(journal) == replay(journal, resume=False)
+    assert write_checkpoints(journal, every=30) == 2
+    assert len(sidecar.read_text(encoding="utf-8").splitlines()) == 4
+
+    # Signed records need the key
+    monkeypatch.setattr(ledger_journal, "CHECKPOINT_KEY", "secret")
+    assert load_checkpoints(journal) == []
+    sidecar.unlink()
+    write_checkpoints(journal, every=30)
+    assert len(load_checkpoints(journal)) == 4
+    monkeypatch.setattr(ledger_journal, "CHECKPOINT_KEY", "")
+    assert load_checkpoints(journal) == []
+
+
+def test_ledger_service_writes_checkpoints(tmp_path):
+    config = LedgerConfig(
+        ledger_path=tmp_path / "ledger.json",
+        journal_path=tmp_path / "ledger_events.jsonl",
+        index_path=tmp_path / "job_index.json",
+        domain_lock_path=tmp_path / "ledger_domain.lock",
+        snapshot_interval=10,
+        checkpoint_interval=20,
+    )
+    service = LedgerService(config)
+    service.credit("user1", 100)
+    for i in range(30):
+        service.charge_and_settle("user1", "worker1", 1.0, f"job-{i}")
+
+    journal = str(config.journal_path)
+    assert load_checkpoints(journal)
+    assert verify_chain(journal)[1]["events"] == verify_chain(journal, resume=False)[1]["events"] == 62
+    assert replay(journal)["balances"]["user1"] == service.list_accounts()["user1"]
+
+
+def test_verify_cost_with_checkpoints(tmp_path):
+    journal = _build_journal(tmp_path, 20_000)
+    write_checkpoints(journal, every=2_000)
+
+    start = time.perf_counter()
+    assert verify_chain(journal, resume=False)[0]
+    full_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    assert verify_chain(journal, full=True, workers=4)[0]
+    parallel_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    ok, details = verify_chain(journal)
+    resume_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"\n[bench] verify 20k events: full {full_ms:.0f} ms, full x4 workers {parallel_ms:.0f} ms, "
+          f"resumed {resume_ms:.1f} ms")
+    assert ok and details["events"] == 20_000
+    assert resume_ms * 5 < full_ms
@@ -0,0 +1,147 @@
+"""
+JournalWriter group commit: events from many threads are hash-chained in
+order and written one fsync per batch, foreign appends between batches keep
+the chain valid, a failed write stops the writer, and a group-commit
+LedgerService stays replay-equivalent. Also reports settlements/sec against
+per-event append_event.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import ledger_journal
+from core.ledger_journal import JournalWriter, JournalWriterError, append_event, read_events, replay, verify_chain
+from mesh.registry.ledger_service import LedgerConfig, LedgerService
+
+
+def _run_threads(n, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_submits_are_chained_and_batched(tmp_path):
+    journal = str(tmp_path / "ledger_events.jsonl")
+    writer = JournalWriter(journal, max_latency_ms=1.0)
+
+    def producer(tid):
+        futures = [writer.submit({"type": "credit", "account": f"t{tid}", "amount": 1}) for _ in range(200)]
+        for future in futures:
+            assert future.result(timeout=30)["hash"]
+
+    _run_threads(8, producer)
+    writer.close()
+
+    ok, details = verify_chain(journal)
+    assert ok, details
+    assert details["events"] == 1600 and details["last_hash"] == writer.head_hash
+    assert writer.offset == Path(journal).stat().st_size
+    assert writer.stats["batches"] < 1600 // 4
+    assert replay(journal)["balances"] == {f"t{i}": 200.0 for i in range(8)}
+
+
+def test_foreign_appends_between_batches(tmp_path):
+    journal = str(tmp_path / "ledger_events.jsonl")
+    domain_lock = str(tmp_path / "ledger_domain.lock")
+    append_event({"type": "credit", "account": "a", "amount": "1"}, journal_path=journal, domain_lock=domain_lock)
+    writer = JournalWriter(journal, domain_lock=domain_lock)
+    writer.append({"type": "credit", "account": "a", "amount": "2"})
+    append_event({"type": "credit", "account": "a", "amount": "3"}, journal_path=journal, domain_lock=domain_lock)
+    writer.append({"type": "credit", "account": "a", "amount": "4"})
+
+    ok, details = verify_chain(journal)
+    assert ok, details
+    assert [ev.raw["amount"] for ev in read_events(journal)] == ["1", "2", "3", "4"]
+    assert writer.stats["head_reloads"] == 2
+
+    # Concurrent appenders: the shared domain lock keeps append_event out of batches
+    def appender(tid):
+        if tid == 0:
+            for _ in range(50):
+                append_event({"type": "credit", "account": "b", "amount": "1"}, journal_path=journal,
+                             domain_lock=domain_lock)
+        else:
+            for future in [writer.submit({"type": "credit", "account": "c", "amount": "1"}) for _ in range(100)]:
+                future.result(timeout=30)
+
+    _run_threads(2, appender)
+    writer.close()
+    ok, details = verify_chain(journal)
+    assert ok, details
+    assert details["events"] == 154
+
+
+def test_write_failure_stops_the_writer(tmp_path, monkeypatch):
+    journal = str(tmp_path / "ledger_events.jsonl")
+    writer = JournalWriter(journal)
+    writer.append({"type": "credit", "account": "a", "amount": "1"})
+
+    def broken_lock(path, timeout=30.0):
+        raise TimeoutError(f"Could not acquire lock on {path}")
+
+    monkeypatch.setattr(ledger_journal, "json_lock", broken_lock)
+    with pytest.raises(JournalWriterError):
+        writer.append({"type": "credit", "account": "a", "amount": "2"}, timeout=10)
+    monkeypatch.undo()
+    # Fail-stop: nothing is chained after the lost event
+    with pytest.raises(JournalWriterError):
+        writer.append({"type": "credit", "account": "a", "amount": "3"}, timeout=10)
+    assert isinstance(writer.failed, TimeoutError)
+    writer.close()
+    assert [ev.raw["amount"] for ev in read_events(journal)] == ["1"]
+
+
+def _settle_concurrently(service, threads, per_thread):
+    def settler(tid):
+        for i in range(per_thread):
+            assert service.charge_and_settle("user1", f"worker{tid % 2}", 1.0, f"job-{tid}-{i}")
+
+    start = time.perf_counter()
+    _run_threads(threads, settler)
+    return threads * per_thread / (time.perf_counter() - start)
+
+
+def _config(path, **kwargs):
+    path.mkdir()
+    return LedgerConfig(
+        ledger_path=path / "ledger.json",
+        journal_path=path / "ledger_events.jsonl",
+        index_path=path / "job_index.json",
+        domain_lock_path=path / "ledger_domain.lock",
+        **kwargs,
+    )
+
+
+def test_group_commit_ledger_service(tmp_path):
+    threads, per_thread = 8, 40
+    rates = {}
+    for mode in (False, True):
+        config = _config(tmp_path / f"group_{mode}", group_commit=mode, snapshot_interval=50)
+        service = LedgerService(config)
+        service.credit("user1", 10_000)
+        rates[mode] = _settle_concurrently(service, threads, per_thread)
+        assert service.charge_and_settle("user1", "worker0", 1.0, "job-0-0")  # idempotent
+        service.close()
+
+        ok, details = verify_chain(str(config.journal_path))
+        assert ok, details
+        balances = service.list_accounts()
+        assert balances["user1"] == 10_000 - threads * per_thread
+        replayed = replay(str(config.journal_path))["balances"]
+        for account in ("user1", "worker0", "worker1"):
+            assert replayed[account] == pytest.approx(balances[account])
+        assert LedgerService(config).list_accounts() == balances
+
+    print(f"\n[bench] {threads}x{per_thread} concurrent settlements/sec: "
+          f"per-event append {rates[False]:,.0f}, group commit {rates[True]:,.0f}")
+    assert rates[True] > rates[False]
@@ -0,0 +1,134 @@
+"""
+Lease Throughput Benchmark
+
+Claims/s of the batch lease path (storage.lease_jobs, one UPDATE ... RETURNING
+per batch) vs the single-claim path (storage.lease_next_job) at 1, 8 and 32
+concurrent workers. Timings are reported only; the assertions count write
+transactions, which do not depend on the machine.
+"""
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database, models, storage
+
+N_JOBS = 1000
+BATCH = 16
+CONCURRENCY = (1, 8, 32)
+
+
+def setup(db_path: Path):
+    database.close_all_connections()
+    database.DB_PATH = db_path
+    database.init_db()
+    ts = "2026-01-01T00:00:00Z"
+    with database.get_db() as conn:
+        for i in range(N_JOBS):
+            storage.create_job_with_conn(conn, models.Job(
+                id=f"job-{i:06d}", task_id="bench", status="pending",
+                payload={"kind": "read_file" if i % 2 else "list_files"},
+                created_at=ts, updated_at=ts,
+            ))
+
+
+def run(claim, workers: int):
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(idx: int):
+        wid = f"worker-{idx}"
+        while True:
+            jobs = claim(wid)
+            if not jobs:
+                return
+            with lock:
+                claimed.extend(j.id for j in jobs)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return claimed, elapsed
+
+
+def single_claim(wid):
+    job = storage.lease_next_job(wid, 60)
+    return [job] if job else []
+
+
+def batch_claim(wid):
+    return storage.lease_jobs(wid, BATCH, 60, kinds=["read_file", "list_files"])
+
+
+def test_lease_throughput(tmp_path, monkeypatch):
+    # Count write transactions on every pooled connection
+    statements = []
+    open_conn = database.ConnectionPool._open
+
+    def traced_open(self, path, readonly):
+        conn = open_conn(self, path, readonly)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(database.ConnectionPool, "_open", traced_open)
+
+    original_db = database.DB_PATH
+    results = {}
+    transactions = {}
+    try:
+        for workers in CONCURRENCY:
+            for label, claim in (("single", single_claim), ("batch", batch_claim)):
+                setup(tmp_path / f"{label}_{workers}.db")
+                statements.clear()
+                claimed, elapsed = run(claim, workers)
+                assert len(claimed) == N_JOBS
+                assert len(set(claimed)) == N_JOBS, "job claimed twice"
+                results[(label, workers)] = N_JOBS / elapsed
+                transactions[(label, workers)] = sum(1 for sql in statements if sql.startswith("BEGIN IMMEDIATE"))
+    finally:
+        database.close_all_connections()
+        database.DB_PATH = original_db
+
+    print(f"\n{'workers':>8} {'single/s':>12} {'batch/s':>12} {'gain':>8} {'single tx':>10} {'batch tx':>9}")
+    for workers in CONCURRENCY:
+        single = results[("single", workers)]
+        batch = results[("batch", workers)]
+        print(f"{workers:>8} {single:>12.1f} {batch:>12.1f} {batch / single:>7.1f}x "
+              f"{transactions[('single', workers)]:>10} {transactions[('batch', workers)]:>9}")
+
+    for workers in CONCURRENCY:
+        # One transaction per claim attempt; each worker ends on one empty attempt
+        assert transactions[("single", workers)] == N_JOBS + workers
+        assert transactions[("batch", workers)] <= math.ceil(N_JOBS / BATCH) + workers
+
+
+def test_lease_jobs_kind_filter(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    ts = "2026-01-01T00:00:00Z"
+    for i, kind in enumerate(["read_file", "call_llm_generic", "read_file"]):
+        storage.create_job(models.Job(
+            id=f"k{i}", task_id="t", status="pending", payload={"kind": kind},
+            created_at=f"2026-01-01T00:00:0{i}Z", updated_at=ts,
+        ))
+
+    leased = storage.lease_jobs("w1", 10, 60, kinds=["read_file"])
+    assert [j.id for j in leased] == ["k0", "k2"]
+    assert all(j.status == "working" and j.lease_owner == "w1" for j in leased)
+    assert storage.lease_jobs("w1", 10, 60, kinds=[]) == []
+    assert [j.id for j in storage.lease_jobs("w2", 10, 60)] == ["k1"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-s", "-k", "test_lease_throughput"]))
@@ -0,0 +1,221 @@
+"""
+Journal-first LedgerService: journal appends are the commit point, ledger.json
+is a periodic snapshot with the journal offset it reflects, and startup
+recovery (snapshot + tail replay) reproduces the live state exactly. Also
+reports settlements/sec and how rarely ledger.json is rewritten.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.ledger_journal import replay, verify_chain
+from mesh.registry import ledger_service
+from mesh.registry.ledger_service import LedgerConfig, LedgerService
+from mesh.registry.ledger_store import LedgerError
+
+
+def _config(tmp_path, **kwargs):
+    return LedgerConfig(
+        ledger_path=tmp_path / "ledger.json",
+        journal_path=tmp_path / "ledger_events.jsonl",
+        index_path=tmp_path / "job_index.json",
+        domain_lock_path=tmp_path / "ledger_domain.lock",
+        **kwargs,
+    )
+
+
+def _snapshot_meta(config):
+    return json.loads(config.ledger_path.read_text(encoding="utf-8"))["snapshot"]
+
+
+def test_recovery_is_snapshot_plus_tail(tmp_path):
+    config = _config(tmp_path, snapshot_interval=10, snapshot_interval_sec=3600)
+    service = LedgerService(config)
+    service.credit("user1", 1000, reason="funding")
+    service.charge("user1", "worker2", 7, job_id="direct-1", note="direct")
+    for i in range(12):
+        assert service.charge_and_settle("user1", "worker1", 3.5, f"job-{i}")
+    assert service.batch_settle([
+        {"payer_id": "user1", "worker_id": "worker1", "total_amount": 2.25, "job_id": "b-1"},
+        {"payer_id": "user1", "worker_id": "worker1", "total_amount": 2.25, "job_id": "job-0"},
+        {"payer_id": "user1", "worker_id": "worker1", "total_amount": 10**9, "job_id": "b-2"},
+    ]) == [True, True, False]
+
+    # The snapshot lags the journal: recovery has a tail to replay
+    meta = _snapshot_meta(config)
+    assert 0 < meta["journal_offset"] < config.journal_path.stat().st_size
+
+    recovered = LedgerService(config)
+    assert recovered.list_accounts() == service.list_accounts()
+    assert recovered.get_transfers() == service.get_transfers()
+    assert recovered._settled_jobs == service._settled_jobs
+
+    # Idempotency survives the restart
+    balances = recovered.list_accounts()
+    assert recovered.charge_and_settle("user1", "worker1", 3.5, "job-3")
+    assert recovered.list_accounts() == balances
+
+    ok, details = verify_chain(str(config.journal_path))
+    assert ok, details
+    replayed = replay(str(config.journal_path))["balances"]
+    assert replayed["user1"] == balances["user1"]
+    assert replayed["worker1"] == balances["worker1"]
+
+
+def test_full_replay_without_snapshot_and_on_mismatch(tmp_path):
+    config = _config(tmp_path, snapshot_interval=1000, snapshot_interval_sec=3600)
+    service = LedgerService(config)
+    service.credit("user1", 100)
+    service.charge("user1", "worker1", 10, job_id="job123")
+    expected = service.list_accounts()
+
+    config.ledger_path.unlink()
+    assert LedgerService(config).list_accounts() == expected
+
+    # A snapshot that does not match the journal is neither used nor overwritten
+    data = json.loads(config.ledger_path.read_text(encoding="utf-8"))
+    data["snapshot"]["last_hash"] = "bogus"
+    config.ledger_path.write_text(json.dumps(data), encoding="utf-8")
+    before = config.ledger_path.read_bytes()
+    with pytest.raises(LedgerError):
+        LedgerService(config)
+    assert config.ledger_path.read_bytes() == before
+
+
+def test_journal_paths_follow_ledger_path(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "registry" / "ledger.json"
+    ledger_path.parent.mkdir()
+    monkeypatch.chdir(tmp_path)
+    service = LedgerService(LedgerConfig(ledger_path=ledger_path))
+    service.credit("alice", 500)
+    service.close()
+    assert LedgerConfig(ledger_path=ledger_path).journal_path == ledger_path.parent / "ledger_events.jsonl"
+
+    # Same ledger.json opened from another working directory
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    assert LedgerService(LedgerConfig(ledger_path=ledger_path)).get_balance("alice") == 500
+
+    # A snapshot paired with a missing journal keeps its balances on disk
+    (ledger_path.parent / "ledger_events.jsonl").rename(tmp_path / "moved.jsonl")
+    with pytest.raises(LedgerError):
+        LedgerService(LedgerConfig(ledger_path=ledger_path))
+    assert json.loads(ledger_path.read_text(encoding="utf-8"))["accounts"]["alice"]["balance"] == 500
+
+
+def test_services_sharing_a_journal_catch_up(tmp_path):
+    # Two services on the same files behave like two processes
+    config = _config(tmp_path, snapshot_interval=1000, snapshot_interval_sec=3600)
+    first, second = LedgerService(config), LedgerService(config)
+    first.credit("user1", 50)
+    second.charge("user1", "worker1", 20)
+    assert first.require_balance("user1", 30) and not first.require_balance("user1", 31)
+    assert first.list_accounts()["user1"] == second.list_accounts()["user1"] == 30
+
+
+def test_legacy_ledger_json_is_not_replayed_twice(tmp_path):
+    config = _config(tmp_path)
+    legacy = LedgerService(config)
+    legacy.credit("user1", 40)
+    legacy.charge_and_settle("user1", "worker1", 10.0, "old-job")
+    legacy.snapshot()
+    expected = legacy.list_accounts()
+
+    # Strip the snapshot metadata: ledger.json as written before the journal was authoritative
+    data = json.loads(config.ledger_path.read_text(encoding="utf-8"))
+    data.pop("snapshot")
+    config.ledger_path.write_text(json.dumps(data), encoding="utf-8")
+
+    migrated = LedgerService(config)
+    assert migrated.list_accounts() == expected
+    assert migrated.charge_and_settle("user1", "worker1", 10.0, "old-job")
+    assert migrated.list_accounts() == expected
+    assert _snapshot_meta(config)["journal_offset"] == config.journal_path.stat().st_size
+
+
+def test_upgrade_keeps_jobs_settled_before_pairing(tmp_path, monkeypatch):
+    # Before pairing: journal and index in the working directory, ledger.json elsewhere
+    monkeypatch.chdir(tmp_path)
+    ledger_path = tmp_path / "registry" / "ledger.json"
+    ledger_path.parent.mkdir()
+    old = LedgerService(LedgerConfig(
+        ledger_path=ledger_path,
+        journal_path=Path("ledger_events.jsonl"),
+        index_path=Path("ledger_job_index.json"),
+        domain_lock_path=Path("ledger_domain.lock"),
+    ))
+    old.credit("payer", 100)
+    assert old.charge_and_settle("payer", "worker1", 10.0, "job-X")
+    old.snapshot()
+    old.close()
+    data = json.loads(ledger_path.read_text(encoding="utf-8"))
+    data.pop("snapshot")
+    ledger_path.write_text(json.dumps(data), encoding="utf-8")
+
+    upgraded = LedgerService(LedgerConfig(ledger_path=ledger_path))
+    assert upgraded.config.journal_path == Path("ledger_events.jsonl")
+    assert upgraded.charge_and_settle("payer", "worker1", 10.0, "job-X")
+    assert upgraded.get_balance("payer") == 90
+    upgraded.close()
+    ok, details = verify_chain("ledger_events.jsonl")
+    assert ok, details
+
+    # Legacy ledger.json whose journal is gone: the migrated history still
+    # marks its jobs as settled
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    data["transfers"] = [{
+        "id": "tx-1", "timestamp": "2026-01-01T00:00:00.000000Z", "from_account": "payer",
+        "to_account": "system:operator", "amount": 10, "job_id": "job-Y", "note": None,
+    }]
+    (other / "ledger.json").write_text(json.dumps(data), encoding="utf-8")
+    migrated = LedgerService(LedgerConfig(ledger_path=other / "ledger.json"))
+    assert migrated.charge_and_settle("payer", "worker1", 10.0, "job-Y")
+    assert migrated.get_balance("payer") == 90
+
+
+def test_failed_charge_creates_no_accounts(tmp_path):
+    config = _config(tmp_path)
+    service = LedgerService(config)
+    with pytest.raises(LedgerError):
+        service.charge("alice", "bob", 5)
+    assert "alice" not in service.list_accounts() and "bob" not in service.list_accounts()
+    assert service.create_account_if_missing("alice", 100)
+    assert service.get_balance("alice") == 100
+
+    # Missing receiver is created from the committed event
+    service.charge("alice", "bob", 5)
+    service.snapshot()
+    assert LedgerService(config).list_accounts() == service.list_accounts()
+    assert service.get_balance("bob") == 5
+
+
+def test_settlement_throughput_and_snapshot_count(tmp_path, monkeypatch):
+    writes = []
+    save_state = ledger_service.save_state
+    monkeypatch.setattr(ledger_service, "save_state", lambda state, path: (writes.append(path), save_state(state, path)))
+
+    config = _config(tmp_path, snapshot_interval=100, snapshot_interval_sec=3600)
+    service = LedgerService(config)
+    service.credit("user1", 10**6)
+    writes.clear()
+
+    n = 200
+    start = time.perf_counter()
+    for i in range(n):
+        service.charge_and_settle("user1", "worker1", 1.0, f"job-{i}")
+    rate = n / (time.perf_counter() - start)
+
+    print(f"\n[bench] {n} settlements: {rate:,.0f}/sec, {len(writes)} ledger.json snapshots")
+    assert len(writes) == 2 * n // config.snapshot_interval
+    assert service.list_accounts()["user1"] == 10**6 - n
@@ -0,0 +1,138 @@
+"""
+MetricsEmitter: bounded queue with drop counting, one keep-alive sender,
+batched list POSTs and per-(source, target, status) histograms.
+Also compares measured_call cost against the old thread-per-call client.
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.metrics_client import MetricsEmitter
+
+
+class _Collector(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(body)
+        self.server.connections.add(self.client_address)
+        data = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Collector)
+    server.payloads, server.connections = [], set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/metrics/module-calls"
+
+
+def _event(duration, source="api", target="lcp", status="ok", **extra):
+    return {"source": source, "target": target, "duration_ms": float(duration), "status": status, **extra}
+
+
+def test_batches_over_one_keepalive_connection():
+    server, url = _server()
+    emitter = MetricsEmitter(url=url, batch_size=100, flush_interval_ms=50, aggregate=False)
+    try:
+        for i in range(1_000):
+            assert emitter.emit(_event(i % 40))
+        assert emitter.flush(5.0)
+        stats = emitter.get_stats()
+        assert stats["sent_events"] == 1_000 and stats["dropped"] == 0
+        assert all(isinstance(p, list) for p in server.payloads)
+        assert sum(len(p) for p in server.payloads) == 1_000
+        assert len(server.payloads) <= 20
+        assert len(server.connections) == 1
+    finally:
+        emitter.close()
+        server.shutdown()
+
+
+def test_histogram_preaggregation_keeps_correlated_events():
+    emitter = MetricsEmitter(url="http://127.0.0.1:9/none", buckets_ms=[10, 100])
+    batch = [_event(5), _event(50), _event(500), _event(7, status="error"),
+             _event(1, target="ledger"), _event(3, correlation_id="c-1")]
+    records = emitter.build_payload(batch)
+    hists = {(r["target"], r["status"]): r for r in records if r.get("type") == "histogram"}
+    ok = hists[("lcp", "ok")]
+    assert ok["count"] == 3 and ok["sum_ms"] == 555.0 and ok["min_ms"] == 5.0 and ok["max_ms"] == 500.0
+    assert ok["bucket_counts"] == [1, 1, 1]
+    assert hists[("lcp", "error")]["bucket_counts"] == [1, 0, 0]
+    assert set(hists) == {("lcp", "ok"), ("lcp", "error"), ("ledger", "ok")}
+    assert [r for r in records if r.get("correlation_id")] == [batch[-1]]
+
+
+def test_full_queue_drops_and_counts_without_blocking():
+    gate = threading.Event()
+
+    class SlowSession(requests.Session):
+        def post(self, *args, **kwargs):
+            gate.wait(5)
+            raise requests.ConnectionError("backend down")
+
+    emitter = MetricsEmitter(url="http://127.0.0.1:9/none", queue_size=50, batch_size=10,
+                             flush_interval_ms=10, session=SlowSession())
+    start = time.perf_counter()
+    results = [emitter.emit(_event(i % 40)) for i in range(500)]
+    elapsed = time.perf_counter() - start
+    gate.set()
+    emitter.close()
+
+    stats = emitter.get_stats()
+    assert elapsed < 0.5
+    assert results.count(False) == stats["dropped"] >= 500 - 50 - 10
+    assert stats["failed_events"] == stats["accepted"] == results.count(True)
+    assert not emitter.emit(_event(0))
+
+
+def test_emit_cost_vs_thread_per_call():
+    server, url = _server()
+    emitter = MetricsEmitter(url=url, flush_interval_ms=20)
+    n = 2_000
+    try:
+        start = time.perf_counter()
+        for i in range(n):
+            emitter.emit(_event(i % 40))
+        emit_us = (time.perf_counter() - start) / n * 1e6
+        assert emitter.flush(10.0)
+
+        def _legacy_send(payload):
+            try:
+                requests.post(url, json=payload, timeout=0.5)
+            except Exception:
+                pass
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=_legacy_send, args=(_event(i % 40),), daemon=True) for i in range(200)]
+        for t in threads:
+            t.start()
+        legacy_start_us = (time.perf_counter() - start) / len(threads) * 1e6
+        for t in threads:
+            t.join(5)
+
+        print(f"\n[bench] emit(): {emit_us:.1f} us/call, {emitter.get_stats()['batches']} POSTs for {n} calls; "
+              f"legacy thread start: {legacy_start_us:.1f} us/call, 1 POST + 1 connection per call")
+        assert emit_us < legacy_start_us
+        assert emitter.get_stats()["sent_events"] == n
+    finally:
+        emitter.close()
+        server.shutdown()
@@ -0,0 +1,140 @@
+"""
+PerformanceBaselineTracker streaming engine: bucket rings per window give
+exact mean/stddev/min/max, sketch percentiles stay within their relative
+error, persistence round-trips the compact buckets, per-job latency samples keep
+the tail that tick averages hide, and window reads no longer scale with the
+number of samples.
+"""
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.performance_baseline import PerformanceBaselineTracker, QuantileSketch, WindowSpec
+
+NOW = 5040.0 * 357_143  # bucket-aligned for every default window (60 s, 720 s, 5040 s)
+
+
+def _exact(values):
+    values = sorted(values)
+    n = len(values)
+    mean = sum(values) / n
+    return {
+        "count": n,
+        "mean": mean,
+        "stddev": math.sqrt(sum((x - mean) ** 2 for x in values) / n),
+        "min": values[0],
+        "max": values[-1],
+        "p50": values[int(0.50 * (n - 1))],
+        "p95": values[int(0.95 * (n - 1))],
+    }
+
+
+def _feed(tracker, rng, n, span, metric="avg_job_latency_ms"):
+    samples = []
+    for _ in range(n):
+        ts = NOW - rng.uniform(0, span)
+        value = rng.lognormvariate(6, 0.8)
+        tracker.update(metric, value, ts=ts)
+        samples.append((ts, value))
+    return samples
+
+
+def test_window_stats_match_exact_computation(tmp_path):
+    rng = random.Random(7)
+    tracker = PerformanceBaselineTracker(runtime_dir=tmp_path)
+    samples = _feed(tracker, rng, 5_000, 8 * 24 * 3600)
+    tracker.recompute(now=NOW)
+    baselines = tracker.get_all_baselines(recompute=False)["baselines"]["avg_job_latency_ms"]
+
+    for key, seconds in (("1h", 3600), ("24h", 86400), ("7d", 7 * 86400)):
+        expected = _exact([v for t, v in samples if t >= NOW - seconds])
+        got = baselines[key]
+        assert got["count"] == expected["count"]
+        for field in ("mean", "stddev", "min", "max"):
+            assert math.isclose(got[field], expected[field], rel_tol=1e-9), (key, field)
+        for field in ("p50", "p95"):
+            assert abs(got[field] - expected[field]) <= 0.01 * expected[field] + 1e-9, (key, field)
+
+    assert tracker.get_percentiles("avg_job_latency_ms", "24h", now=NOW) == (
+        baselines["24h"]["p50"], baselines["24h"]["p95"])
+    assert tracker.get_percentiles("avg_job_latency_ms", "1h", min_count=10**6, now=NOW) is None
+    assert baselines["1h"]["count"] < baselines["24h"]["count"] < baselines["7d"]["count"] < 5_000
+
+
+def test_job_latency_percentiles_come_from_per_job_samples(tmp_path):
+    rng = random.Random(11)
+    tracker = PerformanceBaselineTracker(runtime_dir=tmp_path)
+    assert "job_latency_ms" in tracker.get_all_baselines()["metrics"]
+
+    samples = _feed(tracker, rng, 2_000, 3600, metric="job_latency_ms")
+    values = [v for _, v in samples]
+    for i in range(0, len(values), 20):
+        # What the diagnostics tick records: one average per tick
+        tracker.update("avg_job_latency_ms", sum(values[i:i + 20]) / 20, ts=NOW - 1)
+
+    p50, p95 = tracker.get_percentiles("job_latency_ms", "24h", min_count=20, now=NOW)
+    exact = _exact(values)
+    assert abs(p95 - exact["p95"]) <= 0.01 * exact["p95"]
+    # Averages hide the tail the score is normalised against
+    assert tracker.get_percentiles("avg_job_latency_ms", "24h", min_count=20, now=NOW)[1] < 0.7 * p95
+
+
+def test_sketch_merge_zero_and_negative_values():
+    rng = random.Random(3)
+    values = [rng.uniform(-50, 50) for _ in range(2_000)] + [0.0] * 300
+    halves = QuantileSketch(), QuantileSketch()
+    for i, v in enumerate(values):
+        halves[i % 2].add(v)
+    halves[0].merge(halves[1])
+    ordered = sorted(values)
+    for q in (0.0, 0.05, 0.5, 0.95, 1.0):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(halves[0].quantile(q) - exact) <= 0.01 * abs(exact) + 1e-9
+
+
+def test_old_buckets_expire_and_rings_persist(tmp_path):
+    tracker = PerformanceBaselineTracker(runtime_dir=tmp_path, windows=[WindowSpec("1h", 3600)], metrics=["m"])
+    tracker.update("m", 100.0, ts=NOW - 7200)
+    tracker.update("m", 1.0, ts=NOW - 60)
+    tracker.update("m", 3.0, ts=NOW - 30)
+    # Wraps onto the slot of the NOW-7200 bucket; a late sample for that old bucket is ignored
+    tracker.update("m", 5.0, ts=NOW - 3600)
+    tracker.update("m", 999.0, ts=NOW - 7200)
+    assert tracker.get_window_stats("m", "1h", now=NOW)["count"] == 3
+
+    tracker.recompute(now=NOW)
+    tracker.persist(recompute=False)
+    stored = json.loads((tmp_path / "performance_baselines.json").read_text())
+    assert stored["baselines"]["m"]["1h"]["mean"] == 3.0
+    assert "samples" not in json.dumps(stored)
+
+    reloaded = PerformanceBaselineTracker(runtime_dir=tmp_path, windows=[WindowSpec("1h", 3600)], metrics=["m"])
+    assert reloaded.get_window_stats("m", "1h", now=NOW) == tracker.get_window_stats("m", "1h", now=NOW)
+    # Three hours later the window has slid past everything
+    assert reloaded.get_window_stats("m", "1h", now=NOW + 3 * 3600)["count"] == 0
+
+
+def test_update_and_read_cost_independent_of_sample_count(tmp_path):
+    tracker = PerformanceBaselineTracker(runtime_dir=tmp_path)
+    rng = random.Random(1)
+    n = 100_000
+    start = time.perf_counter()
+    for i in range(n):
+        tracker.update("avg_job_latency_ms", rng.uniform(10, 5_000), ts=NOW - (n - i) * 5)
+    update_us = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    for _ in range(20):
+        tracker.recompute(now=NOW)
+    read_ms = (time.perf_counter() - start) / 20 * 1e3
+    print(f"\n[bench] update: {update_us:.1f} us/sample; recompute over {n} samples: {read_ms:.1f} ms")
+    assert tracker.get_window_stats("avg_job_latency_ms", "7d", now=NOW)["count"] == n
+    assert read_ms < 250
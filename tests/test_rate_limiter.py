@@ -0,0 +1,159 @@
+"""
+RateLimiter token buckets: atomic batch try_acquire, concurrency gate on the
+job_stats inflight counter, no lost tokens under thread contention, and
+periodic persistence to rate_limit_config. Also reports decisions/sec
+against the old per-decision SQLite read-modify-write.
+"""
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database, storage
+from core.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    return tmp_path
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_batch_acquire_refill_and_concurrency(fresh_db):
+    clock, inflight = FakeClock(), {"n": 0}
+    limiter = RateLimiter(persist_interval_sec=3600, concurrency_fn=lambda s: inflight["n"], clock=clock)
+    limiter.configure("src", max_jobs_per_minute=60, max_concurrent_jobs=100)
+
+    assert limiter.try_acquire("src", 50) == 50
+    assert limiter.try_acquire("src", 20) == 0            # all-or-nothing by default
+    assert limiter.try_acquire("src", 20, partial=True) == 10
+    assert not limiter.check_limit("src")
+
+    clock.now += 5                                         # 1 token/sec
+    assert limiter.try_acquire("src", 10, partial=True) == 5
+    limiter.release("src", 3)
+    assert limiter.try_acquire("src", 3) == 3
+
+    clock.now += 3600                                      # refill caps at capacity
+    inflight["n"] = 95
+    assert limiter.try_acquire("src", 10, partial=True) == 5
+    inflight["n"] = 100
+    assert limiter.try_acquire("src", 1) == 0
+    stats = limiter.get_stats()
+    assert stats["blocked_concurrency"] == 2 and stats["blocked_rate"] == 4
+
+
+def test_no_lost_tokens_under_contention(fresh_db):
+    limiter = RateLimiter(persist_interval_sec=3600, concurrency_fn=lambda s: 0, clock=FakeClock())
+    limiter.configure("src", max_jobs_per_minute=1_000, max_concurrent_jobs=10**6)
+    granted = []
+
+    def worker():
+        mine = 0
+        for _ in range(200):
+            mine += limiter.try_acquire("src", 3, partial=True)
+        granted.append(mine)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(granted) == 1_000
+
+
+def test_state_persisted_periodically_and_restored(fresh_db):
+    clock = FakeClock()
+    limiter = RateLimiter(persist_interval_sec=5, concurrency_fn=lambda s: 0, clock=clock)
+    limiter.configure("src", max_jobs_per_minute=30, max_concurrent_jobs=40)
+    assert limiter.try_acquire("src", 10) == 10
+    assert storage.get_rate_limit_config("src") is None   # nothing written yet
+
+    clock.now += 6
+    limiter.try_acquire("src", 1)
+    row = storage.get_rate_limit_config("src")
+    assert (row["max_jobs_per_minute"], row["max_concurrent_jobs"]) == (30, 40)
+    assert row["tokens"] == pytest.approx(30 - 10 + 3 - 1)
+    assert limiter.get_stats()["persists"] == 1
+
+    limiter.try_acquire("src", 5)
+    limiter.flush()
+    restored = RateLimiter(persist_interval_sec=5, concurrency_fn=lambda s: 0, clock=clock)
+    assert restored.try_acquire("src", 17) == 17 and restored.try_acquire("src", 1) == 0
+
+
+def test_default_concurrency_reads_inflight_counter(fresh_db):
+    with database.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, task_id, status, created_at, updated_at) VALUES (?, 't', 'working', 'x', 'x')",
+            [(f"w{i}",) for i in range(3)],
+        )
+        conn.commit()
+    limiter = RateLimiter(persist_interval_sec=3600)
+    limiter.configure("src", max_concurrent_jobs=5)
+    assert limiter.try_acquire("src", 3, partial=True) == 2
+    assert limiter.get_stats()["blocked_concurrency"] == 1
+
+
+def _legacy_check_limit(source):
+    # Previous implementation: SELECT + INSERT OR REPLACE + COUNT(*) per decision
+    config = storage.get_rate_limit_config(source)
+    now = datetime.utcnow()
+    if (now - datetime.fromisoformat(config["window_start"])).total_seconds() >= 60:
+        config["current_count"] = 0
+        config["window_start"] = now.isoformat()
+    if config["current_count"] >= config["max_jobs_per_minute"]:
+        return False
+    with database.get_db(readonly=True) as conn:
+        concurrent = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('working', 'running')").fetchone()[0]
+    if concurrent >= config["max_concurrent_jobs"]:
+        return False
+    config["current_count"] += 1
+    storage.update_rate_limit_config(config["source"], config["max_jobs_per_minute"], config["max_concurrent_jobs"],
+                                     config["current_count"], config["window_start"])
+    return True
+
+
+def test_decisions_per_second(fresh_db):
+    storage.update_rate_limit_config("bench", 10**9, 10**9, 0, datetime.utcnow().isoformat())
+    n = 600
+
+    start = time.perf_counter()
+    for _ in range(n):
+        assert _legacy_check_limit("bench")
+    legacy_rate = n / (time.perf_counter() - start)
+
+    limiter = RateLimiter()
+    limiter.configure("bench", max_jobs_per_minute=10**9, max_concurrent_jobs=10**9)
+    start = time.perf_counter()
+    for _ in range(n * 10):
+        assert limiter.check_limit("bench")
+    single_rate = n * 10 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(n * 10):
+        assert limiter.try_acquire("bench", 60) == 60
+    batch_rate = n * 10 * 60 / (time.perf_counter() - start)
+    limiter.flush()
+
+    print(f"\n[bench] rate-limit decisions/sec: legacy {legacy_rate:,.0f}, try_acquire(1) {single_rate:,.0f}, "
+          f"try_acquire(60) {batch_rate:,.0f} jobs/sec")
+    assert single_rate > legacy_rate
+    assert batch_rate > 10 * legacy_rate
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core import database, models, storage
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "sheratan.db")
+    database.init_db()
+    return tmp_path
+
+
+def _job(job_id, created_at, **kw):
+    return storage.create_job(models.Job(
+        id=job_id,
+        task_id="task-1",
+        payload={"kind": "noop"},
+        status=kw.pop("status", "pending"),
+        created_at=created_at,
+        updated_at=created_at,
+        **kw,
+    ))
+
+
+def test_ready_queue_order_and_dependencies(fresh_db):
+    _job("base", "2026-01-01T00:00:01Z")
+    _job("crit", "2026-01-01T00:00:05Z", priority="critical")
+    _job("child", "2026-01-01T00:00:02Z", depends_on=["base"])
+    _job("later", "2026-01-01T00:00:03Z", next_retry_utc="2999-01-01T00:00:00Z")
+    _job("done", "2026-01-01T00:00:00Z", status="completed")
+    _job("high", "2026-01-01T00:00:06Z", priority="high", depends_on=["done"])
+    _job("orphan", "2026-01-01T00:00:04Z", depends_on=["missing"])
+
+    ready = [j.id for j in storage.list_ready_jobs()]
+    assert ready == ["crit", "high", "base"]
+
+    base = storage.get_job("base")
+    base.status = "completed"
+    storage.update_job(base)
+
+    ready = [j.id for j in storage.list_ready_jobs()]
+    assert ready == ["crit", "high", "child"]
+    assert [j.id for j in storage.list_ready_jobs(limit=1)] == ["crit"]
+
+
+def test_list_jobs_by_status(fresh_db):
+    _job("p1", "2026-01-01T00:00:01Z")
+    _job("w1", "2026-01-01T00:00:02Z", status="working")
+    _job("r1", "2026-01-01T00:00:03Z", status="running")
+
+    assert [j.id for j in storage.list_jobs_by_status(["working", "running"])] == ["w1", "r1"]
+    assert storage.list_jobs_by_status([]) == []
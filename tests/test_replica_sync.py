@@ -0,0 +1,173 @@
+"""
+Journal replication: the writer API serves bounded, line-aligned (and
+gzip-compressed) segments, the replica mirrors the writer's journal and
+applies each segment with one snapshot, rejects segments that break the
+hash chain, and reports its lag. Also reports catch-up events/sec with
+one-event segments (one snapshot per event, as before) and 1 MiB segments.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.ledger_journal import JournalWriter, replay
+from mesh.registry import journal_sync_api, ledger_service
+from mesh.registry.ledger_service import LedgerConfig, LedgerService
+from mesh.registry.replica_sync import ReplicaSyncService
+
+
+@pytest.fixture
+def writer_journal(tmp_path, monkeypatch):
+    journal = tmp_path / "writer" / "ledger_events.jsonl"
+    journal.parent.mkdir()
+    monkeypatch.setattr(journal_sync_api, "JOURNAL_PATH", journal)
+    monkeypatch.setattr(journal_sync_api, "_counted", {"offset": 0, "events": 0})
+    return journal
+
+
+def _write_events(journal, n, start=0):
+    writer = JournalWriter(str(journal))
+    for i in range(start, start + n):
+        if i % 4 == 0:
+            writer.submit({"type": "credit", "account": f"user{i % 3}", "amount": "10"})
+        else:
+            writer.submit({"type": "charge", "account": f"user{i % 3}", "to_account": f"worker{i % 2}",
+                           "amount": "1.25", "job_id": f"job-{i}"})
+    writer.close()
+
+
+def _replica(tmp_path, max_bytes):
+    path = tmp_path / f"replica_{max_bytes}"
+    path.mkdir()
+    config = LedgerConfig(
+        ledger_path=path / "ledger.json",
+        journal_path=path / "ledger_events.jsonl",
+        index_path=path / "job_index.json",
+        domain_lock_path=path / "ledger_domain.lock",
+        mode="replica",
+    )
+    ledger = LedgerService(config)
+    sync = ReplicaSyncService("", path / "replica_state.json", ledger, max_bytes=max_bytes,
+                              session=TestClient(journal_sync_api.app))
+    return config, ledger, sync
+
+
+def test_segments_are_bounded_and_line_aligned(writer_journal):
+    _write_events(writer_journal, 50)
+    size = writer_journal.stat().st_size
+    client = TestClient(journal_sync_api.app)
+
+    offset, events = 0, 0
+    while offset < size:
+        resp = client.get("/journal", params={"offset": offset, "max_bytes": 2000})
+        assert 0 < len(resp.content) <= 2000 and resp.content.endswith(b"\n")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert int(resp.headers["X-Journal-Next-Offset"]) == offset + len(resp.content)
+        assert resp.headers["X-Journal-Size"] == str(size) and resp.headers["X-Journal-Events"] == "50"
+        offset += len(resp.content)
+        events += resp.content.count(b"\n")
+    assert events == 50
+
+    # A line longer than max_bytes is served whole
+    resp = client.get("/journal", params={"offset": 0, "max_bytes": 10})
+    assert resp.content.count(b"\n") == 1
+    assert client.get("/health").json()["total_events"] == 50
+
+
+def test_replica_catches_up_in_chunks(tmp_path, writer_journal, monkeypatch):
+    _write_events(writer_journal, 200)
+    config, ledger, sync = _replica(tmp_path, max_bytes=8192)
+    writes = []
+    save_state = ledger_service.save_state
+    monkeypatch.setattr(ledger_service, "save_state", lambda state, path: (writes.append(path), save_state(state, path)))
+    segments = []
+    fetch = sync._fetch
+    monkeypatch.setattr(sync, "_fetch", lambda offset, **kw: segments.append(offset) or fetch(offset, **kw))
+
+    assert sync.sync_once(max_chunks=2)
+    lag = sync.lag()
+    assert lag["bytes_behind"] > 0 and 0 < lag["events_behind"] < 200
+
+    assert sync.sync_once()
+    assert sync.lag()["bytes_behind"] == sync.lag()["events_behind"] == 0
+    assert len(writes) == len(segments) > writer_journal.stat().st_size // 8192  # one snapshot per chunk
+    assert config.journal_path.read_bytes() == writer_journal.read_bytes()
+    balances = replay(str(writer_journal))["balances"]
+    for account, balance in balances.items():
+        assert ledger.get_balance(account) == pytest.approx(balance)
+
+    # New writer events and a restarted replica
+    _write_events(writer_journal, 20, start=200)
+    restarted = ReplicaSyncService("", sync.state_path, LedgerService(config), max_bytes=8192,
+                                   session=TestClient(journal_sync_api.app))
+    assert restarted.sync_once()
+    assert restarted.state.total_events_synced == 220
+    assert config.journal_path.read_bytes() == writer_journal.read_bytes()
+
+
+def test_replica_rejects_broken_chain(tmp_path, writer_journal):
+    _write_events(writer_journal, 40)
+    config, ledger, sync = _replica(tmp_path, max_bytes=1024)
+    assert sync.sync_once(max_chunks=1)
+    synced = config.journal_path.read_bytes()
+
+    # Same-length tamper after the synced prefix
+    data = writer_journal.read_bytes()
+    at = data.index(b'"1.25"', len(synced))
+    writer_journal.write_bytes(data[:at] + b'"9.25"' + data[at + 6:])
+
+    assert not sync.sync_once()
+    assert config.journal_path.read_bytes() == synced
+    assert sync.lag()["bytes_behind"] > 0
+
+
+def test_upgraded_replica_is_rebuilt_from_the_writer(tmp_path, writer_journal):
+    writer = JournalWriter(str(writer_journal))
+    writer.append({"type": "credit", "account": "alice", "amount": "100"})
+    writer.close()
+
+    # Legacy replica: ledger.json without a journal position, no local journal
+    config, _, _ = _replica(tmp_path, max_bytes=1024)
+    config.ledger_path.write_text(json.dumps({"accounts": {"alice": {"balance": 100}}}), encoding="utf-8")
+    legacy = LedgerService(config)
+    assert legacy.list_accounts().get("alice") is None
+    assert list(config.ledger_path.parent.glob("ledger.json.replaced-*"))
+    sync = ReplicaSyncService("", tmp_path / "legacy_state.json", legacy, session=TestClient(journal_sync_api.app))
+    assert sync.sync_once()
+    assert legacy.get_balance("alice") == 100
+
+    # Local journal holding the replica's own events: not a prefix of the writer's
+    own = tmp_path / "own"
+    own.mkdir()
+    own_config = LedgerConfig(ledger_path=own / "ledger.json")
+    LedgerService(own_config).credit("alice", 5)
+    replica = LedgerService(LedgerConfig(ledger_path=own / "ledger.json", mode="replica"))
+    sync = ReplicaSyncService("", own / "replica_state.json", replica, session=TestClient(journal_sync_api.app))
+    assert sync.sync_once()
+    assert replica.get_balance("alice") == 100
+    assert own_config.journal_path.read_bytes() == writer_journal.read_bytes()
+    assert list(own.glob("ledger_events.jsonl.replaced-*"))
+
+
+def test_catch_up_rate(tmp_path, writer_journal):
+    n = 600
+    _write_events(writer_journal, n)
+    rates = {}
+    for max_bytes in (1, 1024 * 1024):
+        _, ledger, sync = _replica(tmp_path, max_bytes=max_bytes)
+        start = time.perf_counter()
+        assert sync.sync_once()
+        rates[max_bytes] = n / (time.perf_counter() - start)
+        assert sync.state.total_events_synced == n
+
+    print(f"\n[bench] replica catch-up of {n} events: one-event segments {rates[1]:,.0f}/sec, "
+          f"1 MiB segments {rates[1024 * 1024]:,.0f}/sec")
+    assert rates[1024 * 1024] > 3 * rates[1]
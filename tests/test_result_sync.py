@@ -0,0 +1,103 @@
+"""
+Result sync notifications: queue de-duplication and watcher feeding for both
+transports (directory listing / SQLite data_version wait), and events for
+jobs not yet marked 'working' are retried for a bounded number of ticks.
+"""
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.job_transport import FileDropTransport, SQLiteQueueTransport
+from core.result_sync import ResultSyncQueue, ResultWatcher
+
+
+def test_queue_dedupes_and_drains_fifo():
+    q = ResultSyncQueue(maxsize=3)
+    assert q.notify("a", source="sync_endpoint")
+    assert q.notify("b", source="watcher")
+    assert not q.notify("a", source="watcher")  # already queued
+    assert q.notify("c")
+    assert not q.notify("d")  # full -> left to the reconciliation sweep
+
+    assert q.drain(max_items=2) == ["a", "b"]
+    assert q.drain() == ["c"]
+    snap = q.snapshot()
+    assert snap["deduped"] == 1 and snap["dropped"] == 1 and snap["depth"] == 0
+    assert snap["by_source"]["watcher"] == 2
+
+
+def test_listing_watcher_queues_only_new_results(tmp_path):
+    transport = FileDropTransport(tmp_path / "out", tmp_path / "in")
+    q = ResultSyncQueue()
+    watcher = ResultWatcher(transport, q)
+
+    transport.send_result("job-1", {"ok": True})
+    assert watcher.scan_once() == 1
+    assert q.drain() == ["job-1"]
+
+    # Still on disk (not acked) -> not re-queued on the next listing
+    transport.send_result("job-2", {"ok": True})
+    assert watcher.scan_once() == 1
+    assert q.drain() == ["job-2"]
+
+
+def test_sqlite_watcher_wakes_on_result(tmp_path):
+    producer = SQLiteQueueTransport(tmp_path / "q.db")
+    q = ResultSyncQueue()
+    watcher = ResultWatcher(SQLiteQueueTransport(tmp_path / "q.db"), q, interval_sec=2.0)
+    watcher.start()
+    try:
+        assert watcher.mode == "wait"
+        time.sleep(0.05)
+        start = time.perf_counter()
+        producer.send_result("job-x", {"ok": True})
+        while not len(q) and time.perf_counter() - start < 2.0:
+            time.sleep(0.002)
+        assert q.drain() == ["job-x"]
+        # Woken by data_version, well before the 2s interval
+        assert time.perf_counter() - start < 1.0
+    finally:
+        watcher.stop()
+
+
+def test_events_for_pending_jobs_are_requeued(monkeypatch):
+    from core import main
+
+    statuses = {"job-1": "pending", "job-2": "working", "job-3": "completed"}
+    monkeypatch.setattr(main.storage, "get_job", lambda job_id: SimpleNamespace(id=job_id, status=statuses[job_id]))
+    monkeypatch.setattr(main.RobustnessConfig, "SYNC_RECONCILE_SEC", 3600)
+    synced = []
+    dispatcher = main.Dispatcher.__new__(main.Dispatcher)
+    dispatcher.sync_queue = ResultSyncQueue()
+    dispatcher._last_reconcile_ts = time.time()
+    dispatcher._requeue_attempts = {}
+    stat_keys = ("ticks", "events", "synced", "requeued", "requeue_dropped", "total_cpu_ms", "max_tick_cpu_ms")
+    dispatcher.sync_stats = dict.fromkeys(stat_keys, 0)
+    dispatcher._sync_job = lambda job: synced.append(job.id) or 1
+
+    for job_id in statuses:
+        dispatcher.sync_queue.notify(job_id, source="sync_endpoint")
+    dispatcher._sync_step()
+    assert synced == ["job-2"] and dispatcher.sync_queue.snapshot()["depth"] == 1
+
+    # Dispatch committed 'working' in the meantime
+    statuses["job-1"] = "working"
+    dispatcher._sync_step()
+    assert synced == ["job-2", "job-1"] and len(dispatcher.sync_queue) == 0
+    assert dispatcher.sync_stats["requeued"] == 1 and dispatcher.sync_stats["synced"] == 2
+    assert dispatcher._requeue_attempts == {}
+
+    # A job that stays pending is retried a bounded number of times
+    monkeypatch.setattr(main.RobustnessConfig, "SYNC_REQUEUE_MAX", 3)
+    statuses["job-4"] = "pending"
+    dispatcher.sync_queue.notify("job-4", source="sync_endpoint")
+    for _ in range(5):
+        dispatcher._sync_step()
+    assert len(dispatcher.sync_queue) == 0 and dispatcher._requeue_attempts == {}
+    assert dispatcher.sync_stats["requeued"] == 1 + 3 and dispatcher.sync_stats["requeue_dropped"] == 1
@@ -0,0 +1,168 @@
+"""
+Transfer history in TransferStore: cursor pagination by account, retention
+by age and record count, ledger.json stays constant-size as history grows,
+history kept inside a legacy ledger.json is migrated, and amounts round-trip
+exactly (integral amounts stay int). Also reports a paged account query
+against the old linear scan of the transfers list.
+"""
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from mesh.registry.ledger_service import LedgerConfig, LedgerService
+from mesh.registry.transfer_store import TransferStore
+
+
+def _record(i, src, dst, when=None):
+    when = when or datetime(2026, 1, 1) + timedelta(seconds=i)
+    return {
+        "id": f"tx-{i}",
+        "timestamp": when.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "from_account": src,
+        "to_account": dst,
+        "amount": float(i),
+        "job_id": None,
+        "note": None,
+    }
+
+
+def _config(tmp_path, **kwargs):
+    return LedgerConfig(
+        ledger_path=tmp_path / "ledger.json",
+        journal_path=tmp_path / "ledger_events.jsonl",
+        index_path=tmp_path / "job_index.json",
+        domain_lock_path=tmp_path / "ledger_domain.lock",
+        **kwargs,
+    )
+
+
+def test_cursor_pagination(tmp_path):
+    store = TransferStore(tmp_path / "transfers.db")
+    pairs = [("a", "b"), ("b", "c"), ("a", "a"), ("c", "a")]
+    records = [_record(i, *pairs[i % 4]) for i in range(40)]
+    assert store.add_many(records) == 40
+    assert store.add_many(records[:10]) == 0  # replayed ids are skipped
+
+    pages, cursor = [], None
+    while True:
+        page = store.get_transfers("a", limit=7, before=cursor)
+        if not page:
+            break
+        pages.append(page)
+        cursor = page[-1]["id"]
+    ids = [r["id"] for page in pages for r in page]
+    expected = [r["id"] for r in reversed(records) if "a" in (r["from_account"], r["to_account"])]
+    assert ids == expected and len(pages[0]) == 7
+
+    assert [r["id"] for r in store.get_transfers(limit=3)] == ["tx-39", "tx-38", "tx-37"]
+    assert store.get_transfers(before="missing") == []
+
+
+def test_retention_by_age_and_count(tmp_path):
+    now = datetime(2026, 3, 1)
+    store = TransferStore(tmp_path / "transfers.db", retention_days=7)
+    store.add_many([_record(i, "a", "b", now - timedelta(days=10 - i)) for i in range(10)])
+    assert store.compact(now) == 3  # older than 7 days
+    assert store.count() == 7
+
+    store.max_records = 2
+    assert store.compact(now) == 5
+    assert [r["id"] for r in store.get_transfers()] == ["tx-9", "tx-8"]
+
+
+def test_service_keeps_history_out_of_ledger_json(tmp_path):
+    config = _config(tmp_path, snapshot_interval=20, snapshot_interval_sec=3600)
+    service = LedgerService(config)
+    service.credit("user1", 10_000)
+
+    sizes = []
+    for round_ in range(3):
+        for i in range(100):
+            service.charge_and_settle("user1", "worker1", 1.0, f"job-{round_}-{i}")
+        service.snapshot()
+        data = json.loads(config.ledger_path.read_text(encoding="utf-8"))
+        assert "transfers" not in data
+        sizes.append(len(json.dumps(data["accounts"])))
+    assert sizes[0] == sizes[-1]
+
+    page = service.get_transfers("worker1", limit=50)
+    assert len(page) == 50 and page[0]["job_id"] == "job-2-99"
+    assert service.get_transfers("worker1", limit=50, before=page[-1]["id"])[0]["job_id"] == "job-2-49"
+
+    # Records of the replayed tail are stored once
+    service.charge_and_settle("user1", "worker1", 1.0, "tail-job")
+    expected = service.get_transfers()
+    recovered = LedgerService(config)
+    assert recovered.get_transfers() == expected
+    assert len(recovered.get_transfers("worker1")) == 301
+
+
+def test_legacy_transfers_are_migrated(tmp_path):
+    config = _config(tmp_path)
+    service = LedgerService(config)
+    service.credit("user1", 40)
+    service.snapshot()
+    service.close()
+
+    data = json.loads(config.ledger_path.read_text(encoding="utf-8"))
+    data["transfers"] = [_record(i, "user1", "worker1") for i in range(5)]
+    config.ledger_path.write_text(json.dumps(data), encoding="utf-8")
+
+    migrated = LedgerService(config)
+    assert [r["id"] for r in migrated.get_transfers("worker1")] == [f"tx-{i}" for i in range(4, -1, -1)]
+    assert "transfers" not in json.loads(config.ledger_path.read_text(encoding="utf-8"))
+
+
+def test_amounts_round_trip(tmp_path):
+    service = LedgerService(_config(tmp_path))
+    service.credit("alice", 100)
+    service.charge_and_settle("alice", "worker1", 0.1 + 0.2, "job-1")
+    amounts = [r["amount"] for r in service.get_transfers("alice")]
+    assert amounts == [0.1 + 0.2, 100] and isinstance(amounts[1], int)
+
+    # Store created with a REAL amount column
+    legacy = tmp_path / "legacy.db"
+    conn = sqlite3.connect(str(legacy))
+    conn.execute("CREATE TABLE transfers (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+                 "timestamp TEXT NOT NULL, from_account TEXT NOT NULL, to_account TEXT NOT NULL, "
+                 "amount REAL NOT NULL, job_id TEXT, note TEXT)")
+    conn.executemany("INSERT INTO transfers (id, timestamp, from_account, to_account, amount) VALUES (?, ?, ?, ?, ?)",
+                     [("tx-0", "2026-01-01T00:00:00.000000Z", "a", "b", 100), ("tx-1", "2026-01-01T00:00:01.000000Z", "a", "b", 1.25)])
+    conn.commit()
+    conn.close()
+    store = TransferStore(legacy)
+    assert [r["amount"] for r in store.get_transfers("a")] == [1.25, 100]
+    store.add_many([_record(2, "a", "b")])
+    assert [r["id"] for r in store.get_transfers("b", limit=2)] == ["tx-2", "tx-1"]
+
+
+def test_paged_query_against_linear_scan(tmp_path):
+    n = 100_000
+    records = [_record(i, f"user{i % 500}", f"worker{i % 50}") for i in range(n)]
+    store = TransferStore(tmp_path / "transfers.db")
+    store.add_many(records)
+
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # Previous implementation: filter and reverse the whole list in the state
+        page = list(reversed([t for t in records if "user7" in (t["from_account"], t["to_account"])]))[:50]
+    linear_ms = (time.perf_counter() - start) * 1e3 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        indexed = store.get_transfers("user7", limit=50)
+    indexed_ms = (time.perf_counter() - start) * 1e3 / rounds
+
+    print(f"\n[bench] 50-record page of {n:,} transfers: linear scan {linear_ms:.2f} ms, "
+          f"indexed store {indexed_ms:.2f} ms")
+    assert indexed == page
+    assert indexed_ms * 5 < linear_ms
@@ -0,0 +1,106 @@
+"""
+Job Transport Latency Benchmark
+
+p50/p99 from enqueue (Core send_job) to result-visible (Core fetch_result)
+for the file-drop transport vs the SQLite queue transport, with a worker
+thread consuming through the same transport API as worker_loop.
+"""
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.job_transport import FileDropTransport, SQLiteQueueTransport
+
+RUNTIME = Path("runtime/test_transport_latency")
+N = 40
+
+
+def _worker(transport, stop):
+    while not stop.is_set():
+        for d in transport.receive_jobs("bench-worker", max_items=8, timeout=0.5):
+            transport.send_result(d.job_id, {"ok": True, "echo": d.unified["payload"]})
+            transport.ack_job(d)
+
+
+def _wait_visible(transport, job_id, timeout=10.0):
+    if isinstance(transport, SQLiteQueueTransport):
+        return transport.wait_for_result(job_id, timeout)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = transport.fetch_result(job_id)
+        if result is not None:
+            return result
+        time.sleep(0.001)
+    return None
+
+
+def measure(transport):
+    stop = threading.Event()
+    t = threading.Thread(target=_worker, args=(transport, stop), daemon=True)
+    t.start()
+    latencies = []
+    try:
+        for i in range(N):
+            job_id = f"job-{i}"
+            start = time.perf_counter()
+            transport.send_job({"job_id": job_id, "worker_id": "bench-worker", "payload": {"i": i}})
+            result = _wait_visible(transport, job_id)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            assert result == {"ok": True, "echo": {"i": i}}
+            transport.ack_result(job_id)
+    finally:
+        stop.set()
+        t.join(timeout=5)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return p50, p99
+
+
+def test_transport_latency():
+    if RUNTIME.exists():
+        shutil.rmtree(RUNTIME)
+    RUNTIME.mkdir(parents=True, exist_ok=True)
+
+    file_t = FileDropTransport(RUNTIME / "webrelay_out", RUNTIME / "webrelay_in")
+    queue_t = SQLiteQueueTransport(RUNTIME / "job_transport.db")
+
+    file_p50, file_p99 = measure(file_t)
+    queue_p50, queue_p99 = measure(queue_t)
+
+    print(f"\n{'transport':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    print(f"{'file':>10} {file_p50:>10.2f} {file_p99:>10.2f}")
+    print(f"{'sqlite':>10} {queue_p50:>10.2f} {queue_p99:>10.2f}")
+
+    assert queue_p50 < file_p50
+    assert not list((RUNTIME / "webrelay_out").glob("*.job.json"))
+
+
+def test_queue_redelivers_unacked_jobs():
+    RUNTIME.mkdir(parents=True, exist_ok=True)
+    db = RUNTIME / "redeliver.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(db) + suffix).unlink(missing_ok=True)
+    q = SQLiteQueueTransport(db, lease_sec=0)
+    q.send_job({"job_id": "a", "worker_id": None, "payload": {}})
+    q.send_job({"job_id": "b", "worker_id": "other", "payload": {}})
+
+    first = q.receive_jobs("w1", timeout=0)
+    assert [d.job_id for d in first] == ["a"]
+    # Lease of 0s expired: not acked -> delivered again
+    again = q.receive_jobs("w1", timeout=0)
+    assert [d.job_id for d in again] == ["a"]
+    q.ack_job(again[0])
+    assert q.receive_jobs("w1", timeout=0) == []
+    assert [d.job_id for d in q.receive_jobs("other", timeout=0)] == ["b"]
+
+
+if __name__ == "__main__":
+    test_transport_latency()
@@ -0,0 +1,102 @@
+"""
+Why-API offset index: lookups for traces of any age, incremental refresh,
+segment rotation and the seek-based tail.
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from core.why_index import TraceIndex, rotated_segment_path
+from core.why_reader import _iter_lines_tail, latest_event, trace_by_id, traces_by_job_id
+
+
+def _ev(i, trace_id=None, job_id=None, intent="dispatch_job"):
+    return {
+        "schema_version": "decision_trace_v1",
+        "timestamp": f"2026-01-01T00:00:{i // 1000:02d}.{i % 1000:03d}Z",
+        "trace_id": trace_id or f"t{i}",
+        "node_id": f"n{i}",
+        "job_id": job_id or f"job-{i}",
+        "intent": intent,
+        "depth": 0,
+    }
+
+
+def _append(path, events):
+    with open(path, "a", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e) + "\n")
+
+
+def test_old_traces_are_found_and_refresh_is_incremental(tmp_path):
+    log = tmp_path / "decision_trace.jsonl"
+    _append(log, [_ev(0, trace_id="old", job_id="job-old", intent="recover_failure")])
+    _append(log, [_ev(i) for i in range(1, 20001)])
+
+    events, meta = trace_by_id(str(log), "old")  # outside any 10k tail window
+    assert [e["node_id"] for e in events] == ["n0"] and meta.scanned_lines == 1
+    assert traces_by_job_id(str(log), "job-old")[0] == ["old"]
+    assert latest_event(str(log), intent="recover_failure")[0]["node_id"] == "n0"
+
+    idx = TraceIndex(log)  # same sidecar, already populated
+    assert idx.refresh() == 0
+    _append(log, [_ev(20001, trace_id="old", job_id="job-old")])
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"trace_id": "partial"')  # writer mid-line
+    assert idx.refresh() == 1
+    assert [e["node_id"] for e in idx.by_trace("old")] == ["n0", "n20001"]
+    assert idx.by_trace("partial") == []
+    idx.close()
+
+
+def test_rotation_relabels_segment_without_reindex(tmp_path):
+    log = tmp_path / "decision_trace.jsonl"
+    _append(log, [_ev(i, trace_id="rot") for i in range(3)])
+    idx = TraceIndex(log)
+    assert idx.refresh() == 3
+
+    sealed = rotated_segment_path(log)
+    os.replace(log, sealed)
+    _append(log, [_ev(3, trace_id="rot")])
+    assert idx.refresh() == 1  # only the new active line is parsed
+    assert [e["node_id"] for e in idx.by_trace("rot")] == ["n0", "n1", "n2", "n3"]
+
+    # Right after rotation there is no active file: the reader still uses the index
+    os.replace(log, rotated_segment_path(log))
+    events, meta = trace_by_id(str(log), "rot")
+    assert [e["node_id"] for e in events] == ["n0", "n1", "n2", "n3"]
+    _append(log, [_ev(4, trace_id="new")])
+
+    sealed.unlink()  # retention removed the old segment
+    idx.refresh()
+    assert [e["node_id"] for e in idx.by_trace("rot")] == ["n3"]
+    assert [e["node_id"] for e in idx.by_trace("new")] == ["n4"]
+    idx.close()
+
+
+def test_seek_tail_matches_full_read(tmp_path):
+    log = tmp_path / "tail.jsonl"
+    _append(log, [_ev(i) for i in range(5000)])
+    lines, n = _iter_lines_tail(log, 1234, block_size=4096)
+    assert n == 1234
+    assert lines == log.read_text(encoding="utf-8").splitlines()[-1234:]
+    assert _iter_lines_tail(log, 10 ** 6)[1] == 5000
+
+
+def test_indexed_lookup_cost(tmp_path):
+    log = tmp_path / "decision_trace.jsonl"
+    _append(log, [_ev(i, trace_id=f"t{i % 5000}") for i in range(50000)])
+    trace_by_id(str(log), "t0")  # builds the index once
+    start = time.perf_counter()
+    for i in range(200):
+        events, _ = trace_by_id(str(log), f"t{i}")
+        assert len(events) == 10
+    ms = (time.perf_counter() - start) / 200 * 1000
+    print(f"\ntrace_by_id over 50k lines: {ms:.2f} ms/lookup (indexed)")
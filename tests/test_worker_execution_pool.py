@@ -0,0 +1,157 @@
+"""
+Worker execution pools: mixed I/O + LLM workloads run concurrently, per-kind
+limits hold, drain finishes accepted jobs before shutdown, and file-drop
+workers only claim what their pools can start.
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to sys.path
+root = Path(__file__).parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from worker.execution_pool import ExecutionEngine, job_kind, parse_kind_limits
+
+
+class _Probe:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}
+        self.peak = {}
+
+    def job(self, kind, seconds):
+        def run():
+            with self.lock:
+                self.current[kind] = self.current.get(kind, 0) + 1
+                self.peak[kind] = max(self.peak.get(kind, 0), self.current[kind])
+            time.sleep(seconds)
+            with self.lock:
+                self.current[kind] -= 1
+        return run
+
+
+def test_mixed_workload_scales():
+    jobs = [("llm_call", 0.3)] * 4 + [("read_file", 0.02)] * 40 + [("list_files", 0.02)] * 40
+    sequential = sum(s for _, s in jobs)
+
+    probe = _Probe()
+    engine = ExecutionEngine(capability_kinds=["read_file", "list_files"], io_workers=8, llm_workers=2,
+                             llm_kinds=["llm_call"])
+    start = time.perf_counter()
+    for i, (kind, seconds) in enumerate(jobs):
+        assert engine.submit(f"job-{i}", kind, probe.job(kind, seconds))
+    assert engine.drain(timeout=10)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nmixed workload: sequential {sequential:.2f}s -> pooled {elapsed:.2f}s ({sequential / elapsed:.1f}x)")
+    # LLM jobs (2 slots) bound the runtime; the 80 I/O jobs run alongside them
+    assert elapsed < 0.6 + 0.4
+    assert probe.peak["llm_call"] == 2
+    assert engine.gauges()["completed"] == len(jobs)
+
+
+def test_kind_limits_and_duplicate_rejection():
+    probe = _Probe()
+    engine = ExecutionEngine(capability_kinds=["pdf_to_json"], io_workers=8,
+                             kind_limits=parse_kind_limits("pdf_to_json=2, bad=x"))
+    assert engine.kind_limits == {"pdf_to_json": 2}
+    for i in range(6):
+        engine.submit(f"p{i}", "pdf_to_json", probe.job("pdf_to_json", 0.05))
+    assert not engine.submit("p0", "pdf_to_json", probe.job("pdf_to_json", 0.05))  # already accepted
+    gauges = engine.gauges()
+    assert gauges["inflight_by_kind"] == {"pdf_to_json": 2}
+    assert gauges["queued_by_kind"] == {"pdf_to_json": 4}
+    assert engine.drain(timeout=5)
+    assert probe.peak["pdf_to_json"] == 2
+    assert not engine.submit("late", "read_file", lambda: None)  # draining
+
+
+def test_job_kind_matches_handle_job_resolution():
+    assert job_kind({"kind": "read_file"}) == "read_file"
+    assert job_kind({"payload": {"task": {"kind": "walk_tree"}}}) == "walk_tree"
+    assert job_kind({"payload": {"job_type": "sheratan_selfloop"}}) == "sheratan_selfloop"
+    assert job_kind({}) == "unknown"
+
+
+def test_claim_heartbeat_keeps_sweep_off_owned_jobs(tmp_path):
+    pytest.importorskip("tenacity")  # phase1_helpers' HTTP retry dependency
+    from worker.phase1_helpers import check_for_unclaimed_jobs, claim_job_file, touch_job_claims
+
+    owned, abandoned = tmp_path / "a.job.json", tmp_path / "b.job.json"
+    for job_file in (owned, abandoned):
+        job_file.write_text("{}", encoding="utf-8")
+        assert claim_job_file(job_file)
+        old = time.time() - 400  # older than the 300s stale threshold
+        os.utime(str(job_file) + ".claimed", (old, old))
+
+    touch_job_claims([owned])
+    swept = []
+    check_for_unclaimed_jobs(tmp_path, swept.append)
+    assert swept == [abandoned]
+    assert Path(str(owned) + ".claimed").exists()
+
+
+def test_file_drop_workers_share_a_backlog(tmp_path):
+    pytest.importorskip("tenacity")  # phase1_helpers' HTTP retry dependency
+    from worker.phase1_helpers import claim_job_file, release_job_claim, touch_job_claims
+
+    backlog = []
+    for i in range(12):
+        job_file = tmp_path / f"job-{i:02d}.job.json"
+        job_file.write_text("{}", encoding="utf-8")
+        backlog.append(job_file)
+    gate = threading.Event()
+    done = {"a": [], "b": []}
+
+    def worker(name):
+        engine = ExecutionEngine(capability_kinds=["read_file"], io_workers=2, llm_workers=1)
+        owned = set()
+
+        def run(path):
+            gate.wait(5)
+            done[name].append(path)
+            path.unlink()
+            owned.discard(path)
+            release_job_claim(path)
+
+        def process_job_file(path):
+            # Mirrors worker_loop.process_job_file
+            if engine.accepted() >= engine.capacity:
+                return
+            if not path.exists() or not claim_job_file(path):
+                return
+            if engine.submit(path.name, "read_file", lambda: run(path)):
+                owned.add(path)
+            else:
+                release_job_claim(path)
+
+        def poll():
+            for path in sorted(tmp_path.glob("*.job.json")):
+                process_job_file(path)
+            touch_job_claims(list(owned))
+
+        return engine, poll
+
+    engine_a, poll_a = worker("a")
+    engine_b, poll_b = worker("b")
+    poll_a()
+    poll_b()
+    # Each worker holds at most its capacity; the rest is still unclaimed
+    assert engine_a.accepted() == engine_a.capacity == 3 and engine_b.accepted() == 3
+    assert len(list(tmp_path.glob("*.claimed"))) == 6
+
+    gate.set()
+    while any(p.exists() for p in backlog):
+        engine_a.wait_idle(timeout=5)
+        engine_b.wait_idle(timeout=5)
+        poll_a()
+        poll_b()
+    assert engine_a.drain(timeout=5) and engine_b.drain(timeout=5)
+    assert sorted(done["a"] + done["b"]) == backlog
+    assert done["a"] and done["b"]
@@ -0,0 +1,174 @@
+"""
+Worker Execution Engine (Phase 11)
+
+Runs jobs concurrently instead of one file at a time on the main loop:
+- Two bounded pools: "io" for file kinds, "llm" for the long-running LLM
+  kinds the worker names (llm_kinds), so a 300s LLM call never blocks
+  queued read_file/list_files jobs
+- Per-kind concurrency limits (one per registered WorkerCapability kind and
+  LLM kind);
+  jobs over their kind's limit wait in a per-kind FIFO, not on a pool thread
+- In-flight / queued gauges per pool and per kind
+- Graceful drain: stop accepting, finish everything accepted, shut down
+
+Configuration (env):
+    WORKER_IO_POOL_SIZE      default 8
+    WORKER_LLM_POOL_SIZE     default 2
+    WORKER_KIND_LIMITS       e.g. "read_file=8,pdf_to_json=2" (default: pool size)
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set, Tuple
+
+def parse_kind_limits(spec: str) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            kind, value = part.split("=", 1)
+            try:
+                limits[kind.strip()] = max(1, int(value))
+            except ValueError:
+                pass
+    return limits
+
+
+def job_kind(unified_job: dict) -> str:
+    """Same kind resolution as handle_job (job kind first, then task kind)."""
+    lcp = unified_job.get("payload", {}) or {}
+    kind = unified_job.get("kind") or (lcp.get("task", {}) or {}).get("kind")
+    if not kind and ((lcp.get("params", {}) or {}).get("job_type") or lcp.get("job_type") == "sheratan_selfloop"):
+        kind = "sheratan_selfloop"
+    return kind or "unknown"
+
+
+class ExecutionEngine:
+    def __init__(
+        self,
+        capability_kinds: Iterable[str] = (),
+        io_workers: int = 8,
+        llm_workers: int = 2,
+        kind_limits: Optional[Dict[str, int]] = None,
+        llm_kinds: Iterable[str] = (),
+    ):
+        self.llm_kinds = set(llm_kinds)
+        self.pool_sizes = {"io": max(1, io_workers), "llm": max(1, llm_workers)}
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"worker-{name}")
+            for name, size in self.pool_sizes.items()
+        }
+        kind_limits = kind_limits or {}
+        # Every registered capability and LLM kind gets an explicit limit (default: its pool size)
+        self.kind_limits: Dict[str, int] = {
+            kind: kind_limits.get(kind, self.pool_sizes[self.pool_for(kind)])
+            for kind in [*capability_kinds, *self.llm_kinds]
+        }
+        self.kind_limits.update(kind_limits)
+
+        self._lock = threading.Condition()
+        self._accepting = True
+        self._job_ids: Set[str] = set()
+        self._waiting: Dict[str, Deque[Tuple[str, Callable[[], Any]]]] = {}
+        self._inflight_kind: Dict[str, int] = {}
+        self._inflight_pool = {"io": 0, "llm": 0}
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "max_inflight": 0}
+
+    @classmethod
+    def from_env(cls, capability_kinds: Iterable[str] = (), llm_kinds: Iterable[str] = ()) -> "ExecutionEngine":
+        return cls(
+            capability_kinds=capability_kinds,
+            llm_kinds=llm_kinds,
+            io_workers=int(os.getenv("WORKER_IO_POOL_SIZE", "8")),
+            llm_workers=int(os.getenv("WORKER_LLM_POOL_SIZE", "2")),
+            kind_limits=parse_kind_limits(os.getenv("WORKER_KIND_LIMITS", "")),
+        )
+
+    def pool_for(self, kind: str) -> str:
+        return "llm" if kind in self.llm_kinds else "io"
+
+    def limit_for(self, kind: str) -> int:
+        return self.kind_limits.get(kind, self.pool_sizes[self.pool_for(kind)])
+
+    @property
+    def capacity(self) -> int:
+        return sum(self.pool_sizes.values())
+
+    def inflight(self) -> int:
+        with self._lock:
+            return sum(self._inflight_pool.values())
+
+    def accepted(self) -> int:
+        """Jobs accepted and not finished yet (running + waiting on a kind limit)."""
+        with self._lock:
+            return len(self._job_ids)
+
+    def submit(self, job_id: str, kind: str, fn: Callable[[], Any]) -> bool:
+        """
+        Queue fn for execution. Returns False if the engine is draining or
+        job_id is already accepted (the caller keeps ownership, e.g. its claim).
+        """
+        with self._lock:
+            if not self._accepting or job_id in self._job_ids:
+                self.stats["rejected"] += 1
+                return False
+            self._job_ids.add(job_id)
+            self.stats["submitted"] += 1
+            self._waiting.setdefault(kind, deque()).append((job_id, fn))
+            self._pump(kind)
+            return True
+
+    def _pump(self, kind: str) -> None:
+        """Start waiting jobs of kind while under its limit (caller holds _lock)."""
+        waiting = self._waiting.get(kind)
+        while waiting and self._inflight_kind.get(kind, 0) < self.limit_for(kind):
+            job_id, fn = waiting.popleft()
+            pool = self.pool_for(kind)
+            self._inflight_kind[kind] = self._inflight_kind.get(kind, 0) + 1
+            self._inflight_pool[pool] += 1
+            total = sum(self._inflight_pool.values())
+            if total > self.stats["max_inflight"]:
+                self.stats["max_inflight"] = total
+            self._pools[pool].submit(self._run, job_id, kind, pool, fn)
+
+    def _run(self, job_id: str, kind: str, pool: str, fn: Callable[[], Any]) -> None:
+        ok = True
+        try:
+            fn()
+        except Exception as e:
+            ok = False
+            print(f"[worker] ERROR in {pool} pool for job {job_id} ({kind}): {e}")
+        finally:
+            with self._lock:
+                self._inflight_kind[kind] -= 1
+                self._inflight_pool[pool] -= 1
+                self._job_ids.discard(job_id)
+                self.stats["completed" if ok else "failed"] += 1
+                self._pump(kind)
+                self._lock.notify_all()
+
+    def gauges(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "accepting": self._accepting,
+                "inflight": dict(self._inflight_pool),
+                "inflight_by_kind": {k: v for k, v in self._inflight_kind.items() if v},
+                "queued_by_kind": {k: len(q) for k, q in self._waiting.items() if q},
+                "pool_sizes": dict(self.pool_sizes),
+                **self.stats,
+            }
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            return self._lock.wait_for(lambda: not self._job_ids, timeout)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting, wait for accepted jobs to finish, shut the pools down."""
+        with self._lock:
+            self._accepting = False
+        print(f"[worker] Draining execution pools ({len(self._job_ids)} job(s) in flight/queued)...")
+        done = self.wait_idle(timeout)
+        for pool in self._pools.values():
+            pool.shutdown(wait=done)
+        return done
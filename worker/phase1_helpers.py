@@ -10,7 +10,7 @@ import os
 import time
 import logging
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -223,6 +223,20 @@ def release_job_claim(job_file: Path):
     except Exception as e:
         logger.warning(f"Error releasing claim for {job_file}: {e}")
 
+def touch_job_claims(job_files: Iterable[Path]):
+    """
+    Heartbeat: refresh the mtime of claims this worker still owns (jobs
+    queued or running in its execution pools), so the stale-claim sweep in
+    check_for_unclaimed_jobs never takes over a live job.
+    """
+    for job_file in job_files:
+        try:
+            os.utime(Path(str(job_file) + ".claimed"))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Error refreshing claim for {job_file}: {e}")
+
 def check_for_unclaimed_jobs(directory: Path, process_callback: Callable[[Path], None]):
     """
     Fallback: Check for jobs that might have been missed by watchdog.
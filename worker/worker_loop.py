@@ -2,7 +2,8 @@ import json
 import sys
 import os
 import time
-from typing import List, Optional, Dict, Any, Union
+import threading
+from typing import List, Optional, Dict, Any, Set, Union
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -778,6 +779,29 @@ def handle_job(unified_job: dict) -> dict:
     
     return result
 
+# Registered capabilities (kind, cost); also the per-kind limits of the execution pools
+WORKER_CAPABILITIES = [
+    ("list_files", 10),
+    ("read_file", 10),
+    ("write_file", 50),
+    ("patch_file", 40),
+    ("pdf_to_json", 20),
+    # ("agent_plan", 100),  # Handled by WebRelay
+    # ("llm_call", 100),    # Handled by WebRelay
+    ("walk_tree", 20),
+    ("read_file_batch", 50),
+]
+
+# Kinds handle_job serves with an LLM call; they run on the "llm" pool. Not
+# advertised above (WebRelay handles them) but executed if routed here.
+LLM_JOB_KINDS = ("llm_call", "agent_plan", "sheratan_selfloop")
+
+
+def _raise_interrupt(signum, frame):
+    # SIGTERM takes the same graceful-drain path as Ctrl+C
+    raise KeyboardInterrupt()
+
+
 def main_loop():
     print(f"--- Sheratan Worker 2.0 Starting (ID: {WORKER_ID}) ---")
     print(f"[worker] Monitoring {RELAY_OUT_DIR}")
@@ -790,6 +814,7 @@ def main_loop():
             claim_job_file,
             release_job_claim,
             check_for_unclaimed_jobs,
+            touch_job_claims,
             HAS_WATCHDOG
         )
         print("[worker] ✓ Phase 1 improvements loaded (resilient HTTP + event-driven)")
@@ -808,17 +833,7 @@ def main_loop():
             registry = WorkerRegistry(registry_file)
             
             # Capability: File operations + LLM calls
-            capabilities = [
-                WorkerCapability(kind="list_files", cost=10),
-                WorkerCapability(kind="read_file", cost=10),
-                WorkerCapability(kind="write_file", cost=50),
-                WorkerCapability(kind="patch_file", cost=40),
-                WorkerCapability(kind="pdf_to_json", cost=20),
-                # WorkerCapability(kind="agent_plan", cost=100),  # Handled by WebRelay
-                # WorkerCapability(kind="llm_call", cost=100),    # Handled by WebRelay
-                WorkerCapability(kind="walk_tree", cost=20),
-                WorkerCapability(kind="read_file_batch", cost=50),
-            ]
+            capabilities = [WorkerCapability(kind=kind, cost=cost) for kind, cost in WORKER_CAPABILITIES]
             
             registry.register(WorkerInfo(
                 worker_id=WORKER_ID,
@@ -837,14 +852,101 @@ def main_loop():
     FAILED_REPORTS_DIR = BASE_DIR / "data" / "failed_reports"
     
     core_url = os.getenv("SHERATAN_CORE_URL", "http://127.0.0.1:8001")
+
+    def notify_core(job_id: str):
+        """Tell Core the result is ready (resilient HTTP + retry when available)."""
+        if notify_core_safe:
+            notify_core_safe(core_url, job_id, FAILED_REPORTS_DIR)
+        else:
+            # Fallback: legacy notification
+            try:
+                sync_url = f"{core_url}/api/jobs/{job_id}/sync"
+                sync_resp = requests.post(sync_url, timeout=10)
+                if sync_resp.ok:
+                    print(f"[worker] ✓ Notified Core to sync job {job_id[:12]}...")
+                else:
+                    print(f"[worker] ⚠ Core sync returned {sync_resp.status_code}")
+            except Exception as e:
+                print(f"[worker] ⚠ Failed to notify Core: {e}")
+
+    def run_job(job_id: str, unified_job: dict) -> dict:
+        try:
+            return handle_job(unified_job)
+        except Exception as e:
+            print("[worker] ERROR in handle_job for", job_id, e)
+            return {
+                "ok": False,
+                "action": "error",
+                "error": f"Exception in worker: {type(e).__name__}: {e}",
+                "worker_id": WORKER_ID
+            }
     
+    from core.job_transport import create_transport
+    transport = create_transport(RELAY_OUT_DIR, RELAY_IN_DIR, queue_path=BASE_DIR / "data" / "job_transport.db")
+
+    # Concurrent execution: io/llm pools with per-kind limits (see execution_pool.py)
+    from worker.execution_pool import ExecutionEngine, job_kind
+    engine = ExecutionEngine.from_env((kind for kind, _ in WORKER_CAPABILITIES), LLM_JOB_KINDS)
+    print(f"[worker] ✓ Execution pools: {engine.pool_sizes} kind_limits={engine.kind_limits}")
+    drain_timeout = float(os.getenv("WORKER_DRAIN_TIMEOUT_SEC", "60"))
+    gauge_state = {"last": 0.0}
+
+    def log_gauges(every_sec: float = 60.0):
+        now = time.time()
+        if now - gauge_state["last"] >= every_sec:
+            gauge_state["last"] = now
+            print(f"[worker] pools {engine.gauges()}")
+
+    try:
+        import signal
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+    except (ValueError, AttributeError, OSError):
+        pass  # not on the main thread / platform without SIGTERM
+
+    # Job files whose claim is owned by the pools (queued or running)
+    owned_claims: Set[Path] = set()
+    owned_lock = threading.Lock()
+
+    def execute_job_file(path: Path, job_id: str, unified_job: dict):
+        """Runs on a pool thread; owns the claim taken by process_job_file."""
+        try:
+            result = run_job(job_id, unified_job)
+
+            result_file = RELAY_IN_DIR / f"{job_id}.result.json"
+            try:
+                # tmp + replace: the Core's result watcher never sees a partial file
+                transport.send_result(job_id, result)
+                print("[worker] Wrote result file", result_file)
+                
+                # Notify Core with resilient HTTP + retry
+                notify_core(job_id)
+                
+            except Exception as e:
+                print("[worker] FAILED to write result file", result_file, e)
+
+            print("[worker] Done job", job_id)
+            path.unlink(missing_ok=True)
+            
+        finally:
+            # Release claim
+            with owned_lock:
+                owned_claims.discard(path)
+            if notify_core_safe:
+                release_job_claim(path)
+
     def process_job_file(path: Path):
-        """Process a single job file with claiming and resilient notification"""
+        """Claim and parse a job file, then hand it to the execution pools"""
+        # Only claim what the pools can start (as queue mode leases); the rest
+        # stays in the directory for other workers and the fallback sweep
+        if engine.accepted() >= engine.capacity:
+            return
+        
         # Claim job atomically
         if notify_core_safe and not claim_job_file(path):
             # Already claimed
             return
         
+        submitted = False
         try:
             try:
                 raw = path.read_text(encoding="utf-8")
@@ -863,49 +965,59 @@ def main_loop():
             # -----------------------------------
 
             print(f"[worker] Processing job file {path} (job_id={job_id})")
+            with owned_lock:
+                submitted = engine.submit(
+                    job_id, job_kind(unified_job),
+                    lambda: execute_job_file(path, job_id, unified_job),
+                )
+                if submitted:
+                    owned_claims.add(path)
+            
+        finally:
+            # Release claim unless a pool thread now owns it
+            if notify_core_safe and not submitted:
+                release_job_claim(path)
+    
+    # ========================================================================
+    # Queue Transport (SHERATAN_JOB_TRANSPORT=sqlite); file drop stays the fallback
+    # ========================================================================
 
-            try:
-                result = handle_job(unified_job)
-            except Exception as e:
-                print("[worker] ERROR in handle_job for", job_id, e)
-                result = {
-                    "ok": False,
-                    "action": "error",
-                    "error": f"Exception in worker: {type(e).__name__}: {e}",
-                    "worker_id": WORKER_ID
-                }
+    if transport.name != "file":
+        print(f"[worker] 🚀 Starting queue mode ({transport.name} transport)")
+        batch_size = int(os.getenv("WORKER_DEQUEUE_BATCH", "8"))
 
-            result_file = RELAY_IN_DIR / f"{job_id}.result.json"
+        def execute_delivery(delivery):
+            result = run_job(delivery.job_id, delivery.unified)
             try:
-                result_file.write_text(json.dumps(result), encoding="utf-8")
-                print("[worker] Wrote result file", result_file)
-                
-                # Notify Core with resilient HTTP + retry
-                if notify_core_safe:
-                    notify_core_safe(core_url, job_id, FAILED_REPORTS_DIR)
-                else:
-                    # Fallback: legacy notification
-                    try:
-                        sync_url = f"{core_url}/api/jobs/{job_id}/sync"
-                        sync_resp = requests.post(sync_url, timeout=10)
-                        if sync_resp.ok:
-                            print(f"[worker] ✓ Notified Core to sync job {job_id[:12]}...")
-                        else:
-                            print(f"[worker] ⚠ Core sync returned {sync_resp.status_code}")
-                    except Exception as e:
-                        print(f"[worker] ⚠ Failed to notify Core: {e}")
-                
+                transport.send_result(delivery.job_id, result)
             except Exception as e:
-                print("[worker] FAILED to write result file", result_file, e)
+                # Not acked: the lease expires and the job is redelivered
+                print("[worker] FAILED to publish result", delivery.job_id, e)
+                return
+            transport.ack_job(delivery)
+            notify_core(delivery.job_id)
+            print("[worker] Done job", delivery.job_id)
+
+        try:
+            while True:
+                log_gauges()
+                # Only lease what the pools can start; the rest stays in the queue
+                free = engine.capacity - engine.accepted()
+                if free <= 0:
+                    time.sleep(0.05)
+                    continue
+                # Blocks until the Core enqueues (notification) or the timeout elapses
+                for delivery in transport.receive_jobs(WORKER_ID, max_items=min(batch_size, free), timeout=5.0):
+                    print(f"[worker] Processing queued job (job_id={delivery.job_id})")
+                    engine.submit(
+                        delivery.job_id, job_kind(delivery.unified),
+                        lambda d=delivery: execute_delivery(d),
+                    )
+        except KeyboardInterrupt:
+            print("[worker] Shutting down...")
+            engine.drain(timeout=drain_timeout)
+        return
 
-            print("[worker] Done job", job_id)
-            path.unlink(missing_ok=True)
-            
-        finally:
-            # Release claim
-            if notify_core_safe:
-                release_job_claim(path)
-    
     # ========================================================================
     # Phase 1: Event-Driven Worker with Watchdog
     # ========================================================================
@@ -929,11 +1041,16 @@ def main_loop():
                 
                 # Fallback: Check for missed files every 5s
                 time.sleep(5.0)
+                # Heartbeat first: claims of jobs still in the pools are never stale
+                with owned_lock:
+                    touch_job_claims(list(owned_claims))
                 check_for_unclaimed_jobs(RELAY_OUT_DIR, process_job_file)
+                log_gauges()
         except KeyboardInterrupt:
             print("[worker] Shutting down...")
             observer.stop()
             observer.join()
+            engine.drain(timeout=drain_timeout)
     else:
         # ====================================================================
         # Legacy: Polling Mode (fallback if watchdog not available)
@@ -941,11 +1058,20 @@ def main_loop():
         print("[worker] ⚠ Running in legacy polling mode (watchdog not available)")
         print("[worker] Install watchdog for better performance: pip install watchdog")
         
-        while True:
-            for path in list(RELAY_OUT_DIR.glob("*.job.json")):
-                process_job_file(path)
-            
-            time.sleep(1.0)  # Legacy 1s polling
+        try:
+            while True:
+                for path in list(RELAY_OUT_DIR.glob("*.job.json")):
+                    process_job_file(path)
+                # Heartbeat: other workers' stale-claim sweeps must not take these over
+                if notify_core_safe:
+                    with owned_lock:
+                        touch_job_claims(list(owned_claims))
+                log_gauges()
+                
+                time.sleep(1.0)  # Legacy 1s polling
+        except KeyboardInterrupt:
+            print("[worker] Shutting down...")
+            engine.drain(timeout=drain_timeout)
 
 
 if __name__ == "__main__":